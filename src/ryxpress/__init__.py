@@ -6,13 +6,27 @@ only check __version__ and hello()) do not fail if optional dependencies of
 submodules are missing. Submodules are imported lazily on attribute access.
 
 Module-to-file mapping uses the actual filenames present under src/ryxpress:
-- r_runner.py          -> ryxpress.r_runner
+- r_runner.py          -> ryxpress.rxp_make, ryxpress.rxp_make_async
+- batch.py             -> ryxpress.rxp_make_many
+- pipeline.py          -> ryxpress.rxp_py, ryxpress.rxp_py_file, ryxpress.rxp_r,
+                          ryxpress.rxp_r_file, ryxpress.rxp_pipeline,
+                          ryxpress.rxp_populate, ryxpress.rxp_build
 - copy_artifacts.py    -> ryxpress.rxp_copy
 - garbage.py           -> ryxpress.rxp_gc
 - init_proj.py         -> ryxpress.rxp_init
 - inspect_logs.py      -> ryxpress.rxp_inspect, ryxpress.rxp_list_logs
-- read_load.py         -> ryxpress.rxp_read, ryxpress.rxp_load
+- log_index.py         -> ryxpress.rxp_history, ryxpress.rxp_find,
+                          ryxpress.rxp_provenance, ryxpress.rxp_reindex
+- read_load.py         -> ryxpress.rxp_read, ryxpress.rxp_load, ryxpress.clear_artifact_cache
+- prefetch.py          -> ryxpress.rxp_prefetch
+- verify.py            -> ryxpress.rxp_verify
+- disk_usage.py        -> ryxpress.rxp_du
+- shared.py            -> ryxpress.ArtifactServer, ryxpress.rxp_read_shared
+- watch.py             -> ryxpress.RxpWatcher
+- instrument.py        -> ryxpress.rxp_instrument, ryxpress.JsonLinesSink, ryxpress.OtelSink
 - plotting.py          -> ryxpress.rxp_dag_for_ci, ryxpress.get_nodes_edges, ryxpress.rxp_phart
+- layout.py            -> ryxpress.rxp_ascii_dag
+- dag_html.py          -> ryxpress.rxp_dag_html
 - tracing.py           -> ryxpress.rxp_trace
 """
 from __future__ import annotations
@@ -29,17 +43,47 @@ def hello() -> str:
 # If attribute_name_or_None is None, the module object is returned.
 _lazy_imports = {
     "rxp_make": ("ryxpress.r_runner", "rxp_make"),
+    "rxp_make_async": ("ryxpress.r_runner", "rxp_make_async"),
+    "rxp_make_many": ("ryxpress.batch", "rxp_make_many"),
+    # Python pipeline definition (pipeline.py)
+    "rxp_py": ("ryxpress.pipeline", "rxp_py"),
+    "rxp_py_file": ("ryxpress.pipeline", "rxp_py_file"),
+    "rxp_r": ("ryxpress.pipeline", "rxp_r"),
+    "rxp_r_file": ("ryxpress.pipeline", "rxp_r_file"),
+    "rxp_pipeline": ("ryxpress.pipeline", "rxp_pipeline"),
+    "rxp_populate": ("ryxpress.pipeline", "rxp_populate"),
+    "rxp_build": ("ryxpress.pipeline", "rxp_build"),
     "rxp_copy": ("ryxpress.copy_artifacts", "rxp_copy"),
     "rxp_gc": ("ryxpress.garbage", "rxp_gc"),
     "rxp_init": ("ryxpress.init_proj", "rxp_init"),
     "rxp_list_logs": ("ryxpress.inspect_logs", "rxp_list_logs"),
     "rxp_inspect": ("ryxpress.inspect_logs", "rxp_inspect"),
+    # cross-log queries (log_index.py)
+    "rxp_history": ("ryxpress.log_index", "rxp_history"),
+    "rxp_find": ("ryxpress.log_index", "rxp_find"),
+    "rxp_provenance": ("ryxpress.log_index", "rxp_provenance"),
+    "rxp_reindex": ("ryxpress.log_index", "rxp_reindex"),
     "rxp_read": ("ryxpress.read_load", "rxp_read"),
     "rxp_load": ("ryxpress.read_load", "rxp_load"),
+    "clear_artifact_cache": ("ryxpress.read_load", "clear_artifact_cache"),
+    "rxp_prefetch": ("ryxpress.prefetch", "rxp_prefetch"),
+    "rxp_verify": ("ryxpress.verify", "rxp_verify"),
+    "rxp_du": ("ryxpress.disk_usage", "rxp_du"),
+    # shared-memory artifact server (shared.py)
+    "ArtifactServer": ("ryxpress.shared", "ArtifactServer"),
+    "rxp_read_shared": ("ryxpress.shared", "rxp_read_shared"),
+    # _rixpress watcher (watch.py)
+    "RxpWatcher": ("ryxpress.watch", "RxpWatcher"),
+    # timing/resource instrumentation (instrument.py)
+    "rxp_instrument": ("ryxpress.instrument", "rxp_instrument"),
+    "JsonLinesSink": ("ryxpress.instrument", "JsonLinesSink"),
+    "OtelSink": ("ryxpress.instrument", "OtelSink"),
     # DAG/plotting helpers (plotting.py)
     "rxp_dag_for_ci": ("ryxpress.plotting", "rxp_dag_for_ci"),
     "get_nodes_edges": ("ryxpress.plotting", "get_nodes_edges"),
     "rxp_phart": ("ryxpress.plotting", "rxp_phart"),
+    "rxp_ascii_dag": ("ryxpress.layout", "rxp_ascii_dag"),
+    "rxp_dag_html": ("ryxpress.dag_html", "rxp_dag_html"),
     # tracing / other helpers
     "rxp_trace": ("ryxpress.tracing", "rxp_trace"),
 }
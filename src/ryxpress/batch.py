@@ -0,0 +1,184 @@
+"""
+Run rxp_make over many independent projects under a shared CPU budget.
+
+Behavior:
+
+- rxp_make_many starts up to max_parallel projects at once with
+  rxp_make_async. Each project gets a share of the global budgets when it
+  starts: cores = cores_budget // running and max_jobs = jobs_budget //
+  running (at least 1), limited by what the projects already running leave
+  free, so the sum over running projects never exceeds either budget.
+- A project that cannot be started (missing script, no Rscript, ...) is
+  recorded as failed with returncode 127 and the error in stderr; the other
+  projects still run.
+- on_result(project, result) is called as each project finishes, in
+  completion order, so callers can stream progress; the return value is a
+  summary over all projects.
+- Runs start in their own process groups, so Ctrl-C in the caller does not
+  reach them: if rxp_make_many exits early (KeyboardInterrupt, or an
+  exception from on_result), every run still going is cancelled first.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .r_runner import RMakeHandle, RRunResult
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_make_many"]
+
+
+ProjectSpec = Union[str, Path, Mapping[str, Any]]
+
+
+def _normalize(projects: Sequence[ProjectSpec], script: str) -> List[Tuple[str, Dict[str, Any]]]:
+    out: List[Tuple[str, Dict[str, Any]]] = []
+    seen = set()
+    for spec in projects:
+        if isinstance(spec, Mapping):
+            opts = dict(spec)
+            if "path" not in opts:
+                raise ValueError("project dicts need a 'path' key")
+            path = str(opts.pop("path"))
+        else:
+            path, opts = str(spec), {}
+        if path in seen:
+            raise ValueError(f"Duplicate project: {path}")
+        seen.add(path)
+        opts.setdefault("script", str(Path(path) / script))
+        opts.setdefault("cwd", path)
+        for reserved in ("max_jobs", "cores"):
+            if reserved in opts:
+                raise ValueError(f"{reserved} is assigned from the budgets; it cannot be set per project")
+        out.append((path, opts))
+    return out
+
+
+def rxp_make_many(
+    projects: Sequence[ProjectSpec],
+    max_parallel: Optional[int] = None,
+    cores_budget: Optional[int] = None,
+    jobs_budget: Optional[int] = None,
+    script: str = "gen-pipeline.R",
+    on_result: Optional[Callable[[str, RRunResult], None]] = None,
+    **make_kwargs,
+) -> Dict[str, Any]:
+    """
+    Build several rixpress projects concurrently.
+
+    Args:
+        projects: project directories, or dicts with a "path" key plus rxp_make
+            arguments for that project only (e.g. {"path": "a", "cache": True}).
+        max_parallel: maximum number of projects running at once (defaults to
+            cores_budget).
+        cores_budget: total cores shared by the running projects (passed to
+            rxp_make as cores); defaults to os.cpu_count().
+        jobs_budget: total Nix build jobs shared by the running projects
+            (passed as max_jobs); defaults to cores_budget.
+        script: script name inside each project (defaults to "gen-pipeline.R").
+        on_result: optional callback(project, RRunResult) called as each
+            project finishes. An exception it raises cancels the projects
+            still running and propagates.
+        **make_kwargs: other rxp_make arguments applied to every project
+            (verbose, rscript_cmd, timeout, cache, memory_limit, ...).
+
+    Returns:
+        A dict with keys:
+        - results: {project: RRunResult} in the order projects were given
+        - succeeded / failed: lists of projects
+        - elapsed: wall-clock seconds for the whole batch
+        - cpu_time: summed CPU seconds of all runs
+        - max_rss_kb: largest peak RSS of any run
+
+    Raises:
+        ValueError: on invalid budgets or duplicate projects.
+    """
+    from .r_runner import rxp_make_async
+
+    for name in ("max_jobs", "cores"):
+        if name in make_kwargs:
+            raise ValueError(f"{name} is assigned from the budgets; use cores_budget/jobs_budget")
+    cores_total = cores_budget if cores_budget is not None else (os.cpu_count() or 1)
+    jobs_total = jobs_budget if jobs_budget is not None else cores_total
+    parallel = max_parallel if max_parallel is not None else cores_total
+    for name, val in (("max_parallel", parallel), ("cores_budget", cores_total), ("jobs_budget", jobs_total)):
+        if not isinstance(val, int) or val < 1:
+            raise ValueError(f"{name} must be a positive int, got {val!r}")
+
+    pending = _normalize(projects, script)
+    order = [p for p, _ in pending]
+    pending.reverse()  # pop() from the end keeps the given order
+    results: Dict[str, RRunResult] = {}
+    running: Dict[str, Tuple[int, int, RMakeHandle]] = {}  # project -> (cores, jobs, handle)
+    finished: List[Tuple[str, RRunResult]] = []
+    cond = threading.Condition()
+    start = time.monotonic()
+
+    def watch(project: str, handle) -> None:
+        try:
+            res = handle.result()
+        except Exception as e:  # pragma: no cover - result() itself does not raise
+            res = RRunResult(returncode=1, stdout="", stderr=str(e))
+        with cond:
+            finished.append((project, res))
+            cond.notify()
+
+    def record(project: str, res: RRunResult) -> None:
+        results[project] = res
+        if on_result is not None:
+            on_result(project, res)
+
+    try:
+        while pending or running:
+            # Launch while there is room under every budget
+            while pending and len(running) < parallel:
+                share = min(parallel, len(running) + len(pending))
+                free_cores = cores_total - sum(c for c, _, _ in running.values())
+                free_jobs = jobs_total - sum(j for _, j, _ in running.values())
+                if free_cores < 1 or free_jobs < 1:
+                    break
+                cores = max(1, min(free_cores, cores_total // share))
+                jobs = max(1, min(free_jobs, jobs_total // share))
+                project, opts = pending.pop()
+                try:
+                    handle = rxp_make_async(max_jobs=jobs, cores=cores, **{**make_kwargs, **opts})
+                except Exception as e:
+                    logger.warning("Could not start %s: %s", project, e)
+                    record(project, RRunResult(returncode=127, stdout="", stderr=f"{type(e).__name__}: {e}"))
+                    continue
+                logger.info("Started %s (cores=%d, max_jobs=%d)", project, cores, jobs)
+                running[project] = (cores, jobs, handle)
+                threading.Thread(target=watch, args=(project, handle), name="rxp-make-many", daemon=True).start()
+
+            if not running:
+                continue
+            with cond:
+                while not finished:
+                    cond.wait()
+                done, finished[:] = list(finished), []
+            for project, res in done:
+                running.pop(project, None)
+                record(project, res)
+    finally:
+        # Children run in their own sessions: stop them rather than orphan them
+        for project, (_, _, handle) in running.items():
+            if handle.cancel():
+                logger.warning("Cancelled %s", project)
+
+    ordered = {p: results[p] for p in order}
+    usage = [r for r in ordered.values() if r.cpu_time is not None]
+    return {
+        "results": ordered,
+        "succeeded": [p for p, r in ordered.items() if r.returncode == 0],
+        "failed": [p for p, r in ordered.items() if r.returncode != 0],
+        "elapsed": time.monotonic() - start,
+        "cpu_time": sum(r.cpu_time for r in usage),
+        "max_rss_kb": max((r.max_rss_kb or 0 for r in usage), default=0),
+    }
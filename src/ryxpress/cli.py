@@ -0,0 +1,647 @@
+"""
+Command-line interface for ryxpress.
+
+Usage:
+
+    ryxpress make [--script gen-pipeline.R] [--max-jobs N] [--cores N] ...
+    ryxpress logs | inspect | history | find | trace | read | prefetch | copy | verify | du | gc | dag ...
+    ryxpress daemon [--socket PATH] [--stop]
+
+Behavior:
+
+- Every subcommand maps onto the matching rxp_* function. Structured results
+  (logs, inspect, history, find, gc, dag) are printed as JSON; rxp_trace prints its tree
+  and 'dag --ascii' draws the DAG as text.
+- ryxpress modules are imported only by the subcommand that needs them, so
+  the CLI starts quickly.
+- 'ryxpress daemon' serves CLI calls over a Unix socket from a long-lived
+  process in which modules, parsed logs, DAGs and decoded artifacts stay warm;
+  projects it serves are watched (RxpWatcher) so cached output is dropped as
+  soon as their logs or dag.json change.
+  When the RYXPRESS_SOCKET environment variable points at a running daemon,
+  'ryxpress <command>' forwards its arguments (and working directory) to it
+  instead of doing the work itself, importing nothing but socket and json.
+- Returns the process exit code: 0 on success, 1 on errors (the return code
+  of Rscript for 'make').
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+__all__ = ["main"]
+
+
+_SOCKET_ENV = "RYXPRESS_SOCKET"
+# Read-only commands whose output only depends on the _rixpress directory
+_CACHEABLE = ("logs", "inspect", "history", "find", "trace", "dag")
+# Options that make a cacheable command write a file: such runs are never cached
+_WRITES_FILE = {"dag": ("--dot", "--html")}
+
+
+def _default_socket() -> str:
+    env = os.environ.get(_SOCKET_ENV)
+    if env:
+        return env
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"ryxpress-{uid}.sock")
+
+
+def _print_json(value: Any) -> None:
+    print(json.dumps(value, indent=2, ensure_ascii=False, default=str))
+
+
+def _add_query_filters(p) -> None:
+    status = p.add_mutually_exclusive_group()
+    status.add_argument("--success", dest="build_success", action="store_const", const=True, default=None)
+    status.add_argument("--failed", dest="build_success", action="store_const", const=False)
+    p.add_argument("--since", default=None, help="YYYY-MM-DD or ISO datetime")
+    p.add_argument("--until", default=None, help="YYYY-MM-DD or ISO datetime")
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ryxpress", description="Reproducible Analytical Pipelines with Nix.")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+    sub.required = True
+
+    p = sub.add_parser("make", help="run the pipeline (rxp_make)")
+    p.add_argument("--script", default="gen-pipeline.R")
+    p.add_argument("--verbose", type=int, default=0)
+    p.add_argument("--max-jobs", type=int, default=1)
+    p.add_argument("--cores", type=int, default=1)
+    p.add_argument("--rscript-cmd", default="Rscript")
+    p.add_argument("--timeout", type=int, default=None)
+    p.add_argument("--cwd", default=None)
+    p.add_argument("--cache", action="store_true", help="skip populate/build when nothing changed since the last run")
+    p.add_argument("--memory-limit", type=int, default=None, help="address-space cap in bytes")
+    p.add_argument("--cpu-limit", type=int, default=None, help="CPU-time cap in seconds")
+    p.add_argument("--open-files-limit", type=int, default=None)
+
+    p = sub.add_parser("logs", help="list build logs (rxp_list_logs)")
+    p.add_argument("--project-path", default=".")
+
+    p = sub.add_parser("inspect", help="show a build log (rxp_inspect)")
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--which-log", default=None)
+    p.add_argument("--format", choices=("rows", "columns"), default="rows")
+
+    p = sub.add_parser("history", help="list past builds of a derivation (rxp_history)")
+    p.add_argument("name")
+    p.add_argument("--project-path", default=".")
+    _add_query_filters(p)
+
+    p = sub.add_parser("find", help="search builds by store path or derivation (rxp_find)")
+    p.add_argument("--path", default=None)
+    p.add_argument("--name", default=None, help="derivation name, '*' and '?' allowed")
+    p.add_argument("--project-path", default=".")
+    _add_query_filters(p)
+
+    p = sub.add_parser("trace", help="trace derivation lineage (rxp_trace)")
+    p.add_argument("name", nargs="?", default=None)
+    p.add_argument("--dag-file", default=os.path.join("_rixpress", "dag.json"))
+    p.add_argument("--no-transitive", action="store_true")
+    p.add_argument("--include-self", action="store_true")
+    p.add_argument("--no-color", action="store_true")
+
+    p = sub.add_parser("read", help="read a derivation output (rxp_read)")
+    p.add_argument("name")
+    p.add_argument("--which-log", default=None)
+    p.add_argument("--project-path", default=".")
+
+    p = sub.add_parser("prefetch", help="warm the page cache for outputs (rxp_prefetch)")
+    p.add_argument("names", nargs="*", help="derivation names (default: all)")
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--which-log", default=None)
+    p.add_argument("--decode", action="store_true", help="also decode into the artifact cache (useful with the daemon)")
+    p.add_argument("--workers", type=int, default=None)
+
+    p = sub.add_parser("copy", help="copy outputs to ./pipeline-output (rxp_copy)")
+    p.add_argument("names", nargs="*")
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--dir-mode", default="0755")
+    p.add_argument("--file-mode", default="0644")
+    p.add_argument("--hardlink", action="store_true")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--incremental", action="store_true")
+    p.add_argument("--delete-removed", action="store_true")
+    p.add_argument("--include-upstream", action="store_true")
+    p.add_argument("--archive", default=None)
+    p.add_argument("--compression", choices=("zstd", "gzip", "none"), default=None)
+
+    p = sub.add_parser("verify", help="check outputs exist and are intact (rxp_verify)")
+    p.add_argument("--which-log", default=None)
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--algorithm", default="sha256")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--nix", dest="nix_verify", action="store_true", help="also run nix-store --verify-path")
+
+    p = sub.add_parser("du", help="disk usage per derivation and per log (rxp_du)")
+    p.add_argument("--which-log", default=None)
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--closure", action="store_true")
+    p.add_argument("--sort-by", choices=("bytes", "unique_bytes", "name"), default="bytes")
+    p.add_argument("--refresh", action="store_true")
+
+    p = sub.add_parser("gc", help="garbage collect build artifacts (rxp_gc)")
+    p.add_argument("--keep-since", default=None, help="YYYY-MM-DD; omit for a full GC")
+    p.add_argument("--project-path", default=".")
+    p.add_argument("--no-dry-run", dest="dry_run", action="store_false")
+    p.add_argument("--yes", action="store_true", help="do not ask for confirmation")
+    p.add_argument("--quiet", action="store_true")
+    p.add_argument("--events-file", default=None)
+    p.add_argument("--lock-timeout", type=float, default=0)
+
+    p = sub.add_parser("dag", help="print DAG nodes/edges as JSON or text, or write a DOT/HTML file")
+    p.add_argument("--dag-file", default=os.path.join("_rixpress", "dag.json"))
+    p.add_argument("--dot", default=None, help="write a DOT file (rxp_dag_for_ci) instead of printing JSON")
+    p.add_argument("--focus", action="append", default=None, help="keep only the neighbourhood of this node (repeatable)")
+    p.add_argument("--hops", type=int, default=None, help="neighbourhood radius for --focus (default: unlimited)")
+    p.add_argument("--direction", choices=("both", "upstream", "downstream"), default="both")
+    p.add_argument("--group", dest="groups", action="append", default=None, help="keep only this pipeline_group (repeatable)")
+    p.add_argument("--collapse-groups", action="store_true", help="draw each pipeline_group as one node")
+    p.add_argument("--ascii", action="store_true", help="draw the DAG as text (rxp_ascii_dag) instead of printing JSON")
+    p.add_argument("--html", default=None, help="write an interactive HTML view (rxp_dag_html) instead of printing JSON")
+    p.add_argument("--no-color", action="store_true")
+
+    p = sub.add_parser("daemon", help="serve CLI calls over a Unix socket")
+    p.add_argument("--socket", default=None, help=f"socket path (default: ${_SOCKET_ENV} or a per-user temp path)")
+    p.add_argument("--stop", action="store_true", help="stop a running daemon")
+
+    return parser
+
+
+def _dispatch(args, in_daemon: bool = False) -> int:
+    """
+    Run a parsed (non-daemon) command in this process and return its exit code.
+
+    Inside the daemon, decoded artifacts are cached between calls and commands
+    that would prompt on stdin are refused.
+    """
+    cmd = args.command
+    if cmd == "make":
+        from .r_runner import rxp_make
+
+        res = rxp_make(
+            script=args.script,
+            verbose=args.verbose,
+            max_jobs=args.max_jobs,
+            cores=args.cores,
+            rscript_cmd=args.rscript_cmd,
+            timeout=args.timeout,
+            cwd=args.cwd,
+            cache=args.cache,
+            memory_limit=args.memory_limit,
+            cpu_limit=args.cpu_limit,
+            open_files_limit=args.open_files_limit,
+        )
+        sys.stdout.write(res.stdout or "")
+        sys.stderr.write(res.stderr or "")
+        return res.returncode
+    if cmd == "logs":
+        from .inspect_logs import rxp_list_logs
+
+        _print_json(rxp_list_logs(args.project_path))
+        return 0
+    if cmd == "inspect":
+        from .inspect_logs import rxp_inspect
+
+        _print_json(rxp_inspect(project_path=args.project_path, which_log=args.which_log, format=args.format))
+        return 0
+    if cmd in ("history", "find"):
+        from .log_index import rxp_find, rxp_history
+
+        filters = dict(
+            project_path=args.project_path, build_success=args.build_success, since=args.since, until=args.until
+        )
+        if cmd == "history":
+            _print_json(rxp_history(args.name, **filters))
+        else:
+            _print_json(rxp_find(path=args.path, derivation=args.name, **filters))
+        return 0
+    if cmd == "trace":
+        from .tracing import rxp_trace
+
+        rxp_trace(
+            name=args.name,
+            dag_file=args.dag_file,
+            transitive=not args.no_transitive,
+            include_self=args.include_self,
+            color=not args.no_color,
+        )
+        return 0
+    if cmd == "read":
+        from .read_load import rxp_read
+
+        value = rxp_read(args.name, which_log=args.which_log, project_path=args.project_path, cache=in_daemon)
+        if isinstance(value, list):
+            _print_json(value)
+        elif isinstance(value, str):
+            print(value)
+        else:
+            print(repr(value))
+        return 0
+    if cmd == "prefetch":
+        from .prefetch import rxp_prefetch
+
+        _print_json(
+            rxp_prefetch(
+                args.names or "all",
+                project_path=args.project_path,
+                which_log=args.which_log,
+                decode=args.decode,
+                workers=args.workers,
+            )
+        )
+        return 0
+    if cmd == "copy":
+        from .copy_artifacts import rxp_copy
+
+        rxp_copy(
+            derivation_name=args.names or None,
+            dir_mode=args.dir_mode,
+            file_mode=args.file_mode,
+            project_path=args.project_path,
+            hardlink=args.hardlink,
+            workers=args.workers,
+            incremental=args.incremental,
+            delete_removed=args.delete_removed,
+            include_upstream=args.include_upstream,
+            archive=args.archive,
+            compression=args.compression,
+        )
+        return 0
+    if cmd == "verify":
+        from .verify import rxp_verify
+
+        report = rxp_verify(
+            which_log=args.which_log,
+            project_path=args.project_path,
+            algorithm=args.algorithm,
+            workers=args.workers,
+            nix_verify=args.nix_verify,
+        )
+        _print_json(report)
+        return 0 if report["ok"] else 1
+    if cmd == "du":
+        from .disk_usage import rxp_du
+
+        _print_json(
+            rxp_du(
+                project_path=args.project_path,
+                which_log=args.which_log,
+                closure=args.closure,
+                sort_by=args.sort_by,
+                refresh=args.refresh,
+            )
+        )
+        return 0
+    if cmd == "gc":
+        from .garbage import rxp_gc
+
+        if in_daemon and not args.dry_run and not args.yes:
+            raise ValueError("the daemon cannot ask for confirmation; pass --yes")
+        _print_json(
+            rxp_gc(
+                keep_since=args.keep_since,
+                project_path=args.project_path,
+                dry_run=args.dry_run,
+                ask=not args.yes,
+                quiet=args.quiet,
+                events_file=args.events_file,
+                lock_timeout=args.lock_timeout,
+            )
+        )
+        return 0
+    if cmd == "dag":
+        from .plotting import get_nodes_edges, rxp_dag_for_ci
+
+        nodes_and_edges = get_nodes_edges(
+            args.dag_file,
+            focus=args.focus,
+            hops=args.hops,
+            direction=args.direction,
+            groups=args.groups,
+            collapse_groups=args.collapse_groups,
+        )
+        if args.dot:
+            rxp_dag_for_ci(nodes_and_edges, output_file=args.dot)
+            print(f"DOT file written to {args.dot}")
+        elif args.html:
+            from .dag_html import rxp_dag_html
+
+            print(f"HTML report written to {rxp_dag_html(args.html, nodes_and_edges)}")
+        elif args.ascii:
+            from .layout import rxp_ascii_dag
+
+            print(rxp_ascii_dag(nodes_and_edges, color=False if args.no_color else None))
+        else:
+            _print_json(nodes_and_edges)
+        return 0
+    raise ValueError(f"Unknown command: {cmd}")
+
+
+def _run_argv(argv: Sequence[str], in_daemon: bool = False) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(list(argv))
+    except SystemExit as e:
+        return int(e.code or 0)
+    if args.command == "daemon":
+        return _daemon(args)
+    try:
+        return _dispatch(args, in_daemon=in_daemon)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"ryxpress {args.command}: error: {e}", file=sys.stderr)
+        return 1
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+def _recv_json(sock) -> Optional[Dict[str, Any]]:
+    """Read one newline-terminated JSON message."""
+    chunks: List[bytes] = []
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            break
+        chunks.append(data)
+        if data.endswith(b"\n"):
+            break
+    if not chunks:
+        return None
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def _send_json(sock, payload: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+
+
+def _request(socket_path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon; None if no daemon is listening."""
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    try:
+        _send_json(sock, payload)
+        return _recv_json(sock)
+    finally:
+        sock.close()
+
+
+def _cacheable(argv: Sequence[str]) -> bool:
+    """True for read-only commands; argparse accepts unambiguous prefixes, so those count too."""
+    if not argv or argv[0] not in _CACHEABLE:
+        return False
+    for arg in argv[1:]:
+        opt = arg.split("=", 1)[0]
+        if len(opt) > 2 and opt.startswith("--") and any(w.startswith(opt) for w in _WRITES_FILE.get(argv[0], ())):
+            return False
+    return True
+
+
+def _query_dir(cwd: str, argv: Sequence[str]) -> Optional[str]:
+    """
+    The _rixpress directory a cacheable command reads, resolved from its own
+    --project-path or --dag-file against cwd. None when the command is not
+    cacheable, does not parse, or reads a DAG other than a project's
+    _rixpress/dag.json.
+    """
+    if not _cacheable(argv):
+        return None
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args = build_parser().parse_args(list(argv))
+    except SystemExit:
+        return None
+    dag_file = getattr(args, "dag_file", None)
+    if dag_file is not None:
+        dag_file = os.path.normpath(os.path.join(cwd, dag_file))
+        rix = os.path.dirname(dag_file)
+        if os.path.basename(dag_file) != "dag.json" or os.path.basename(rix) != "_rixpress":
+            return None
+        return rix
+    return os.path.normpath(os.path.join(cwd, args.project_path, "_rixpress"))
+
+
+def _project_fingerprint(cwd: str, argv: Sequence[str], rix: str) -> Tuple:
+    """
+    Cheap validity key for cached output: argv, cwd, the queried _rixpress
+    directory, its dag.json and newest build log. The directory mtime is not
+    used: queries themselves create and remove files there (the SQLite
+    index's -wal/-shm files).
+    """
+    key: List[Any] = [tuple(argv), cwd, rix]
+    try:
+        st = os.stat(os.path.join(rix, "dag.json"))
+        key.append((st.st_mtime_ns, st.st_size))
+    except OSError:
+        key.append(None)
+    newest: Optional[Tuple] = None
+    n_logs = 0
+    try:
+        with os.scandir(rix) as it:
+            for entry in it:
+                if entry.name.startswith("build_log") and entry.name.endswith(".json"):
+                    st = entry.stat()
+                    n_logs += 1
+                    cand = (st.st_mtime_ns, entry.name, st.st_size)
+                    if newest is None or cand > newest:
+                        newest = cand
+    except OSError:
+        pass
+    key.extend((n_logs, newest))
+    return tuple(key)
+
+
+class _Daemon:
+    """Single-threaded request loop; requests run one at a time in this process."""
+
+    # Cached responses kept, least recently used dropped first
+    max_results = 256
+
+    def __init__(self, socket_path: str):
+        import threading
+
+        self.socket_path = socket_path
+        # Watcher threads drop entries while the request loop reads them
+        self.results_lock = threading.Lock()
+        self.results: OrderedDict[Tuple, Dict[str, Any]] = OrderedDict()
+        self.running = False
+        self.watchers: Dict[str, Any] = {}
+
+    def _watch(self, rix: str) -> None:
+        """Watch a _rixpress directory once it is queried, so in-place log edits also invalidate results."""
+        if rix in self.watchers or not os.path.isdir(rix):
+            return
+        from .watch import RxpWatcher
+
+        def invalidate(_event, rix=rix):
+            with self.results_lock:
+                for key in [k for k in self.results if k[2] == rix]:
+                    del self.results[key]
+
+        try:
+            watcher = RxpWatcher(os.path.dirname(rix))
+            watcher.subscribe(invalidate)
+            self.watchers[rix] = watcher.start()
+        except Exception:
+            self.watchers[rix] = None  # don't retry on every request
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        import io
+        from contextlib import redirect_stderr, redirect_stdout
+
+        if request.get("shutdown"):
+            self.running = False
+            return {"returncode": 0, "stdout": "ryxpress daemon stopped\n", "stderr": ""}
+
+        argv = [str(a) for a in request.get("argv", [])]
+        cwd = request.get("cwd") or os.getcwd()
+        if argv and argv[0] == "daemon":
+            return {"returncode": 1, "stdout": "", "stderr": "ryxpress daemon: already running\n"}
+
+        rix = _query_dir(cwd, argv)
+        key = _project_fingerprint(cwd, argv, rix) if rix is not None else None
+        if key is not None:
+            self._watch(rix)
+            with self.results_lock:
+                cached = self.results.get(key)
+                if cached is not None:
+                    self.results.move_to_end(key)
+                    return cached
+
+        out, err = io.StringIO(), io.StringIO()
+        old_cwd = os.getcwd()
+        old_env = {k: os.environ.get(k) for k in ("NO_COLOR", "FORCE_COLOR")}
+        try:
+            os.chdir(cwd)
+            for k, v in (request.get("env") or {}).items():
+                if k in old_env and v is not None:
+                    os.environ[k] = v
+            with redirect_stdout(out), redirect_stderr(err):
+                code = _run_argv(argv, in_daemon=True)
+        except Exception as e:
+            code = 1
+            err.write(f"ryxpress daemon: {e}\n")
+        finally:
+            os.chdir(old_cwd)
+            for k, v in old_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+        response = {"returncode": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+        if key is not None and code == 0:
+            with self.results_lock:
+                self.results[key] = response
+                while len(self.results) > self.max_results:
+                    self.results.popitem(last=False)
+        return response
+
+    def serve_forever(self) -> None:
+        import socket
+
+        if os.path.exists(self.socket_path):
+            if _request(self.socket_path, {"ping": True, "argv": []}) is not None:
+                raise RuntimeError(f"A ryxpress daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket left by a dead daemon
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # socket is private to the current user
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        self.running = True
+        try:
+            while self.running:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        request = _recv_json(conn)
+                        if request is None:
+                            continue
+                        if request.get("ping"):
+                            _send_json(conn, {"returncode": 0, "stdout": "", "stderr": ""})
+                            continue
+                        _send_json(conn, self.handle(request))
+                    except Exception as e:
+                        try:
+                            _send_json(conn, {"returncode": 1, "stdout": "", "stderr": f"ryxpress daemon: {e}\n"})
+                        except OSError:
+                            pass
+        finally:
+            server.close()
+            for watcher in self.watchers.values():
+                if watcher is not None:
+                    watcher.stop()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+
+def _daemon(args) -> int:
+    socket_path = args.socket or _default_socket()
+    if args.stop:
+        resp = _request(socket_path, {"shutdown": True})
+        if resp is None:
+            print(f"No ryxpress daemon listening on {socket_path}", file=sys.stderr)
+            return 1
+        sys.stdout.write(resp.get("stdout", ""))
+        return 0
+    print(f"ryxpress daemon listening on {socket_path} (export {_SOCKET_ENV}={socket_path})", flush=True)
+    try:
+        _Daemon(socket_path).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _forward(argv: Sequence[str]) -> Optional[int]:
+    """Forward argv to the daemon named by RYXPRESS_SOCKET; None if there is none."""
+    socket_path = os.environ.get(_SOCKET_ENV)
+    if not socket_path or not argv or argv[0] == "daemon" or argv[0] in ("-h", "--help"):
+        return None
+    env = {k: os.environ[k] for k in ("NO_COLOR", "FORCE_COLOR") if k in os.environ}
+    resp = _request(socket_path, {"argv": list(argv), "cwd": os.getcwd(), "env": env})
+    if resp is None:
+        return None
+    sys.stdout.write(resp.get("stdout", ""))
+    sys.stderr.write(resp.get("stderr", ""))
+    return int(resp.get("returncode", 1))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the 'ryxpress' console script."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    forwarded = _forward(argv)
+    if forwarded is not None:
+        return forwarded
+    return _run_argv(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,18 @@ Behavior:
 
 - Uses rxp_inspect to read the most recent build log and find derivation
   entries and their store paths.
-- Copies the outputs of a single derivation (or the special "all-derivations")
-  into ./pipeline-output (created if necessary).
-- Applies POSIX permission modes to directories and files (dir_mode/file_mode
-  are octal strings like "0755" or "755").
+- Copies the outputs of one or more derivations (or the special
+  "all-derivations"), optionally together with their upstream dependencies
+  from dag.json, into ./pipeline-output (created if necessary).
+- Copies files on a thread pool using reflinks (FICLONE) or
+  os.copy_file_range where the filesystem supports them, optionally
+  hardlinking instead, and sets POSIX permission modes (dir_mode/file_mode are
+  octal strings like "0755" or "755") as each file is written rather than in
+  a second walk over the output tree.
+- Records every copied file in pipeline-output/.rxp-manifest.json so that
+  incremental copies can skip files whose store source did not change.
+- Alternatively streams the outputs into a reproducible tar archive
+  (zstd/gzip/uncompressed) without staging them on disk.
 - Returns None; raises exceptions on errors.
 """
 from __future__ import annotations
@@ -18,12 +26,11 @@ from __future__ import annotations
 import logging
 import os
 import re
-import shutil
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .inspect_logs import rxp_inspect, rxp_list_logs
+from .instrument import bind, count, enabled, span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -42,38 +49,249 @@ def _to_mode_int(mode: str) -> int:
     return int(mode, 8)
 
 
-def _apply_permissions(root_dir: Path, dir_mode: str, file_mode: str) -> None:
+# ioctl request number for FICLONE (reflink a whole file) on Linux
+_FICLONE = 0x40049409
+_COPY_CHUNK = 1024 * 1024
+
+
+def _build_copy_plan(
+    store_paths: Sequence[str],
+    output_dir: Path,
+) -> Tuple[List[Path], List[Tuple[Path, Path]], List[str]]:
     """
-    Recursively set POSIX permissions for all directories and files under root_dir.
-    Best-effort; failures are ignored (mirroring R's suppressWarnings).
+    Expand store paths into the directories to create and the (src, dst) file
+    pairs to copy, mirroring the layout rxp_copy has always produced: the
+    children of a directory output are merged into output_dir, a file output
+    is copied as output_dir/<name>. Symlinks are followed (like copytree's
+    default), which matters for symlinkJoin outputs such as all-derivations.
+
+    Returns (dirs, files, errors); dirs are ordered parents-first.
     """
+    dirs: List[Path] = []
+    files: List[Tuple[Path, Path]] = []
+    errors: List[str] = []
+    for store_path_str in store_paths:
+        store_path = Path(store_path_str)
+        if not store_path.exists():
+            # Skip non-existing path (warn)
+            logger.warning("Store path does not exist, skipping: %s", store_path)
+            continue
+        if not store_path.is_dir():
+            files.append((store_path, output_dir / store_path.name))
+            continue
+        try:
+            children = sorted(store_path.iterdir())
+        except OSError as e:
+            errors.append(f"{store_path}: {e}")
+            continue
+        for child in children:
+            dest = output_dir / child.name
+            if not child.is_dir():
+                files.append((child, dest))
+                continue
+            for dirpath, dirnames, filenames in os.walk(child, followlinks=True, onerror=lambda e: errors.append(str(e))):
+                dirnames.sort()
+                rel = os.path.relpath(dirpath, child)
+                target_dir = dest if rel == "." else dest / rel
+                dirs.append(target_dir)
+                for fname in sorted(filenames):
+                    files.append((Path(dirpath) / fname, target_dir / fname))
+    return dirs, files, errors
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone src into dst with FICLONE (btrfs, XFS, bcachefs...). False if unsupported."""
     try:
-        dmode = _to_mode_int(dir_mode)
-        fmode = _to_mode_int(file_mode)
-    except ValueError:
-        # Should not happen because validated earlier, but be defensive
-        return
+        import fcntl
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except Exception:
+        return False
 
-    # Apply to root_dir itself (if it exists)
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    """In-kernel copy with os.copy_file_range (Linux, Python 3.8+). False if unsupported."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+    copied = 0
     try:
-        if root_dir.exists():
-            os.chmod(root_dir, dmode)
-    except Exception:
-        logger.debug("Failed to chmod directory %s", root_dir)
+        while copied < size:
+            n = copy_file_range(src_fd, dst_fd, size - copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError:
+        if copied:
+            # partial copy: rewind and let the caller fall back to a plain copy
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+        return False
+    return True
+
+
+def _copy_file(src: Path, dst: Path, fmode: int, hardlink: bool = False) -> str:
+    """
+    Copy (or hardlink) a single file and set its permissions in the same step.
 
-    # Walk the tree and apply modes
-    for dirpath, dirnames, filenames in os.walk(root_dir):
+    Tries, in order: hardlink (if requested), reflink, copy_file_range and a
+    buffered read/write loop. The source mtime is preserved, like shutil.copy2.
+    Hardlinked files share the store inode and are therefore left untouched
+    (the read-only store mode is kept). Returns the method used.
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            logger.debug("Hardlink failed for %s; falling back to a copy", src)
+
+    st = os.stat(src)
+    with open(src, "rb") as fin:
+        out_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, fmode)
         try:
-            os.chmod(dirpath, dmode)
-        except Exception:
-            logger.debug("Failed to chmod directory %s", dirpath)
-        for fname in filenames:
-            fpath = Path(dirpath) / fname
             try:
-                os.chmod(fpath, fmode)
-            except Exception:
-                logger.debug("Failed to chmod file %s", fpath)
-        # ensure subdirectories get the directory mode on next loop iteration
+                os.chmod(dst, fmode)  # the umask may have masked bits at creation
+            except OSError:
+                logger.debug("Failed to chmod file %s", dst)
+            if _reflink(fin.fileno(), out_fd):
+                method = "reflink"
+            elif _copy_range(fin.fileno(), out_fd, st.st_size):
+                method = "copy_file_range"
+            else:
+                import shutil
+
+                method = "copy"
+                with os.fdopen(os.dup(out_fd), "wb") as fout:
+                    shutil.copyfileobj(fin, fout, _COPY_CHUNK)
+        finally:
+            os.close(out_fd)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return method
+
+
+def _run_copy_plan(
+    dirs: Sequence[Path],
+    files: Sequence[Tuple[Path, Path]],
+    dmode: int,
+    fmode: int,
+    hardlink: bool = False,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Create dirs, copy files on a thread pool, then apply dmode to the created
+    directories (last, so a restrictive dir_mode cannot block the copy).
+    Returns a list of error strings (empty on success).
+    """
+    errors: List[str] = []
+    for d in dirs:
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            errors.append(f"{d}: {e}")
+
+    def _one(pair: Tuple[Path, Path]) -> Optional[str]:
+        src, dst = pair
+        try:
+            _copy_file(src, dst, fmode, hardlink=hardlink)
+        except Exception as e:
+            logger.debug("Copy error for %s: %s", src, e)
+            return f"{src}: {e}"
+        return None
+
+    if workers == 1 or len(files) <= 1:
+        results = [_one(pair) for pair in files]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(bind(_one), files))
+    errors.extend(r for r in results if r)
+
+    for d in reversed(dirs):
+        try:
+            os.chmod(d, dmode)
+        except OSError:
+            logger.debug("Failed to chmod directory %s", d)
+    return errors
+
+
+_MANIFEST_NAME = ".rxp-manifest.json"
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, Dict[str, object]]:
+    """Return the {relative file: entry} mapping recorded by previous copies (empty if none)."""
+    import json
+
+    try:
+        with (output_dir / _MANIFEST_NAME).open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    files = data.get("files") if isinstance(data, dict) else None
+    return files if isinstance(files, dict) else {}
+
+
+def _write_manifest(output_dir: Path, files: Dict[str, Dict[str, object]]) -> None:
+    """Atomically write the copy manifest (best-effort)."""
+    import json
+
+    tmp = output_dir / (_MANIFEST_NAME + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump({"version": 1, "files": files}, fh, sort_keys=True)
+        os.replace(tmp, output_dir / _MANIFEST_NAME)
+    except OSError:
+        logger.debug("Failed to write copy manifest in %s", output_dir, exc_info=True)
+
+
+def _manifest_entry(src: Path, origin: str) -> Dict[str, object]:
+    """Describe a planned file: the resolved store file it comes from, its size and mtime."""
+    real = os.path.realpath(src)
+    st = os.stat(real)
+    return {"source": real, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "origin": origin}
+
+
+def _is_unchanged(entry: Dict[str, object], old: Optional[Dict[str, object]], dst: Path) -> bool:
+    """
+    Store paths are immutable, so a file whose resolved source path, size and
+    mtime match the previous copy does not need to be copied again, provided
+    the destination is still there with the expected size.
+    """
+    if not old:
+        return False
+    if any(old.get(k) != entry[k] for k in ("source", "size", "mtime_ns")):
+        return False
+    try:
+        return os.stat(dst).st_size == entry["size"]
+    except OSError:
+        return False
+
+
+def _remove_stale(output_dir: Path, rel_paths: Sequence[str]) -> None:
+    """Delete files that vanished upstream, then prune directories left empty."""
+    parents = set()
+    for rel in rel_paths:
+        target = output_dir / rel
+        try:
+            target.unlink()
+            logger.debug("Removed stale file %s", target)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.debug("Failed to remove stale file %s", target)
+        parents.update(p for p in target.parents if p != output_dir and output_dir in p.parents)
+    for d in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+        try:
+            d.rmdir()
+        except OSError:
+            pass
 
 
 def _ensure_output_dir(base: Path) -> Path:
@@ -115,21 +333,174 @@ def _ensure_iterable_of_strings(val) -> List[str]:
     return [str(val)]
 
 
+_COMPRESSION_SUFFIXES = (
+    (".tar.zst", "zstd"),
+    (".tzst", "zstd"),
+    (".tar.gz", "gzip"),
+    (".tgz", "gzip"),
+    (".tar", "none"),
+)
+
+
+def _infer_compression(archive: Path, compression: Optional[str]) -> str:
+    if compression is not None:
+        if compression not in ("zstd", "gzip", "none"):
+            raise ValueError(f'Invalid compression: "{compression}". Use "zstd", "gzip" or "none".')
+        return compression
+    name = archive.name.lower()
+    for suffix, kind in _COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            return kind
+    raise ValueError(
+        f"Cannot infer compression from {archive.name!r}; pass compression= or use .tar.zst, .tar.gz or .tar."
+    )
+
+
+def _zstd_writer(raw):
+    """Return a writable zstd stream wrapping raw, from the stdlib (3.14+) or 'zstandard'."""
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd.ZstdFile(raw, mode="wb")
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImportError(
+            "zstd archives need Python 3.14+ or the 'zstandard' package. "
+            "Install it, or use a .tar.gz / .tar archive."
+        ) from e
+    return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+
+
+def _write_archive(
+    archive: Path,
+    dirs: Iterable[str],
+    members: Sequence[Tuple[str, Path]],
+    dmode: int,
+    fmode: int,
+    compression: Optional[str] = None,
+) -> Path:
+    """
+    Stream files into a deterministic tar archive.
+
+    Members are written in sorted order with fixed metadata; file contents are
+    streamed in chunks, so memory use does not depend on the output size. The
+    archive is written to a temporary name and renamed on success.
+    """
+    import tarfile
+
+    kind = _infer_compression(archive, compression)
+    mtime = int(os.environ.get("SOURCE_DATE_EPOCH", "0") or 0)
+
+    def _info(name: str, is_dir: bool, size: int = 0) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.DIRTYPE if is_dir else tarfile.REGTYPE
+        info.mode = dmode if is_dir else fmode
+        info.size = size
+        info.mtime = mtime
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        return info
+
+    entries = sorted([(d, None) for d in dirs] + list(members), key=lambda e: e[0])
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    tmp = archive.with_name(archive.name + ".tmp")
+    try:
+        with open(tmp, "wb") as raw:
+            if kind == "gzip":
+                import gzip
+
+                stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+            elif kind == "zstd":
+                stream = _zstd_writer(raw)
+            else:
+                stream = None
+            try:
+                with tarfile.open(fileobj=stream or raw, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                    for name, src in entries:
+                        if src is None:
+                            tar.addfile(_info(name, True))
+                            continue
+                        with open(src, "rb") as fh:
+                            tar.addfile(_info(name, False, os.fstat(fh.fileno()).st_size), fh)
+            finally:
+                if stream is not None:
+                    stream.close()
+        os.replace(tmp, archive)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return archive
+
+
+def _with_upstream(names: Sequence[str], dag_file: Path) -> List[str]:
+    """Return names followed by all their transitive dependencies from dag.json (deduplicated)."""
+    from .tracing import _extract_name, _load_dag, _make_depends_map, _traverse
+
+    derivs, _ = _load_dag(dag_file)
+    all_names = [_extract_name(d) or "" for d in derivs]
+    depends_map = _make_depends_map(derivs, all_names)
+    out: List[str] = []
+    seen = set()
+    for name in names:
+        for n in [name] + _traverse(name, depends_map):
+            if n not in seen:
+                seen.add(n)
+                out.append(n)
+    return out
+
+
+@traced("rxp_copy")
 def rxp_copy(
-    derivation_name: Optional[str] = None,
+    derivation_name: Optional[Union[str, Sequence[str]]] = None,
     dir_mode: str = "0755",
     file_mode: str = "0644",
     project_path: Union[str, Path] = ".",
+    hardlink: bool = False,
+    workers: Optional[int] = None,
+    incremental: bool = False,
+    delete_removed: bool = False,
+    include_upstream: bool = False,
+    dag_file: Optional[Union[str, Path]] = None,
+    archive: Optional[Union[str, Path]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """
     Copy derivations from the Nix store to ./pipeline-output.
 
     Args:
-        derivation_name: name of the derivation to copy (string). If None,
-            uses the special derivation name "all-derivations" (mirrors R).
+        derivation_name: name of the derivation to copy (string), or a list of
+            names copied together in a single pass. If None, uses the special
+            derivation name "all-derivations" (mirrors R).
         dir_mode: octal permission string applied to copied directories (default "0755").
         file_mode: octal permission string applied to copied files (default "0644").
         project_path: project root where _rixpress lives (defaults to ".").
+        hardlink: if True, hardlink files from the store instead of copying them
+            (falls back to copying across filesystems). Hardlinked files keep the
+            store's read-only mode; file_mode only applies to copied files.
+        workers: number of copy threads (defaults to the ThreadPoolExecutor
+            default; 1 copies serially).
+        incremental: if True, skip files whose store source is unchanged since
+            the previous copy, as recorded in pipeline-output/.rxp-manifest.json
+            (the manifest is written by every copy).
+        delete_removed: if True, delete files previously copied for this
+            derivation that no longer exist in its current outputs.
+        include_upstream: if True, also copy every ancestor of the requested
+            derivations, as recorded in dag.json.
+        dag_file: dag.json used by include_upstream (defaults to
+            <project_path>/_rixpress/dag.json).
+        archive: if given, stream the outputs straight from the store into this
+            tar archive instead of ./pipeline-output. Members are sorted and get
+            a fixed mtime (SOURCE_DATE_EPOCH, or 0), uid/gid 0 and the
+            dir_mode/file_mode permissions, so archives are reproducible.
+        compression: "zstd", "gzip" or "none". Inferred from the archive
+            suffix (.tar.zst, .tar.gz/.tgz, .tar) when None. zstd needs Python
+            3.14+ or the 'zstandard' package.
 
     Returns:
         None. Prints a success message upon completion.
@@ -185,75 +556,128 @@ def rxp_copy(
     # Choose derivation_name if not provided
     if derivation_name is None:
         derivation_name = "all-derivations"
+    names = _ensure_iterable_of_strings(derivation_name)
+    if not names:
+        raise ValueError("derivation_name must be a derivation name or a list of names.")
 
-    if derivation_name not in deriv_to_paths:
+    missing = [n for n in names if n not in deriv_to_paths]
+    if missing:
         # Provide hint of available derivations (up to 20)
         available = list(deriv_to_paths.keys())[:20]
         more = ", ..." if len(deriv_to_paths) > 20 else ""
         raise ValueError(
-            f"No derivation {derivation_name!r} found in the build log. Available: {', '.join(available)}{more}"
+            f"No derivation {missing[0]!r} found in the build log. Available: {', '.join(available)}{more}"
         )
 
-    # Collect paths for this derivation
-    deriv_paths = deriv_to_paths.get(derivation_name, [])
-    if not deriv_paths:
-        raise RuntimeError(f"No store paths recorded for derivation {derivation_name!r} in the build log.")
-
-    output_dir = _ensure_output_dir(Path.cwd())
-
-    # For each store path, copy its contents into output_dir
-    copy_failed = False
+    if include_upstream:
+        names = _with_upstream(names, Path(dag_file) if dag_file is not None else project / "_rixpress" / "dag.json")
+        skipped = [n for n in names if n not in deriv_to_paths]
+        if skipped:
+            logger.warning("Upstream derivations missing from the build log, skipping: %s", ", ".join(skipped))
+        names = [n for n in names if n in deriv_to_paths]
+
+    # Collect store paths, deduplicated across derivations; remember who owns each
+    path_origin: Dict[str, str] = {}
+    for name in names:
+        deriv_paths = deriv_to_paths.get(name, [])
+        if not deriv_paths:
+            raise RuntimeError(f"No store paths recorded for derivation {name!r} in the build log.")
+        for p in deriv_paths:
+            path_origin.setdefault(p, name)
+
+    # Archives are written straight from the store: pipeline-output is only
+    # used to compute relative member names and is never created.
+    output_dir = Path.cwd() / "pipeline-output" if archive is not None else _ensure_output_dir(Path.cwd())
+
+    # One plan for everything; when several outputs provide the same file, the
+    # later one wins (as successive copies would) and it is copied only once.
+    dirs: List[Path] = []
+    planned_files: Dict[Path, Tuple[Path, str]] = {}
     errors: List[str] = []
-    for store_path_str in deriv_paths:
-        store_path = Path(store_path_str)
-        if not store_path.exists():
-            # Skip non-existing path (warn)
-            logger.warning("Store path does not exist, skipping: %s", store_path)
-            continue
+    for store_path, origin in path_origin.items():
+        p_dirs, p_files, p_errors = _build_copy_plan([store_path], output_dir)
+        dirs.extend(p_dirs)
+        errors.extend(p_errors)
+        for src, dst in p_files:
+            planned_files.pop(dst, None)
+            planned_files[dst] = (src, origin)
+    files = [(src, dst, origin) for dst, (src, origin) in planned_files.items()]
+
+    if archive is not None:
+        if errors:
+            raise RuntimeError(f"Copy unsuccessful: errors occurred:\n" + "\n".join(errors))
+        members = [(dst.relative_to(output_dir).as_posix(), src) for src, dst, _ in files]
+        member_dirs = {d.relative_to(output_dir).as_posix() for d in dirs}
+        with span("write_archive", files=len(members)):
+            archive_path = _write_archive(
+                Path(archive),
+                member_dirs,
+                members,
+                dmode=_to_mode_int(dir_mode),
+                fmode=_to_mode_int(file_mode),
+                compression=compression,
+            )
+        print(f"Archive written, check out {archive_path}")
+        return None
+
+    # Record what each destination file was copied from; with incremental=True,
+    # skip files whose (immutable) store source is unchanged since the last copy.
+    old_manifest = _load_manifest(output_dir)
+    manifest = dict(old_manifest)
+    planned = set()
+    to_copy: List[Tuple[Path, Path]] = []
+    for src, dst, origin in files:
+        rel = dst.relative_to(output_dir).as_posix()
+        planned.add(rel)
         try:
-            # If the derivation path is a directory, copy its children into output_dir
-            if store_path.is_dir():
-                # copy each child into output_dir, preserving names
-                for child in store_path.iterdir():
-                    dest = output_dir / child.name
-                    if child.is_dir():
-                        # Python 3.8+: dirs_exist_ok True will merge
-                        try:
-                            shutil.copytree(child, dest, dirs_exist_ok=True)
-                        except TypeError:
-                            # older Python: fallback to manual merge
-                            if dest.exists():
-                                # copy contents into existing dest
-                                for sub in child.rglob("*"):
-                                    rel = sub.relative_to(child)
-                                    target = dest / rel
-                                    if sub.is_dir():
-                                        target.mkdir(parents=True, exist_ok=True)
-                                    else:
-                                        target.parent.mkdir(parents=True, exist_ok=True)
-                                        shutil.copy2(sub, target)
-                            else:
-                                shutil.copytree(child, dest)
-                    else:
-                        # file: copy, possibly overwrite
-                        shutil.copy2(child, dest)
-            else:
-                # store_path is a file: copy into output_dir
-                dest_file = output_dir / store_path.name
-                shutil.copy2(store_path, dest_file)
-        except Exception as e:
-            copy_failed = True
-            errors.append(f"{store_path}: {e}")
-            logger.debug("Copy error for %s: %s", store_path, e)
-
-    # Apply permissions
+            entry = _manifest_entry(src, origin)
+        except OSError as e:
+            errors.append(f"{src}: {e}")
+            continue
+        if not (incremental and _is_unchanged(entry, old_manifest.get(rel), dst)):
+            to_copy.append((src, dst))
+        manifest[rel] = entry
+    logger.debug("Copying %d of %d files (%d unchanged)", len(to_copy), len(files), len(files) - len(to_copy))
+    count("cache_hits", len(files) - len(to_copy))
+
+    if delete_removed:
+        stale = [
+            rel for rel, entry in old_manifest.items()
+            if rel not in planned and isinstance(entry, dict) and entry.get("origin") in names
+        ]
+        _remove_stale(output_dir, stale)
+        for rel in stale:
+            manifest.pop(rel, None)
+
+    with span("copy_files", files=len(to_copy)) as s:
+        if enabled():
+            s.add("bytes_read", sum(manifest[dst.relative_to(output_dir).as_posix()]["size"] for _, dst in to_copy))
+        errors += _run_copy_plan(
+            dirs,
+            to_copy,
+            dmode=_to_mode_int(dir_mode),
+            fmode=_to_mode_int(file_mode),
+            hardlink=hardlink,
+            workers=workers,
+        )
     try:
-        _apply_permissions(output_dir, dir_mode=dir_mode, file_mode=file_mode)
-    except Exception:
-        # Best-effort: ignore permission application errors
-        logger.debug("Failed to apply permissions to %s", output_dir)
-
-    if copy_failed:
+        os.chmod(output_dir, _to_mode_int(dir_mode))
+    except OSError:
+        logger.debug("Failed to chmod directory %s", output_dir)
+
+    if errors:
+        # don't vouch for destinations a failed copy may have left incomplete
+        for _, dst in to_copy:
+            rel = dst.relative_to(output_dir).as_posix()
+            try:
+                ok = os.stat(dst).st_size == manifest[rel]["size"]
+            except (OSError, KeyError):
+                ok = False
+            if not ok:
+                manifest.pop(rel, None)
+    _write_manifest(output_dir, manifest)
+
+    if errors:
         raise RuntimeError(f"Copy unsuccessful: errors occurred:\n" + "\n".join(errors))
 
     # Success message
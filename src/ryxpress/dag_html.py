@@ -0,0 +1,347 @@
+"""
+Self-contained HTML view of the pipeline DAG with a precomputed layout.
+
+Behavior:
+
+- rxp_dag_html lays out the nodes/edges of get_nodes_edges once in Python,
+  with the same layering and crossing reduction as rxp_ascii_dag, and
+  stores pixel coordinates for every node and edge bend.
+- Build status comes from the latest build log (rxp_inspect): "built",
+  "failed", or "not built" when a derivation is missing from the log or
+  there is no log yet. Fields of the log row other than the derivation
+  name (store path, outputs and any timing fields such as duration) are
+  shown with the node. Collapsed groups are "failed" if any member failed
+  and "built" only if all members were built.
+- The output is one HTML file with the data embedded as JSON and a small
+  canvas renderer (pan, zoom, hover details, search); no network access or
+  JavaScript libraries are needed and the browser never runs a layout, so
+  large graphs open immediately. The same data can be written as JSON.
+"""
+from __future__ import annotations
+
+import html
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .instrument import span, traced
+from .layout import _columns, _layered
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_dag_html"]
+
+
+# Pixel metrics of the precomputed layout
+_CHAR_W = 7
+_PAD = 8
+_NODE_H = 24
+_LAYER_H = 72
+_GAP = 24
+_PLACEHOLDER_W = 8
+_MARGIN = 20
+
+# Row fields that hold build timings, when a log has them
+_TIMING_KEYS = ("duration", "build_time", "elapsed", "wall_time")
+
+
+def _latest_build(project_path: Path) -> Dict[str, Any]:
+    """Rows of the most recent build log by derivation, plus the log name."""
+    from .inspect_logs import rxp_inspect, rxp_list_logs
+
+    try:
+        logs = rxp_list_logs(project_path)
+        name = logs[0]["filename"]
+        rows = rxp_inspect(project_path, which_log=f"^{re.escape(name)}$")
+    except (FileNotFoundError, RuntimeError) as e:
+        logger.info("No build status for the DAG report: %s", e)
+        return {"log": None, "rows": {}}
+    by_name = {}
+    for row in rows or []:
+        if isinstance(row, dict) and row.get("derivation") is not None:
+            by_name[str(row["derivation"])] = row
+    return {"log": name, "rows": by_name}
+
+
+def _status(row: Optional[Dict[str, Any]]) -> str:
+    if row is None:
+        return "not built"
+    return "built" if row.get("build_success") else "failed"
+
+
+def _layout_data(nodes_and_edges: Dict[str, List[Dict]], build: Dict[str, Any], max_iterations: int) -> Dict[str, Any]:
+    g = _layered(nodes_and_edges, max_iterations)
+    labels = [str(n.get("label") or n["id"]) if n is not None else "" for n in g.nodes]
+    width = [len(s) * _CHAR_W + 2 * _PAD if n is not None else _PLACEHOLDER_W for s, n in zip(labels, g.nodes)]
+    x, center = _columns(g.rows, g.up, width, _GAP, g.nodes)
+    rows = build["rows"]
+
+    nodes = []
+    for v, n in enumerate(g.nodes):
+        if n is None:
+            continue
+        members = n.get("members")
+        if members:
+            statuses = {_status(rows.get(m)) for m in members}
+            status = "failed" if "failed" in statuses else "built" if statuses == {"built"} else "not built"
+            row = None
+        else:
+            row = rows.get(n["id"])
+            status = _status(row)
+        details = {k: val for k, val in (row or {}).items() if k not in ("derivation", "build_success")}
+        duration = next((details[k] for k in _TIMING_KEYS if isinstance(details.get(k), (int, float))), None)
+        nodes.append({
+            "id": n["id"],
+            "label": labels[v],
+            "x": x[v] + _MARGIN,
+            "y": g.layer[v] * _LAYER_H + _MARGIN,
+            "w": width[v],
+            "group": n.get("group"),
+            "pipeline_group": n.get("pipeline_group"),
+            "pipeline_color": n.get("pipeline_color"),
+            "members": members,
+            "status": status,
+            "duration": duration,
+            "build": details,
+        })
+
+    edges = []
+    for path in g.paths:
+        src, dst = g.nodes[path[0]], g.nodes[path[-1]]
+        points = [center[path[0]] + _MARGIN, g.layer[path[0]] * _LAYER_H + _NODE_H + _MARGIN]
+        for d in path[1:-1]:
+            points += [center[d] + _MARGIN, g.layer[d] * _LAYER_H + _NODE_H // 2 + _MARGIN]
+        points += [center[path[-1]] + _MARGIN, g.layer[path[-1]] * _LAYER_H + _MARGIN]
+        edges.append({"from": src["id"], "to": dst["id"], "points": points})
+
+    right = max((x[v] + width[v] for v in range(len(width))), default=0)
+    return {
+        "log": build["log"],
+        "width": right + 2 * _MARGIN,
+        "height": (max(g.layer, default=0) * _LAYER_H) + _NODE_H + 2 * _MARGIN,
+        "node_height": _NODE_H,
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+@traced()
+def rxp_dag_html(
+    output: Union[str, Path] = "_rixpress/dag.html",
+    nodes_and_edges: Optional[Dict[str, List[Dict]]] = None,
+    project_path: Union[str, Path] = ".",
+    json_output: Union[None, str, Path] = None,
+    title: Optional[str] = None,
+    max_iterations: int = 8,
+) -> Path:
+    """
+    Write a shareable, interactive HTML view of the pipeline DAG.
+
+    Args:
+        output: HTML file to write (parent directories are created).
+        nodes_and_edges: dict as returned by get_nodes_edges() (any subgraph
+            selection applies). If None, the project's _rixpress/dag.json is read.
+        project_path: project root whose latest build log supplies status
+            and timings.
+        json_output: optionally also write the laid-out data as JSON here.
+        title: page title (defaults to "Pipeline DAG" plus the log name).
+        max_iterations: maximum number of crossing-reduction sweeps.
+
+    Returns:
+        The path of the HTML file.
+
+    Raises:
+        FileNotFoundError: if nodes_and_edges is None and dag.json is missing.
+
+    Example:
+        rxp_dag_html("dag.html", get_nodes_edges(groups=["ETL"]))
+    """
+    proj = Path(project_path)
+    if nodes_and_edges is None:
+        from .plotting import get_nodes_edges
+
+        nodes_and_edges = get_nodes_edges(proj / "_rixpress" / "dag.json")
+
+    build = _latest_build(proj)
+    with span("layout", nodes=len(nodes_and_edges.get("nodes", []))):
+        data = _layout_data(nodes_and_edges, build, max_iterations)
+    if title is None:
+        title = "Pipeline DAG" + (f" ({build['log']})" if build["log"] else "")
+
+    payload = json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":"))
+    page = _TEMPLATE.replace("__TITLE__", html.escape(title)).replace(
+        "__DATA__", payload.replace("</", "<\\/")
+    )
+    out = Path(output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(page, encoding="utf-8")
+    if json_output is not None:
+        jpath = Path(json_output)
+        jpath.parent.mkdir(parents=True, exist_ok=True)
+        jpath.write_text(json.dumps(data, ensure_ascii=False, default=str, indent=2), encoding="utf-8")
+    return out
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; font: 12px monospace; background: #fff; color: #222; }
+  #bar { position: fixed; top: 0; left: 0; right: 0; padding: 6px 10px; background: #f4f4f4;
+         border-bottom: 1px solid #ddd; z-index: 1; }
+  #bar input { font: inherit; width: 16em; }
+  #legend span { display: inline-block; margin-left: 1em; }
+  #legend i { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+  canvas { display: block; position: absolute; top: 0; left: 0; }
+  #tip { position: fixed; display: none; max-width: 40em; padding: 6px 8px; background: #fff;
+         border: 1px solid #999; white-space: pre-wrap; pointer-events: none; z-index: 2; }
+</style>
+</head>
+<body>
+<div id="bar">
+  <b>__TITLE__</b>
+  <input id="search" placeholder="find derivation" autocomplete="off">
+  <span id="legend"></span>
+</div>
+<canvas id="dag"></canvas>
+<div id="tip"></div>
+<script id="rxp-data" type="application/json">__DATA__</script>
+<script>
+(function () {
+  "use strict";
+  var data = JSON.parse(document.getElementById("rxp-data").textContent);
+  var FILL = {"built": "#d8f0d8", "failed": "#f6d0d0", "not built": "#eeeeee"};
+  var H = data.node_height;
+  var canvas = document.getElementById("dag"), ctx = canvas.getContext("2d");
+  var tip = document.getElementById("tip"), search = document.getElementById("search");
+  var view = {x: 0, y: 0, k: 1}, match = null, hover = null;
+
+  var legend = document.getElementById("legend");
+  Object.keys(FILL).forEach(function (s) {
+    var n = data.nodes.filter(function (d) { return d.status === s; }).length;
+    legend.insertAdjacentHTML("beforeend", "<span><i style='background:" + FILL[s] + "'></i>" + s + ": " + n + "</span>");
+  });
+
+  // Edge bounding boxes, for culling off-screen edges
+  data.edges.forEach(function (e) {
+    var p = e.points, x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+    for (var i = 0; i < p.length; i += 2) {
+      x0 = Math.min(x0, p[i]); x1 = Math.max(x1, p[i]);
+      y0 = Math.min(y0, p[i + 1]); y1 = Math.max(y1, p[i + 1]);
+    }
+    e.box = [x0, y0, x1, y1];
+  });
+
+  function resize() {
+    var r = window.devicePixelRatio || 1;
+    canvas.width = innerWidth * r; canvas.height = innerHeight * r;
+    canvas.style.width = innerWidth + "px"; canvas.style.height = innerHeight + "px";
+    draw();
+  }
+
+  function visible(x0, y0, x1, y1) {
+    var left = -view.x / view.k, top = -view.y / view.k;
+    return x1 >= left && x0 <= left + innerWidth / view.k && y1 >= top && y0 <= top + innerHeight / view.k;
+  }
+
+  function draw() {
+    var r = window.devicePixelRatio || 1;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.setTransform(r * view.k, 0, 0, r * view.k, r * view.x, r * view.y);
+    ctx.lineWidth = 1 / view.k;
+    ctx.strokeStyle = "#888"; ctx.fillStyle = "#888";
+    data.edges.forEach(function (e) {
+      if (!visible.apply(null, e.box)) return;
+      var p = e.points, n = p.length;
+      ctx.beginPath(); ctx.moveTo(p[0], p[1]);
+      for (var i = 2; i < n; i += 2) ctx.lineTo(p[i], p[i + 1]);
+      ctx.stroke();
+      ctx.beginPath(); ctx.moveTo(p[n - 2], p[n - 1]);
+      ctx.lineTo(p[n - 2] - 4, p[n - 1] - 7); ctx.lineTo(p[n - 2] + 4, p[n - 1] - 7);
+      ctx.fill();
+    });
+    var showText = view.k > 0.35;
+    ctx.textBaseline = "middle"; ctx.font = "12px monospace";
+    data.nodes.forEach(function (d) {
+      if (!visible(d.x, d.y, d.x + d.w, d.y + H)) return;
+      ctx.fillStyle = FILL[d.status] || "#eee";
+      ctx.fillRect(d.x, d.y, d.w, H);
+      ctx.lineWidth = (d === hover || (match && match.has(d)) ? 3 : 1.5) / view.k;
+      ctx.strokeStyle = d.pipeline_color || "#555";
+      ctx.strokeRect(d.x, d.y, d.w, H);
+      if (showText) { ctx.fillStyle = "#222"; ctx.fillText(d.label, d.x + 8, d.y + H / 2); }
+    });
+  }
+
+  function nodeAt(cx, cy) {
+    var x = (cx - view.x) / view.k, y = (cy - view.y) / view.k;
+    for (var i = data.nodes.length - 1; i >= 0; i--) {
+      var d = data.nodes[i];
+      if (x >= d.x && x <= d.x + d.w && y >= d.y && y <= d.y + H) return d;
+    }
+    return null;
+  }
+
+  function describe(d) {
+    var lines = [d.id, "status: " + d.status];
+    if (d.duration !== null) lines.push("duration: " + d.duration + " s");
+    if (d.pipeline_group) lines.push("pipeline group: " + d.pipeline_group);
+    if (d.group) lines.push("type: " + d.group);
+    if (d.members) lines.push("members: " + d.members.join(", "));
+    Object.keys(d.build).forEach(function (k) {
+      if (k !== "duration") lines.push(k + ": " + JSON.stringify(d.build[k]));
+    });
+    return lines.join("\\n");
+  }
+
+  var drag = null;
+  canvas.addEventListener("mousedown", function (ev) { drag = {x: ev.clientX - view.x, y: ev.clientY - view.y}; });
+  window.addEventListener("mouseup", function () { drag = null; });
+  canvas.addEventListener("mousemove", function (ev) {
+    if (drag) { view.x = ev.clientX - drag.x; view.y = ev.clientY - drag.y; draw(); return; }
+    var d = nodeAt(ev.clientX, ev.clientY);
+    if (d !== hover) { hover = d; draw(); }
+    if (d) {
+      tip.textContent = describe(d);
+      tip.style.left = (ev.clientX + 12) + "px"; tip.style.top = (ev.clientY + 12) + "px";
+      tip.style.display = "block";
+    } else {
+      tip.style.display = "none";
+    }
+  });
+  canvas.addEventListener("wheel", function (ev) {
+    ev.preventDefault();
+    var f = Math.exp(-ev.deltaY * 0.0015), k = Math.min(8, Math.max(0.02, view.k * f));
+    view.x = ev.clientX - (ev.clientX - view.x) * k / view.k;
+    view.y = ev.clientY - (ev.clientY - view.y) * k / view.k;
+    view.k = k; draw();
+  }, {passive: false});
+  search.addEventListener("input", function () {
+    var q = search.value.trim().toLowerCase();
+    match = q ? new Set(data.nodes.filter(function (d) { return d.label.toLowerCase().indexOf(q) >= 0; })) : null;
+    var first = match && match.values().next().value;
+    if (first) {
+      view.x = innerWidth / 2 - (first.x + first.w / 2) * view.k;
+      view.y = innerHeight / 2 - (first.y + H / 2) * view.k;
+    }
+    draw();
+  });
+
+  // Start fitted to the window (but never enlarged)
+  var bar = document.getElementById("bar").offsetHeight;
+  view.k = Math.min(1, innerWidth / data.width, (innerHeight - bar) / data.height);
+  view.x = Math.max(0, (innerWidth - data.width * view.k) / 2);
+  view.y = bar;
+  window.addEventListener("resize", resize);
+  resize();
+})();
+</script>
+</body>
+</html>
+"""
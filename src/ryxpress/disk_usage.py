@@ -0,0 +1,315 @@
+"""
+Disk-usage accounting for pipeline artifacts, per derivation and per log.
+
+Behavior:
+
+- rxp_du sizes every store path referenced by the project's build logs (all
+  logs, or those matching which_log) with a parallel os.scandir walk.
+  Sizes are allocated disk bytes (st_blocks * 512, or st_size where blocks
+  are not reported) of files and symlinks; each inode is counted once, so
+  files hard-linked by 'nix-store --optimise' are not double counted.
+- Results are cached per store path in the project's log index: store paths
+  are immutable, so a path is only walked once (refresh=True forces a new
+  walk). Paths that no longer exist are reported with present=False.
+- closure=True also sizes each output's runtime closure
+  ('nix-store --query --requisites', cached the same way).
+- The report has three tables, each a list of dicts sorted by sort_by:
+    - derivations: one row per (derivation, store path) with bytes, files,
+      unique_bytes (bytes no other store path of the project shares) and
+      the number of logs referencing it
+    - logs: one row per log with bytes (deduplicated across its outputs) and
+      unique_bytes (bytes referenced by no other log: what deleting that log
+      and collecting garbage could free)
+    - totals: overall deduplicated bytes and number of paths
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_du"]
+
+
+_SORT_KEYS = ("bytes", "unique_bytes", "name")
+
+# (st_dev, st_ino) -> allocated bytes
+_Inodes = Dict[Tuple[int, int], int]
+
+
+def _allocated(st: os.stat_result) -> int:
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+def _walk_sizes(root: str) -> Optional[_Inodes]:
+    """Inodes (with sizes) of every file and symlink under root; None if root is missing."""
+    try:
+        st = os.lstat(root)
+    except OSError:
+        return None
+    inodes: _Inodes = {}
+    if not os.path.isdir(root) or os.path.islink(root):
+        inodes[(st.st_dev, st.st_ino)] = _allocated(st)
+        return inodes
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    est = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                inodes[(est.st_dev, est.st_ino)] = _allocated(est)
+    return inodes
+
+
+def _pack(inodes: _Inodes) -> bytes:
+    import marshal
+
+    return marshal.dumps([x for (dev, ino), size in inodes.items() for x in (dev, ino, size)])
+
+
+def _unpack(blob: bytes) -> _Inodes:
+    import marshal
+
+    flat = marshal.loads(blob)
+    return {(flat[i], flat[i + 1]): flat[i + 2] for i in range(0, len(flat), 3)}
+
+
+def _requisites(path: str, nix_bin: str, timeout: int) -> List[str]:
+    import subprocess
+
+    proc = subprocess.run(
+        [nix_bin, "--query", "--requisites", path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=timeout,
+    )
+    if proc.returncode != 0:
+        return []
+    return [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+
+
+def _sorted(rows: List[Dict[str, Any]], sort_by: str, name_key: str) -> List[Dict[str, Any]]:
+    if sort_by == "name":
+        return sorted(rows, key=lambda r: str(r[name_key]))
+    return sorted(rows, key=lambda r: (-r[sort_by], str(r[name_key])))
+
+
+def rxp_du(
+    project_path: Union[str, Path] = ".",
+    which_log: Optional[str] = None,
+    closure: bool = False,
+    workers: Optional[int] = None,
+    sort_by: str = "bytes",
+    refresh: bool = False,
+    timeout_sec: int = 300,
+) -> Dict[str, Any]:
+    """
+    Report how much disk space pipeline artifacts use.
+
+    Args:
+        project_path: path to project root (defaults to ".").
+        which_log: optional regex; only logs whose filename matches are
+            included. If None, every log is included.
+        closure: also compute closure_bytes for every store path from
+            'nix-store --query --requisites' (requires Nix).
+        workers: number of threads walking store paths (defaults to min(32, cpu_count + 4)).
+        sort_by: "bytes" (default), "unique_bytes" or "name".
+        refresh: walk every store path again instead of using cached sizes.
+        timeout_sec: timeout for each nix-store call.
+
+    Returns:
+        A dict with keys "derivations", "logs" (lists of dict rows) and
+        "totals" (dict). All sizes are in bytes.
+
+    Raises:
+        FileNotFoundError: if the _rixpress directory does not exist.
+        ValueError: if sort_by is unknown or which_log matches no log.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .log_index import _open_index
+
+    if sort_by not in _SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {_SORT_KEYS}, got {sort_by!r}")
+
+    conn = _open_index(project_path)
+    try:
+        builds = conn.execute(
+            "SELECT b.log, l.build_time, b.derivation, b.path FROM builds b "
+            "JOIN logs l ON l.filename = b.log WHERE b.path IS NOT NULL ORDER BY l.build_time"
+        ).fetchall()
+        if which_log is not None:
+            pattern = re.compile(which_log)
+            builds = [b for b in builds if pattern.search(b[0])]
+            if not builds:
+                raise ValueError(f"No build logs found matching the pattern: {which_log}")
+        paths = sorted({b[3] for b in builds})
+
+        cached: Dict[str, Tuple[int, _Inodes]] = {}
+        if not refresh:
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                for path, files, blob in conn.execute(
+                    f"SELECT path, files, inodes FROM du WHERE path IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    cached[path] = (files, _unpack(blob))
+
+        n_workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        sizes: Dict[str, Optional[_Inodes]] = {}
+        todo = [p for p in paths if p not in cached or not os.path.lexists(p)]
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            for path, inodes in zip(todo, pool.map(_walk_sizes, todo)):
+                sizes[path] = inodes
+        for path, (_files, inodes) in cached.items():
+            sizes.setdefault(path, inodes)
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO du VALUES (?, ?, ?, ?)",
+                [(p, len(sizes[p]), sum(sizes[p].values()), _pack(sizes[p])) for p in todo if sizes[p] is not None],
+            )
+            conn.executemany("DELETE FROM du WHERE path = ?", [(p,) for p in todo if sizes[p] is None])
+
+        closures: Dict[str, List[str]] = {}
+        members: Dict[str, Optional[_Inodes]] = {}
+        if closure:
+            closures, members = _closures(conn, paths, sizes, refresh, n_workers, timeout_sec)
+    finally:
+        conn.close()
+
+    # Inode ownership across store paths and across logs
+    path_count: Dict[Tuple[int, int], int] = {}
+    for inodes in sizes.values():
+        for key in inodes or ():
+            path_count[key] = path_count.get(key, 0) + 1
+    log_paths: Dict[str, Set[str]] = {}
+    log_time: Dict[str, str] = {}
+    path_logs: Dict[str, Set[str]] = {}
+    for log, build_time, _deriv, path in builds:
+        log_paths.setdefault(log, set()).add(path)
+        log_time[log] = build_time
+        path_logs.setdefault(path, set()).add(log)
+    log_count: Dict[Tuple[int, int], int] = {}
+    for log, lp in log_paths.items():
+        seen: Set[Tuple[int, int]] = set()
+        for p in lp:
+            seen.update(sizes.get(p) or ())
+        for key in seen:
+            log_count[key] = log_count.get(key, 0) + 1
+
+    all_inodes: _Inodes = {}
+    for inodes in sizes.values():
+        all_inodes.update(inodes or {})
+
+    derivations: List[Dict[str, Any]] = []
+    seen_pairs: Set[Tuple[str, str]] = set()
+    for _log, _bt, deriv, path in builds:
+        if (deriv, path) in seen_pairs:
+            continue
+        seen_pairs.add((deriv, path))
+        inodes = sizes.get(path)
+        row: Dict[str, Any] = {
+            "derivation": deriv,
+            "path": path,
+            "present": inodes is not None,
+            "files": len(inodes or ()),
+            "bytes": sum((inodes or {}).values()),
+            "unique_bytes": sum(s for k, s in (inodes or {}).items() if path_count[k] == 1),
+            "logs": len(path_logs[path]),
+        }
+        if closure:
+            in_closure: _Inodes = {}
+            for req in closures.get(path, []):
+                in_closure.update((sizes[req] if req in sizes else members.get(req)) or {})
+            row["closure_bytes"] = sum(in_closure.values())
+        derivations.append(row)
+
+    logs: List[Dict[str, Any]] = []
+    for log, lp in log_paths.items():
+        inodes: _Inodes = {}
+        for p in lp:
+            inodes.update(sizes.get(p) or {})
+        logs.append(
+            {
+                "log": log,
+                "build_time": log_time[log],
+                "paths": len(lp),
+                "bytes": sum(inodes.values()),
+                "unique_bytes": sum(s for k, s in inodes.items() if log_count[k] == 1),
+            }
+        )
+
+    return {
+        "derivations": _sorted(derivations, sort_by, "derivation"),
+        "logs": _sorted(logs, sort_by, "log"),
+        "totals": {
+            "paths": len(paths),
+            "present": sum(1 for p in paths if sizes.get(p) is not None),
+            "bytes": sum(all_inodes.values()),
+        },
+    }
+
+
+def _closures(conn, paths: List[str], sizes: Dict[str, Optional[_Inodes]], refresh: bool, workers: int, timeout: int):
+    """
+    Requisites of each present path (cached), plus the sizes of closure
+    members that are not project outputs themselves.
+    """
+    import json
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    nix_bin = shutil.which("nix-store")
+    present = [p for p in paths if sizes.get(p) is not None]
+    closures: Dict[str, List[str]] = {}
+    if not refresh:
+        for path, members in conn.execute("SELECT path, paths FROM requisites"):
+            if path in sizes:
+                closures[path] = json.loads(members)
+    todo = [p for p in present if p not in closures]
+    if todo and nix_bin is None:
+        logger.warning("nix-store not found on PATH; closure sizes are unavailable.")
+        todo = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, reqs in zip(todo, pool.map(lambda p: _requisites(p, nix_bin, timeout), todo)):
+            closures[path] = reqs
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO requisites VALUES (?, ?)",
+                [(p, json.dumps(closures[p])) for p in todo if closures[p]],
+            )
+
+        members = sorted({m for reqs in closures.values() for m in reqs if m not in sizes})
+        known: Dict[str, Optional[_Inodes]] = {}
+        for i in range(0, len(members), 500):
+            chunk = members[i:i + 500]
+            for path, blob in conn.execute(
+                f"SELECT path, inodes FROM du WHERE path IN ({','.join('?' * len(chunk))})", chunk
+            ):
+                known[path] = _unpack(blob)
+        missing = [m for m in members if refresh or m not in known]
+        for path, inodes in zip(missing, pool.map(_walk_sizes, missing)):
+            known[path] = inodes
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO du VALUES (?, ?, ?, ?)",
+                [(p, len(known[p]), sum(known[p].values()), _pack(known[p])) for p in missing if known[p] is not None],
+            )
+    return closures, known
@@ -2,7 +2,9 @@
 Garbage collect rixpress build artifacts and logs.
 
 Improved translation of the R function rxp_gc to Python with robust cleanup:
-- Atomic lock file creation to avoid races
+- Per-project flock() locks (shared for dry runs, exclusive for deletions)
+  plus a host-wide store lock for full GC, released automatically if the
+  process dies
 - Signal handlers (SIGINT/SIGTERM) to ensure cleanup on interruption
 - Temporary GC roots are recorded and removed after the operation (so they
   don't keep artifacts alive forever)
@@ -12,21 +14,19 @@ Improved translation of the R function rxp_gc to Python with robust cleanup:
 """
 from __future__ import annotations
 
-import errno
 import json
 import logging
 import os
 import re
-import shutil
-import signal
-import subprocess
-import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple, Union
-from pprint import pprint
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from .inspect_logs import rxp_inspect, rxp_list_logs
+from .instrument import count, span, traced
+from .locking import LockTimeoutError, ProjectLock, project_lock, store_lock
 
 logger = logging.getLogger(__name__)
 
@@ -44,14 +44,18 @@ _WHICH_LOG_RE = re.compile(r"build_log_[0-9]{8}_([0-9]{6})_")
 
 def _safe_run(cmd: Sequence[str], timeout: int = 300, check: bool = True) -> Tuple[int, str, str]:
     """Run command, return (returncode, stdout, stderr). Raise RxpGCError on timeouts or if check and non-zero."""
+    import subprocess
+
+    count("subprocesses")
     try:
-        proc = subprocess.run(
-            list(cmd),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=timeout,
-        )
+        with span("subprocess", command=os.path.basename(cmd[0])):
+            proc = subprocess.run(
+                list(cmd),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=timeout,
+            )
     except subprocess.TimeoutExpired as e:
         raise RxpGCError(f"Command '{cmd[0]}' timed out after {timeout} seconds.") from e
     stdout = proc.stdout or ""
@@ -120,111 +124,112 @@ def _ask_yes_no(prompt: str, default: bool = False) -> bool:
         return default
 
 
-class LockFile:
-    """Context manager for atomic lock file with basic staleness handling."""
+_FREED_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(B|KiB|MiB|GiB|TiB)\s+freed", re.I)
+_SIZE_UNITS = {"b": 1, "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3, "tib": 1024 ** 4}
 
-    def __init__(self, path: Union[str, Path], timeout_sec: int = 300):
-        self.path = Path(path)
-        self.timeout_sec = timeout_sec
-        self.acquired = False
-        self.fd = None
 
-    def _write_lock(self):
-        now = datetime.now().isoformat()
-        pid = os.getpid()
-        # Write using the file descriptor we created atomically
-        os.write(self.fd, f"{pid}\n{now}\n".encode("utf-8"))
-        os.fsync(self.fd)
+def _parse_freed_bytes(output: str) -> int:
+    """Extract the byte count from nix-store's 'N store paths deleted, X MiB freed' line(s)."""
+    total = 0.0
+    for m in _FREED_RE.finditer(output or ""):
+        total += float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()]
+    return int(total)
 
-    def _is_stale(self, timestamp_str: str) -> bool:
-        try:
-            ts = datetime.fromisoformat(timestamp_str)
-        except Exception:
-            return True
-        return (datetime.now() - ts).total_seconds() > self.timeout_sec
 
-    def acquire(self):
-        # Try atomic creation
-        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
-        mode = 0o644
-        try:
-            self.fd = os.open(str(self.path), flags, mode)
-            self._write_lock()
-            self.acquired = True
-            return True
-        except OSError as e:
-            if e.errno != errno.EEXIST:
-                raise
-            # Lock file exists: examine it for staleness
-            try:
-                content = self.path.read_text().splitlines()
-                if len(content) >= 2:
-                    try:
-                        pid = int(content[0])
-                    except Exception:
-                        pid = None
-                    tstamp = content[1]
-                else:
-                    pid = None
-                    tstamp = None
-            except Exception:
-                pid = None
-                tstamp = None
+class _GCReporter:
+    """
+    Collect GC metrics and dispatch structured events.
 
-            # If a PID is present and exists on POSIX, consider it alive
-            alive = False
-            if pid is not None and os.name == "posix":
-                try:
-                    os.kill(pid, 0)
-                    alive = True
-                except OSError:
-                    alive = False
-            # If alive and recent, fail
-            if alive and tstamp is not None:
-                try:
-                    ts = datetime.fromisoformat(tstamp)
-                    if (datetime.now() - ts).total_seconds() <= self.timeout_sec:
-                        raise RxpGCError(f"Another rxp_gc process appears to be running (PID: {pid}). If not, remove the lock: {self.path}")
-                except ValueError:
-                    # can't parse timestamp: be conservative and fail
-                    raise RxpGCError(f"Lock file present and appears active: {self.path}")
-
-            # If not alive or lock is stale, remove it and retry atomic creation once
+    Events are plain dicts with an "event" key ("phase", "path", "log_file" or
+    "summary") and a "time" epoch timestamp. They are passed to the optional
+    callback and/or appended as JSON lines to events_file. When quiet is True,
+    per-path log lines are suppressed (aggregate lines are still logged).
+    """
+
+    PHASES = ("list", "inspect", "root", "delete", "log_cleanup")
+
+    def __init__(
+        self,
+        on_event: Optional[Callable[[Dict[str, object]], None]] = None,
+        events_file: Optional[Union[str, Path]] = None,
+        quiet: bool = False,
+    ):
+        self.on_event = on_event
+        self.events_file = Path(events_file) if events_file is not None else None
+        self.quiet = quiet
+        # Live dict: it is attached to the summary up front and updated in place.
+        self.metrics: Dict[str, object] = {
+            "paths_processed": 0,
+            "bytes_freed": 0,
+            "phase_durations": {p: 0.0 for p in self.PHASES},
+        }
+        self._fh = None
+        # store path -> derivation that produced it (filled from the log index)
+        self.provenance: Dict[str, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.on_event is not None or self.events_file is not None
+
+    def emit(self, event: str, **fields) -> None:
+        if not self.enabled:
+            return
+        payload: Dict[str, object] = {"event": event, "time": time.time()}
+        payload.update(fields)
+        if self.on_event is not None:
             try:
-                self.path.unlink()
+                self.on_event(payload)
             except Exception:
-                raise RxpGCError(f"Could not remove stale lock file: {self.path}")
-            # Retry atomic creation
-            try:
-                self.fd = os.open(str(self.path), flags, mode)
-                self._write_lock()
-                self.acquired = True
-                return True
-            except OSError as e2:
-                raise RxpGCError(f"Failed to create lock file: {e2}") from e2
-
-    def release(self):
-        if self.acquired:
+                logger.debug("GC event callback failed", exc_info=True)
+        if self.events_file is not None:
             try:
-                if self.fd is not None:
-                    os.close(self.fd)
+                if self._fh is None:
+                    self._fh = self.events_file.open("a", encoding="utf-8")
+                self._fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                self._fh.flush()
             except Exception:
-                pass
+                logger.debug("Failed to write GC event to %s", self.events_file, exc_info=True)
+
+    def path_info(self, msg: str, *args) -> None:
+        """Per-path log line; skipped entirely in quiet mode."""
+        if not self.quiet:
+            logger.info(msg, *args)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            with span(name):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            durations = self.metrics["phase_durations"]
+            durations[name] = durations.get(name, 0.0) + elapsed
+            self.emit("phase", phase=name, duration=elapsed)
+
+    def label(self, path: str) -> str:
+        """Basename of a store path, followed by the derivation that produced it when known."""
+        deriv = self.provenance.get(path)
+        name = os.path.basename(path)
+        return f"{name} ({deriv})" if deriv else name
+
+    def path_done(self, path: str, status: str, bytes_freed: int = 0) -> None:
+        self.metrics["paths_processed"] += 1
+        self.metrics["bytes_freed"] += bytes_freed
+        self.emit(
+            "path", path=path, status=status, bytes_freed=bytes_freed, derivation=self.provenance.get(path)
+        )
+
+    def close(self) -> None:
+        if self._fh is not None:
             try:
-                if self.path.exists():
-                    self.path.unlink()
+                self._fh.close()
             except Exception:
                 pass
-            self.acquired = False
-
-    def __enter__(self):
-        self.acquire()
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.release()
+            self._fh = None
 
 
+@traced("rxp_gc")
 def rxp_gc(
     keep_since: Optional[Union[str, date]] = None,
     project_path: Union[str, Path] = ".",
@@ -234,6 +239,10 @@ def rxp_gc(
     ask: bool = True,
     pretty: bool = False,
     as_json: bool = False,
+    quiet: bool = False,
+    on_event: Optional[Callable[[Dict[str, object]], None]] = None,
+    events_file: Optional[Union[str, Path]] = None,
+    lock_timeout: Optional[float] = 0,
 ) -> Dict[str, object]:
     """
     Garbage collect Nix store paths and build logs produced by rixpress.
@@ -242,17 +251,35 @@ def rxp_gc(
         keep_since: None for full GC, or a date/ISO date string (YYYY-MM-DD) to keep logs newer-or-equal to that date.
         project_path: project root containing _rixpress
         dry_run: if True, show what would be deleted without deleting
-        timeout_sec: timeout for invoked nix-store commands and for lock staleness checks
+        timeout_sec: timeout for invoked nix-store commands
         verbose: if True, print extra diagnostic output
         ask: if True, prompt for confirmation before destructive operations (default True)
         pretty: if True, pretty-prints the result (and returns nothing).
         as_json: if True, pretty prints using json.dumps(indent=2) instead of pprint.
+        quiet: if True, skip per-path (and per-log-file) logging; aggregate
+            summaries are still logged.
+        on_event: optional callback receiving structured event dicts
+            ("phase", "path", "log_file" and a final "summary" event).
+        events_file: optional path; the same events are appended to it as JSON lines.
+        lock_timeout: seconds to wait for conflicting GC runs to finish (0 fails
+            immediately, None waits forever). Dry runs take the project lock in
+            shared mode; deletions take it exclusively, together with the
+            host-wide store lock (shared for targeted deletions, exclusive for
+            a full 'nix-store --gc').
 
     Returns:
         A summary dict with canonical keys:
         kept, deleted, protected, deleted_count, failed_count, referenced_count,
-        log_files_deleted, log_files_failed, dry_run_details
+        log_files_deleted, log_files_failed, dry_run_details, metrics.
+        metrics holds paths_processed, bytes_freed and phase_durations
+        (seconds spent in the list, inspect, root, delete and log_cleanup phases).
     """
+    # Process-management modules are only needed once a GC actually runs
+    import shutil
+    import signal
+    import subprocess
+    import tempfile
+
     nix_bin = shutil.which("nix-store")
     if not nix_bin:
         raise FileNotFoundError("nix-store not found on PATH. Install Nix or adjust PATH.")
@@ -261,7 +288,7 @@ def rxp_gc(
     if not project_path.exists():
         raise FileNotFoundError(f"Project path does not exist: {project_path}")
 
-    lock_file_path = Path(tempfile.gettempdir()) / "rixpress_gc.lock"
+    reporter = _GCReporter(on_event=on_event, events_file=events_file, quiet=quiet)
 
     # record of temp gcroot symlink paths we created so we can remove them later
     created_gcroot_links: List[Path] = []
@@ -276,16 +303,13 @@ def rxp_gc(
                     p.unlink()
             except Exception:
                 pass
-        # remove lock file if held
-        try:
-            if lock_path_context and lock_path_context.acquired:
-                lock_path_context.release()
-        except Exception:
-            pass
+        # release locks if held
+        for lk in held_locks:
+            lk.release()
         raise SystemExit(1)
 
-    # placeholder for context so signal handler can access
-    lock_path_context: Optional[LockFile] = None
+    # locks we hold, so the signal handler can release them
+    held_locks: List[ProjectLock] = []
 
     # Register handlers
     old_sigint = signal.getsignal(signal.SIGINT)
@@ -294,9 +318,16 @@ def rxp_gc(
     signal.signal(signal.SIGTERM, _cleanup_on_signal)
 
     try:
-        # Acquire lock with context manager (atomic)
-        lock_path_context = LockFile(lock_file_path, timeout_sec=timeout_sec)
-        lock_path_context.acquire()
+        # Acquire locks: the project lock first, then the store lock for destructive runs
+        wanted = [project_lock(project_path, shared=dry_run, timeout=lock_timeout)]
+        if not dry_run:
+            wanted.append(store_lock(shared=keep_since is not None, timeout=lock_timeout))
+        for lk in wanted:
+            try:
+                lk.acquire()
+            except LockTimeoutError as e:
+                raise RxpGCError(f"Another rxp_gc process appears to be running. {e}") from e
+            held_locks.append(lk)
 
         # parse keep_since
         if keep_since is not None:
@@ -312,7 +343,8 @@ def rxp_gc(
             keep_date = None
 
         # Gather logs
-        all_logs = rxp_list_logs(project_path)
+        with reporter.phase("list"):
+            all_logs = rxp_list_logs(project_path)
         # Expect list of dicts with 'filename' and 'modification_time'
         if not isinstance(all_logs, list) or not all_logs:
             logger.info("No build logs found. Nothing to do.")
@@ -327,28 +359,30 @@ def rxp_gc(
                 "log_files_deleted": 0,
                 "log_files_failed": 0,
                 "dry_run_details": None,
+                "metrics": reporter.metrics,
             }
 
         # Partition logs
         logs_to_keep = []
         logs_to_delete = []
-        for entry in all_logs:
-            fn = entry.get("filename")
-            mtime = entry.get("modification_time")
-            if not fn or not mtime:
-                continue
-            try:
-                mdate = _parse_iso_date(mtime)
-            except Exception:
-                # If malformed, treat as older than keep_since to be conservative
-                mdate = datetime.min.date()
-            if keep_date is None:
-                logs_to_keep.append(entry)
-            else:
-                if mdate >= keep_date:
+        with reporter.phase("list"):
+            for entry in all_logs:
+                fn = entry.get("filename")
+                mtime = entry.get("modification_time")
+                if not fn or not mtime:
+                    continue
+                try:
+                    mdate = _parse_iso_date(mtime)
+                except Exception:
+                    # If malformed, treat as older than keep_since to be conservative
+                    mdate = datetime.min.date()
+                if keep_date is None:
                     logs_to_keep.append(entry)
                 else:
-                    logs_to_delete.append(entry)
+                    if mdate >= keep_date:
+                        logs_to_keep.append(entry)
+                    else:
+                        logs_to_delete.append(entry)
 
         def _filenames(entries: Sequence[Dict]) -> List[str]:
             return [e["filename"] for e in entries]
@@ -377,12 +411,21 @@ def rxp_gc(
                 out[fn] = _validate_store_paths(paths)
             return out
 
-        keep_paths_by_log = get_paths_from_logs(_filenames(logs_to_keep)) if logs_to_keep else {}
-        delete_paths_by_log = get_paths_from_logs(_filenames(logs_to_delete)) if logs_to_delete else {}
+        with reporter.phase("inspect"):
+            keep_paths_by_log = get_paths_from_logs(_filenames(logs_to_keep)) if logs_to_keep else {}
+            delete_paths_by_log = get_paths_from_logs(_filenames(logs_to_delete)) if logs_to_delete else {}
 
         keep_paths_all = _validate_store_paths(sorted({p for lst in keep_paths_by_log.values() for p in lst}))
         delete_paths_all = _validate_store_paths(sorted({p for lst in delete_paths_by_log.values() for p in lst}))
 
+        if delete_paths_all:
+            try:
+                from .log_index import _derivations_for_paths
+
+                reporter.provenance = _derivations_for_paths(project_path, delete_paths_all)
+            except Exception:
+                logger.debug("Could not resolve derivations for GC report", exc_info=True)
+
         summary_info: Dict[str, object] = {
             "kept": _filenames(logs_to_keep),
             "deleted": _filenames(logs_to_delete),
@@ -393,6 +436,7 @@ def rxp_gc(
             "log_files_deleted": 0,
             "log_files_failed": 0,
             "dry_run_details": None,
+            "metrics": reporter.metrics,
         }
 
         # DRY RUN branch (date-based)
@@ -400,16 +444,16 @@ def rxp_gc(
             logger.info("--- DRY RUN --- No changes will be made. ---")
             logger.info("Logs that would be deleted (%d):", len(logs_to_delete))
             for fn in summary_info["deleted"]:
-                logger.info("  %s", fn)
+                reporter.path_info("  %s", fn)
             details: Dict[str, List[Dict[str, str]]] = {}
             if delete_paths_by_log:
                 logger.info("Artifacts per log (from rxp_inspect):")
                 for fn, _ in delete_paths_by_log.items():
-                    logger.info("== %s ==", fn)
+                    reporter.path_info("== %s ==", fn)
                     try:
                         insp_rows = rxp_inspect(project_path=project_path, which_log=_extract_which_log(fn) or "")
                     except Exception:
-                        logger.info("  (rxp_inspect unavailable)")
+                        reporter.path_info("  (rxp_inspect unavailable)")
                         details[fn] = []
                         continue
                     rows = []
@@ -424,24 +468,29 @@ def rxp_gc(
             logger.info("Aggregate store paths targeted for deletion (deduped): %d total, %d existing, %d missing",
                         len(delete_paths_all), len(existing_delete_paths), len(missing_paths))
             if existing_delete_paths:
-                logger.info("Existing paths that would be deleted:")
+                reporter.path_info("Existing paths that would be deleted:")
                 for p in existing_delete_paths:
-                    logger.info("  %s", p)
+                    deriv = reporter.provenance.get(p)
+                    reporter.path_info("  %s%s", p, f" ({deriv})" if deriv else "")
+                    reporter.path_done(p, "would_delete")
             if missing_paths:
-                logger.info("Paths already missing (will be skipped):")
+                reporter.path_info("Paths already missing (will be skipped):")
                 for p in missing_paths:
-                    logger.info("  %s", p)
+                    reporter.path_info("  %s", p)
+                    reporter.path_done(p, "missing")
             summary_info["dry_run_details"] = details
             if logs_to_delete:
-                logger.info("Build log files that would be deleted:")
+                reporter.path_info("Build log files that would be deleted:")
                 for fn in summary_info["deleted"]:
                     log_path = project_path / "_rixpress" / fn
                     exists_indicator = "[OK]" if log_path.exists() else "[X]"
-                    logger.info("  %s %s", exists_indicator, fn)
+                    reporter.path_info("  %s %s", exists_indicator, fn)
             if pretty:
                 if as_json:
                     print(json.dumps(summary_info, indent=2, ensure_ascii=False))
                 else:
+                    from pprint import pprint
+
                     pprint(summary_info)
                 return
 
@@ -463,7 +512,9 @@ def rxp_gc(
                     return summary_info
             logger.info("Running Nix garbage collector...")
             try:
-                _, stdout, stderr = _safe_run([nix_bin, "--gc"], timeout=timeout_sec, check=True)
+                with reporter.phase("delete"):
+                    _, stdout, stderr = _safe_run([nix_bin, "--gc"], timeout=timeout_sec, check=True)
+                reporter.metrics["bytes_freed"] += _parse_freed_bytes(stdout + "\n" + stderr)
                 if stdout:
                     if verbose:
                         logger.info(stdout)
@@ -499,16 +550,17 @@ def rxp_gc(
             if keep_paths_all:
                 temp_gcroots_dir = Path(tempfile.mkdtemp(prefix="rixpress-gc-"))
                 logger.info("Protecting %d recent artifacts via GC roots...", len(keep_paths_all))
-                for i, p in enumerate(keep_paths_all, start=1):
-                    link_path = temp_gcroots_dir / f"root-{i}"
-                    try:
-                        # create a placeholder link path (the nix-store --add-root will create the gcroot)
-                        # use link_path as the path to register the indirect root
-                        _safe_run([nix_bin, "--add-root", str(link_path), "--indirect", p], timeout=timeout_sec, check=True)
-                        created_gcroot_links.append(link_path)
-                        protected += 1
-                    except RxpGCError as e:
-                        logger.warning("Failed to add GC root for %s: %s", p, e)
+                with reporter.phase("root"):
+                    for i, p in enumerate(keep_paths_all, start=1):
+                        link_path = temp_gcroots_dir / f"root-{i}"
+                        try:
+                            # create a placeholder link path (the nix-store --add-root will create the gcroot)
+                            # use link_path as the path to register the indirect root
+                            _safe_run([nix_bin, "--add-root", str(link_path), "--indirect", p], timeout=timeout_sec, check=True)
+                            created_gcroot_links.append(link_path)
+                            protected += 1
+                        except RxpGCError as e:
+                            logger.warning("Failed to add GC root for %s: %s", p, e)
                 if protected == 0:
                     raise RxpGCError("Failed to protect any store paths. Aborting.")
                 summary_info["protected"] = protected
@@ -519,9 +571,10 @@ def rxp_gc(
             missing_paths = [p for p in delete_paths_all if p not in existing_paths]
             if missing_paths:
                 logger.info("Skipping %d paths that no longer exist.", len(missing_paths))
-                if verbose:
-                    for p in missing_paths:
-                        logger.info("  Missing: %s", p)
+                for p in missing_paths:
+                    if verbose:
+                        reporter.path_info("  Missing: %s", p)
+                    reporter.path_done(p, "missing")
             if not existing_paths:
                 logger.info("No existing paths to delete. All targeted paths are already gone.")
                 return summary_info
@@ -530,36 +583,44 @@ def rxp_gc(
             failed_paths: List[str] = []
             referenced_paths: List[str] = []
 
-            for i, pth in enumerate(existing_paths, start=1):
-                if not (os.path.exists(pth) or os.path.isdir(pth)):
-                    logger.info("  [%d/%d] Skipping %s (already gone)", i, len(existing_paths), os.path.basename(pth))
-                    continue
-                logger.info("  [%d/%d] Attempting to delete %s...", i, len(existing_paths), os.path.basename(pth))
-                try:
-                    proc = subprocess.run([nix_bin, "--delete", pth], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=timeout_sec)
-                    out = (proc.stdout or "") + "\n" + (proc.stderr or "")
-                    if proc.returncode == 0:
-                        total_deleted += 1
-                        logger.info("    [OK] Successfully deleted")
-                        if verbose and out.strip():
-                            logger.info("    %s", out.strip())
-                    else:
-                        if re.search(r"still alive|Cannot delete", out, re.I):
-                            referenced_paths.append(pth)
-                            logger.info("    [!] Skipped (still referenced)")
-                            if verbose:
-                                logger.info("    Details: %s", out.strip())
+            with reporter.phase("delete"):
+                for i, pth in enumerate(existing_paths, start=1):
+                    if not (os.path.exists(pth) or os.path.isdir(pth)):
+                        reporter.path_info("  [%d/%d] Skipping %s (already gone)", i, len(existing_paths), reporter.label(pth))
+                        reporter.path_done(pth, "missing")
+                        continue
+                    reporter.path_info("  [%d/%d] Attempting to delete %s...", i, len(existing_paths), reporter.label(pth))
+                    try:
+                        count("subprocesses")
+                        proc = subprocess.run([nix_bin, "--delete", pth], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=timeout_sec)
+                        out = (proc.stdout or "") + "\n" + (proc.stderr or "")
+                        if proc.returncode == 0:
+                            total_deleted += 1
+                            reporter.path_info("    [OK] Successfully deleted")
+                            if verbose and out.strip():
+                                reporter.path_info("    %s", out.strip())
+                            reporter.path_done(pth, "deleted", _parse_freed_bytes(out))
                         else:
-                            failed_paths.append(pth)
-                            logger.info("    [X] Failed to delete")
-                            if verbose:
-                                logger.info("    Details: %s", out.strip())
-                except subprocess.TimeoutExpired:
-                    failed_paths.append(pth)
-                    logger.info("    [X] Timeout while deleting")
-                except Exception as e:
-                    failed_paths.append(pth)
-                    logger.info("    [X] Error: %s", e)
+                            if re.search(r"still alive|Cannot delete", out, re.I):
+                                referenced_paths.append(pth)
+                                reporter.path_info("    [!] Skipped (still referenced)")
+                                if verbose:
+                                    reporter.path_info("    Details: %s", out.strip())
+                                reporter.path_done(pth, "referenced")
+                            else:
+                                failed_paths.append(pth)
+                                reporter.path_info("    [X] Failed to delete")
+                                if verbose:
+                                    reporter.path_info("    Details: %s", out.strip())
+                                reporter.path_done(pth, "failed")
+                    except subprocess.TimeoutExpired:
+                        failed_paths.append(pth)
+                        reporter.path_info("    [X] Timeout while deleting")
+                        reporter.path_done(pth, "failed")
+                    except Exception as e:
+                        failed_paths.append(pth)
+                        reporter.path_info("    [X] Error: %s", e)
+                        reporter.path_done(pth, "failed")
 
             # Summary of deletion
             logger.info("\nDeletion summary:")
@@ -570,24 +631,24 @@ def rxp_gc(
             if referenced_paths and verbose:
                 logger.info("\nReferenced paths (cannot delete):")
                 for pth in referenced_paths:
-                    logger.info("  %s", os.path.basename(pth))
+                    reporter.path_info("  %s", reporter.label(pth))
                     try:
                         _, roots_out, _ = _safe_run([nix_bin, "--query", "--roots", pth], timeout=timeout_sec, check=False)
                         if roots_out.strip():
-                            logger.info("    GC roots: %s", roots_out.strip().replace("\n", ", "))
+                            reporter.path_info("    GC roots: %s", roots_out.strip().replace("\n", ", "))
                         else:
-                            logger.info("    GC roots: (none found)")
+                            reporter.path_info("    GC roots: (none found)")
                     except Exception:
-                        logger.info("    GC roots: (query failed)")
+                        reporter.path_info("    GC roots: (query failed)")
                     try:
                         _, refs_out, _ = _safe_run([nix_bin, "--query", "--referrers", pth], timeout=timeout_sec, check=False)
                         if refs_out.strip():
                             refs = [os.path.basename(x) for x in refs_out.splitlines() if x.strip()]
-                            logger.info("    Referenced by: %s", ", ".join(refs) if refs else "(none)")
+                            reporter.path_info("    Referenced by: %s", ", ".join(refs) if refs else "(none)")
                         else:
-                            logger.info("    Referenced by: (none)")
+                            reporter.path_info("    Referenced by: (none)")
                     except Exception:
-                        logger.info("    Referenced by: (query failed)")
+                        reporter.path_info("    Referenced by: (query failed)")
 
             summary_info["deleted_count"] = total_deleted
             summary_info["failed_count"] = len(failed_paths)
@@ -598,31 +659,39 @@ def rxp_gc(
                 logger.info("\nDeleting old build log files...")
                 log_files_deleted = 0
                 log_files_failed: List[str] = []
-                for i, entry in enumerate(logs_to_delete, start=1):
-                    log_file = entry["filename"]
-                    log_path = project_path / "_rixpress" / log_file
-                    logger.info("  [%d/%d] Deleting %s...", i, len(logs_to_delete), log_file)
-                    if not log_path.exists():
-                        logger.info("    [!] File not found (already deleted?)")
-                        continue
-                    try:
-                        log_path.unlink()
+                with reporter.phase("log_cleanup"):
+                    for i, entry in enumerate(logs_to_delete, start=1):
+                        log_file = entry["filename"]
+                        log_path = project_path / "_rixpress" / log_file
+                        reporter.path_info("  [%d/%d] Deleting %s...", i, len(logs_to_delete), log_file)
                         if not log_path.exists():
-                            log_files_deleted += 1
-                            logger.info("    [OK] Successfully deleted")
-                        else:
+                            reporter.path_info("    [!] File not found (already deleted?)")
+                            reporter.emit("log_file", filename=log_file, status="missing")
+                            continue
+                        try:
+                            log_path.unlink()
+                            sidecar = log_path.with_suffix(".rxpc")
+                            if sidecar.exists():
+                                sidecar.unlink()
+                            if not log_path.exists():
+                                log_files_deleted += 1
+                                reporter.path_info("    [OK] Successfully deleted")
+                                reporter.emit("log_file", filename=log_file, status="deleted")
+                            else:
+                                log_files_failed.append(log_file)
+                                reporter.path_info("    [X] Failed to delete (file still exists)")
+                                reporter.emit("log_file", filename=log_file, status="failed")
+                        except Exception as e:
                             log_files_failed.append(log_file)
-                            logger.info("    [X] Failed to delete (file still exists)")
-                    except Exception as e:
-                        log_files_failed.append(log_file)
-                        logger.info("    [X] Error: %s", e)
+                            reporter.path_info("    [X] Error: %s", e)
+                            reporter.emit("log_file", filename=log_file, status="failed")
                 logger.info("\nBuild log deletion summary:")
                 logger.info("  Successfully deleted: %d files", log_files_deleted)
                 logger.info("  Failed: %d files", len(log_files_failed))
                 if log_files_failed and verbose:
                     logger.info("\nFailed to delete log files:")
                     for lf in log_files_failed:
-                        logger.info("  %s", lf)
+                        reporter.path_info("  %s", lf)
                 summary_info["log_files_deleted"] = log_files_deleted
                 summary_info["log_files_failed"] = len(log_files_failed)
 
@@ -645,12 +714,11 @@ def rxp_gc(
                         # ignore: best-effort cleanup
                         logger.debug("Failed to remove temp gcroots dir %s", temp_gcroots_dir)
     finally:
-        # always release lock and restore signals
-        try:
-            if lock_path_context is not None:
-                lock_path_context.release()
-        except Exception:
-            pass
+        # always release locks and restore signals
+        for lk in reversed(held_locks):
+            lk.release()
+        reporter.emit("summary", **reporter.metrics)
+        reporter.close()
         try:
             signal.signal(signal.SIGINT, old_sigint)
             signal.signal(signal.SIGTERM, old_sigterm)
@@ -18,8 +18,6 @@ Behavior:
 """
 from __future__ import annotations
 
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 from typing import Optional
@@ -144,6 +142,9 @@ def rxp_init(project_path: str = ".", skip_prompt: bool = False) -> bool:
 
     # Ask whether to initialise git
     if _confirm("Would you like to initialise a Git repository here?", skip_prompt=skip_prompt):
+        import shutil
+        import subprocess
+
         git_bin = shutil.which("git")
         if git_bin is None:
             print(
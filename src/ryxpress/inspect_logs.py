@@ -2,18 +2,26 @@
 Dependency-free utilities to list and inspect rixpress build logs.
 
 Behavior:
-- No external dependencies (no pandas).
+- No required external dependencies.
 - rxp_list_logs returns a list of dicts with keys:
     - filename (str)
     - modification_time (YYYY-MM-DD string)
     - size_kb (float)
   ordered most recent first.
 - rxp_inspect selects a log (most recent or regex match) and returns the JSON
-  content coerced into a list-of-dicts (rows).
+  content coerced into a list-of-dicts (rows), or, with format=, as columns
+  (dict of lists) or a pyarrow/pandas/polars table. Those backends are
+  optional and imported only when requested.
 - Errors: raises FileNotFoundError when _rixpress or logs are missing;
   raises ValueError when which_log is provided but no match is found.
 - Uses the standard library logging module to emit an INFO message when a
   specific log is chosen via which_log.
+- The first inspection of a log writes a compact columnar sidecar next to it
+  (build_log_*.rxpc, one column per key, marshal-encoded). Later inspections
+  load the sidecar instead of parsing the JSON as long as it was written for
+  the current size and mtime of that JSON and by the same Python version.
+  Sidecar problems (unwritable directory, corrupt file, unusual log shape)
+  are silent: the JSON is simply parsed as before.
 
 This mirrors the R functions rxp_list_logs and rxp_inspect as closely as possible
 while being dependency-free and returning plain Python structures.
@@ -22,14 +30,16 @@ from __future__ import annotations
 
 import json
 import logging
+import marshal
+import os
 import re
+import struct
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from pprint import pprint
-
-logger = logging.getLogger(__name__)
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from .instrument import count, span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -37,15 +47,6 @@ logger = logging.getLogger(__name__)
 __all__ = ["rxp_list_logs", "rxp_inspect"]
 
 
-def _iso_date_from_epoch(epoch: float) -> str:
-    """Return YYYY-MM-DD formatted date string from epoch seconds."""
-    return datetime.fromtimestamp(epoch).date().isoformat()
-
-
-
-logger = logging.getLogger(__name__)
-
-
 def _iso_date_from_epoch(epoch: float) -> str:
     """Return YYYY-MM-DD formatted date string from epoch seconds."""
     return datetime.fromtimestamp(epoch).date().isoformat()
@@ -104,6 +105,8 @@ def rxp_list_logs(
         if as_json:
             print(json.dumps(logs, indent=2, ensure_ascii=False))
         else:
+            from pprint import pprint
+
             pprint(logs)
         return
 
@@ -148,12 +151,156 @@ def _coerce_json_to_rows(data: Any) -> List[Dict[str, Any]]:
     # Other shapes (e.g., string/number) -> wrap
     return [{"value": data}]
 
+
+# Columnar sidecar: header (magic, format version, Python major/minor, size and
+# mtime_ns of the JSON it was built from) followed by marshal((keys, columns)).
+_SIDECAR_SUFFIX = ".rxpc"
+_SIDECAR_MAGIC = b"RXPC"
+_SIDECAR_VERSION = 1
+_SIDECAR_HEADER = struct.Struct("<4sBBBQQ")
+
+
+def _sidecar_path(log_path: Path) -> Path:
+    return log_path.with_suffix(_SIDECAR_SUFFIX)
+
+
+def _rows_to_columns(rows: List[Dict[str, Any]]) -> Optional[Tuple[List[str], List[List[Any]]]]:
+    """Columns for rows that all share the same keys in the same order; None otherwise."""
+    if not rows:
+        return None
+    keys = list(rows[0])
+    if any(list(r) != keys for r in rows):
+        return None
+    return keys, [[r[k] for r in rows] for k in keys]
+
+
+def _columns_to_rows(keys: List[str], columns: List[List[Any]]) -> List[Dict[str, Any]]:
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
+def _read_sidecar(log_path: Path, st: os.stat_result) -> Optional[Tuple[List[str], List[List[Any]]]]:
+    """Return (keys, columns) from a sidecar that is fresh for st, else None."""
+    try:
+        with open(_sidecar_path(log_path), "rb") as fh:
+            header = fh.read(_SIDECAR_HEADER.size)
+            magic, version, major, minor, size, mtime_ns = _SIDECAR_HEADER.unpack(header)
+            if (
+                magic != _SIDECAR_MAGIC
+                or version != _SIDECAR_VERSION
+                or (major, minor) != sys.version_info[:2]
+                or size != st.st_size
+                or mtime_ns != st.st_mtime_ns
+            ):
+                return None
+            keys, columns = marshal.loads(fh.read())
+        return keys, columns
+    except Exception:
+        return None
+
+
+def _write_sidecar(log_path: Path, st: os.stat_result, keys: List[str], columns: List[List[Any]]) -> None:
+    """Atomically write the sidecar for log_path; failures are logged at debug level only."""
+    target = _sidecar_path(log_path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    header = _SIDECAR_HEADER.pack(
+        _SIDECAR_MAGIC, _SIDECAR_VERSION, sys.version_info[0], sys.version_info[1], st.st_size, st.st_mtime_ns
+    )
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(header)
+            fh.write(marshal.dumps((keys, columns)))
+        os.replace(tmp, target)
+    except Exception:
+        logger.debug("Could not write build log sidecar %s", target, exc_info=True)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _json_to_columns(data: Any) -> Tuple[List[str], List[List[Any]], bool]:
+    """
+    Columnar counterpart of _coerce_json_to_rows, built without row dicts.
+
+    Returns (keys, columns, uniform) where uniform tells whether every row had
+    exactly these keys in this order (i.e. the columns round-trip to the same
+    rows). Keys missing from a row are filled with None.
+    """
+    if isinstance(data, dict):
+        vals = list(data.values())
+        if vals and all(isinstance(v, list) for v in vals) and len({len(v) for v in vals}) == 1:
+            return list(data.keys()), vals, True
+    if not (isinstance(data, list) and all(isinstance(el, dict) for el in data)):
+        data = _coerce_json_to_rows(data)
+
+    keys: Dict[str, None] = {}
+    uniform = True
+    first: Optional[List[str]] = None
+    for r in data:
+        if first is None:
+            first = list(r)
+        elif uniform and list(r) != first:
+            uniform = False
+        for k in r:
+            keys.setdefault(k, None)
+    return list(keys), [[r.get(k) for r in data] for k in keys], uniform and bool(data)
+
+
+def _load_log(log_path: Path, columnar: bool = False):
+    """
+    Rows of a build log (or (keys, columns) when columnar), from its sidecar
+    when fresh, otherwise from the JSON (writing the sidecar for next time).
+    """
+    st = os.stat(log_path)
+    cached = _read_sidecar(log_path, st)
+    if cached is not None:
+        count("cache_hits")
+        return cached if columnar else _columns_to_rows(*cached)
+
+    count("cache_misses")
+    with span("parse_json", file=log_path.name) as s:
+        s.add("bytes_read", st.st_size)
+        with log_path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+
+    if columnar:
+        keys, columns, uniform = _json_to_columns(data)
+        if uniform:
+            _write_sidecar(log_path, st, keys, columns)
+        return keys, columns
+
+    rows = _coerce_json_to_rows(data)
+    cols = _rows_to_columns(rows)
+    if cols is not None:
+        _write_sidecar(log_path, st, *cols)
+    return rows
+
+
+_FORMATS = ("rows", "columns", "arrow", "pandas", "polars")
+
+
+def _to_frame(columns: Dict[str, List[Any]], format: str):
+    """Build a table with an optional backend, imported only when requested."""
+    module = {"arrow": "pyarrow", "pandas": "pandas", "polars": "polars"}[format]
+    try:
+        import importlib
+
+        mod = importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"format={format!r} requires the optional package '{module}'") from e
+    if format == "arrow":
+        return mod.table(columns)
+    return mod.DataFrame(columns)
+
+
+@traced("rxp_inspect")
 def rxp_inspect(
     project_path: Union[str, Path] = ".",
     which_log: Optional[str] = None,
     pretty: bool = False,
     as_json: bool = False,
-) -> Optional[List[Dict[str, Any]]]:
+    format: str = "rows",
+) -> Any:
     """
     Inspect the build result of a pipeline.
 
@@ -162,27 +309,39 @@ def rxp_inspect(
         which_log: optional regex to select a specific log file. If None, the most recent log is used.
         pretty: if True, pretty-prints the result (and returns nothing).
         as_json: if True, pretty prints using json.dumps(indent=2) instead of pprint.
+        format: shape of the result:
+            - "rows" (default): list of dicts, one per derivation
+            - "columns": dict mapping each key to a list of values
+            - "arrow": pyarrow.Table (requires pyarrow)
+            - "pandas": pandas.DataFrame (requires pandas)
+            - "polars": polars.DataFrame (requires polars)
+            The columnar formats are built directly from the parsed log
+            without creating a dict per row.
 
     Returns:
-        A list of dict rows parsed from the selected JSON log file (unless pretty=True).
+        The parsed log in the requested format (unless pretty=True).
 
     Raises:
         FileNotFoundError: if no logs are found or _rixpress missing.
-        ValueError: if which_log is provided but no matching filename is found.
+        ValueError: if which_log is provided but no matching filename is found,
+            or if format is unknown.
+        ImportError: if the backend required by format is not installed.
         RuntimeError: if the chosen log cannot be read/parsed.
     """
+    if format not in _FORMATS:
+        raise ValueError(f"format must be one of {_FORMATS}, got {format!r}")
+
     proj = Path(project_path)
     rixpress_dir = proj / "_rixpress"
 
-    logs = rxp_list_logs(proj)
+    with span("list_logs"):
+        logs = rxp_list_logs(proj)
 
     chosen_path: Optional[Path] = None
 
     if which_log is None:
         chosen_path = rixpress_dir / logs[0]["filename"]
     else:
-        import re, logging
-        logger = logging.getLogger(__name__)
         pattern = re.compile(which_log)
         for entry in logs:
             if pattern.search(entry["filename"]):
@@ -193,18 +352,26 @@ def rxp_inspect(
             raise ValueError(f"No build logs found matching the pattern: {which_log}")
 
     try:
-        with chosen_path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        loaded = _load_log(chosen_path, columnar=format != "rows")
     except Exception as e:
         raise RuntimeError(f"Failed to read log file {chosen_path}: {e}")
 
-    rows = _coerce_json_to_rows(data)
+    if format == "rows":
+        result = loaded
+    else:
+        result = dict(zip(*loaded))
+        if format != "columns":
+            result = _to_frame(result, format)
 
     if pretty:
-        if as_json:
-            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        if format not in ("rows", "columns"):
+            print(result)
+        elif as_json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
-            pprint(rows)
+            from pprint import pprint
+
+            pprint(result)
         return  # This ensures REPL shows nothing after print, return value is None
 
-    return rows
+    return result
@@ -0,0 +1,337 @@
+"""
+Lightweight timing and resource-usage instrumentation for rxp_* calls.
+
+Behavior:
+
+- Instrumentation is off until a sink is registered (add_sink, the
+  rxp_instrument context manager, or the RYXPRESS_TRACE environment variable
+  naming a JSON-lines file). While off, instrumented functions cost one
+  global lookup per call and counters are no-ops.
+- rxp_inspect, rxp_read, rxp_copy, rxp_gc, rxp_trace, rxp_make and
+  rxp_dag_html record a span; hot phases inside them (log listing, JSON
+  parsing, deserialization, DAG loading, layout, subprocess runs) record
+  child spans.
+- Every span carries wall time, CPU time (process CPU, so it includes other
+  threads' work during the span) and counters: bytes_read, cache_hits,
+  cache_misses and subprocesses. Counters of child spans are added to their
+  parent, so a top-level span shows the totals of its call. Work handed to
+  thread pools is wrapped with bind() so it runs in the caller's span
+  context and is counted there too.
+- A sink is either a callable receiving the finished span as a dict, or an
+  object with on_end(record) and optionally on_start(record). Built in:
+  JsonLinesSink (one JSON object per line) and OtelSink, which forwards to
+  the OpenTelemetry tracing API when it is installed. Exceptions raised by
+  sinks are logged and ignored.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import itertools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    "rxp_instrument",
+    "add_sink",
+    "remove_sink",
+    "span",
+    "count",
+    "enabled",
+    "traced",
+    "bind",
+    "JsonLinesSink",
+    "OtelSink",
+]
+
+
+_TRACE_ENV = "RYXPRESS_TRACE"
+_COUNTERS = ("bytes_read", "cache_hits", "cache_misses", "subprocesses")
+
+_SINKS: List[Any] = []
+_sinks_lock = threading.Lock()
+_current: contextvars.ContextVar[Optional["_Span"]] = contextvars.ContextVar("rxp_span", default=None)
+_ids = itertools.count(1)
+# Counters may be updated from pool threads running bound work
+_counter_lock = threading.Lock()
+
+
+class _Span:
+    __slots__ = ("id", "parent", "name", "attrs", "counters", "start", "_t0", "_c0", "_token", "_sinks")
+
+    def __init__(self, name: str, attrs: Dict[str, Any], sinks: List[Any]):
+        self.id = next(_ids)
+        self.parent = _current.get()
+        self.name = name
+        self.attrs = attrs
+        self.counters = dict.fromkeys(_COUNTERS, 0)
+        self._sinks = sinks
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def add(self, counter: str, n: int = 1) -> None:
+        with _counter_lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def record(self, **extra) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.id,
+            "parent_id": self.parent.id if self.parent is not None else None,
+            "start": self.start,
+            "attributes": dict(self.attrs),
+            **extra,
+        }
+
+    def __enter__(self) -> "_Span":
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+        self._token = _current.set(self)
+        _emit(self._sinks, "on_start", self.record())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall = time.perf_counter() - self._t0
+        cpu = time.process_time() - self._c0
+        _current.reset(self._token)
+        with _counter_lock:
+            counters = dict(self.counters)
+        if self.parent is not None:
+            for k, v in counters.items():
+                self.parent.add(k, v)
+        rec = self.record(wall_time=wall, cpu_time=cpu, counters=counters)
+        if exc_type is not None:
+            rec["error"] = f"{exc_type.__name__}: {exc}"
+        _emit(self._sinks, "on_end", rec)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, counter: str, n: int = 1) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _emit(sinks: List[Any], hook: str, record: Dict[str, Any]) -> None:
+    for sink in sinks:
+        fn = getattr(sink, hook, None)
+        if fn is None:
+            if hook != "on_end" or not callable(sink):
+                continue
+            fn = sink
+        try:
+            fn(record)
+        except Exception:
+            logger.debug("Instrumentation sink %r failed", sink, exc_info=True)
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a block as a span (a no-op when no sink is registered).
+
+    Example:
+        with span("parse_json", file=str(path)) as s:
+            s.add("bytes_read", size)
+    """
+    sinks = _SINKS
+    if not sinks:
+        return _NOOP
+    return _Span(name, attrs, sinks)
+
+
+def count(counter: str, n: int = 1) -> None:
+    """Add n to a counter of the current span, if any."""
+    if _SINKS:
+        s = _current.get()
+        if s is not None:
+            s.add(counter, n)
+
+
+def enabled() -> bool:
+    """True when at least one sink is registered."""
+    return bool(_SINKS)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator recording each call of the function as a span."""
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _SINKS:
+                return fn(*args, **kwargs)
+            with _Span(span_name, {}, _SINKS):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    Wrap fn so calls made from other threads run in the current span context.
+
+    Thread pools do not carry context variables over to their workers, so
+    spans and counters of submitted work would otherwise have no parent.
+    Returns fn itself while instrumentation is off.
+
+    Example:
+        with ThreadPoolExecutor() as pool:
+            results = list(pool.map(bind(copy_one), files))
+    """
+    if not _SINKS:
+        return fn
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def add_sink(sink) -> None:
+    """Register a sink (callable or object with on_end/on_start); enables instrumentation."""
+    global _SINKS
+    with _sinks_lock:
+        # Copy-on-write so spans in flight keep the list they started with
+        _SINKS = [*_SINKS, sink]
+
+
+def remove_sink(sink) -> None:
+    """Unregister a sink; instrumentation turns off when none are left."""
+    global _SINKS
+    with _sinks_lock:
+        _SINKS = [s for s in _SINKS if s is not sink]
+
+
+class rxp_instrument:
+    """
+    Record spans to sink for the duration of a with block.
+
+    Args:
+        sink: a callable receiving finished span dicts, an object with
+            on_end(record) (and optionally on_start(record)), or a path, which
+            is wrapped in a JsonLinesSink. None collects spans in memory.
+
+    Example:
+        with rxp_instrument() as spans:
+            rxp_read("mtcars_head")
+        slowest = max(spans, key=lambda s: s["wall_time"])
+    """
+
+    def __init__(self, sink: Union[None, str, Path, Callable, Any] = None):
+        self.records: List[Dict[str, Any]] = []
+        if sink is None:
+            sink = self.records.append
+        elif isinstance(sink, (str, Path)):
+            sink = JsonLinesSink(sink)
+        self.sink = sink
+
+    def __enter__(self) -> List[Dict[str, Any]]:
+        add_sink(self.sink)
+        return self.records
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        remove_sink(self.sink)
+        close = getattr(self.sink, "close", None)
+        if close is not None:
+            close()
+
+
+class JsonLinesSink:
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._fh = None
+        self._lock = threading.Lock()
+
+    def on_end(self, record: Dict[str, Any]) -> None:
+        import json
+
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._fh is None:
+                self._fh = self.path.open("a", encoding="utf-8")
+            self._fh.write(line)
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class OtelSink:
+    """
+    Forward spans to OpenTelemetry (requires the opentelemetry-api package).
+
+    Args:
+        tracer: an OpenTelemetry Tracer; defaults to trace.get_tracer("ryxpress").
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OtelSink requires the optional package 'opentelemetry-api'") from e
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("ryxpress")
+        self._open: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            parent = self._open.get(record["parent_id"])
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(
+            record["name"],
+            context=context,
+            start_time=int(record["start"] * 1e9),
+            attributes={k: v for k, v in record["attributes"].items() if isinstance(v, (str, bool, int, float))},
+        )
+        with self._lock:
+            self._open[record["span_id"]] = otel_span
+
+    def on_end(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            otel_span = self._open.pop(record["span_id"], None)
+        if otel_span is None:
+            return
+        otel_span.set_attribute("ryxpress.cpu_time", record["cpu_time"])
+        for k, v in record["counters"].items():
+            otel_span.set_attribute(f"ryxpress.{k}", v)
+        if "error" in record:
+            otel_span.set_attribute("ryxpress.error", record["error"])
+        otel_span.end(end_time=int((record["start"] + record["wall_time"]) * 1e9))
+
+
+if os.environ.get(_TRACE_ENV):
+    add_sink(JsonLinesSink(os.environ[_TRACE_ENV]))
@@ -0,0 +1,361 @@
+"""
+Layered text rendering of the pipeline DAG, without graph libraries.
+
+Behavior:
+
+- rxp_ascii_dag draws the nodes/edges returned by get_nodes_edges as text:
+  one row per layer, dependencies above their dependents, edges drawn
+  downwards with box-drawing characters (or plain ASCII).
+- Layers are longest-path layers computed in one topological pass, so
+  layering is linear in nodes + edges. An edge that would close a cycle
+  (a valid dag.json has none) is ignored for layering and not drawn.
+- An edge spanning several layers is routed through one placeholder per
+  layer crossed and drawn as a vertical line through those rows. Long edges
+  leaving the same source share one line (and those entering the same
+  target share one), choosing whichever end has more long edges, so there
+  are at most two placeholders per node and layer however many edges fan
+  out or in.
+- Nodes within a layer are ordered by the barycentre of their neighbours in
+  the adjacent layer, sweeping down then up, for at most max_iterations
+  sweeps; the ordering with the fewest edge crossings seen is kept.
+- Node labels are coloured with their pipeline_color when colour is on.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .tracing import _colorize, _hex_to_ansi, _supports_color
+
+
+__all__ = ["rxp_ascii_dag"]
+
+
+_UP, _DOWN, _LEFT, _RIGHT = 1, 2, 4, 8
+_VERTICAL = _UP | _DOWN
+_HORIZONTAL = _LEFT | _RIGHT
+
+_UNICODE = {
+    0: " ",
+    _UP: "│", _DOWN: "│", _VERTICAL: "│",
+    _LEFT: "─", _RIGHT: "─", _HORIZONTAL: "─",
+    _DOWN | _RIGHT: "┌", _DOWN | _LEFT: "┐", _UP | _RIGHT: "└", _UP | _LEFT: "┘",
+    _VERTICAL | _RIGHT: "├", _VERTICAL | _LEFT: "┤",
+    _HORIZONTAL | _DOWN: "┬", _HORIZONTAL | _UP: "┴",
+    _VERTICAL | _HORIZONTAL: "┼",
+}
+_ASCII = {
+    m: " " if not m else "|" if not m & _HORIZONTAL else "-" if not m & _VERTICAL else "+"
+    for m in range(16)
+}
+
+# Columns between neighbouring nodes of a layer
+_GAP = 2
+
+
+def _layers(succ: List[List[int]]) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """Longest-path layer of each vertex and the edges kept (forward edges), in one pass."""
+    n = len(succ)
+    indeg = [0] * n
+    for vs in succ:
+        for v in vs:
+            indeg[v] += 1
+    layer = [0] * n
+    done = [False] * n
+    queue = deque(i for i in range(n) if indeg[i] == 0)
+    forward: List[Tuple[int, int]] = []
+    processed = 0
+    next_root = 0
+    while processed < n:
+        if not queue:
+            # Only cycles are left: break one at the first unprocessed vertex
+            while done[next_root]:
+                next_root += 1
+            queue.append(next_root)
+        u = queue.popleft()
+        if done[u]:
+            continue
+        done[u] = True
+        processed += 1
+        for v in succ[u]:
+            if done[v]:
+                continue  # closes a cycle
+            forward.append((u, v))
+            if layer[u] + 1 > layer[v]:
+                layer[v] = layer[u] + 1
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+    return layer, forward
+
+
+def _sort_by_barycentre(row: List[int], neighbours: List[List[int]], pos: List[int]) -> None:
+    keys = {}
+    for v in row:
+        ns = neighbours[v]
+        keys[v] = sum(pos[u] for u in ns) / len(ns) if ns else pos[v]
+    row.sort(key=keys.__getitem__)
+    for i, v in enumerate(row):
+        pos[v] = i
+
+
+def _crossings(rows: List[List[int]], down: List[List[int]], pos: List[int]) -> int:
+    """Edge crossings between consecutive layers (inversion count with a Fenwick tree)."""
+    total = 0
+    for i in range(len(rows) - 1):
+        pairs = sorted((pos[u], pos[v]) for u in rows[i] for v in down[u])
+        size = len(rows[i + 1])
+        tree = [0] * (size + 1)
+        for seen, (_, p) in enumerate(pairs):
+            j, not_above = p + 1, 0
+            while j > 0:
+                not_above += tree[j]
+                j -= j & -j
+            total += seen - not_above
+            j = p + 1
+            while j <= size:
+                tree[j] += 1
+                j += j & -j
+    return total
+
+
+def _order(rows: List[List[int]], up: List[List[int]], down: List[List[int]], max_iterations: int) -> List[List[int]]:
+    pos = [0] * len(up)
+    for row in rows:
+        for i, v in enumerate(row):
+            pos[v] = i
+    best = _crossings(rows, down, pos)
+    best_rows = [r[:] for r in rows]
+    for _ in range(max_iterations):
+        if best == 0:
+            break
+        for i in range(1, len(rows)):
+            _sort_by_barycentre(rows[i], up, pos)
+        for i in range(len(rows) - 2, -1, -1):
+            _sort_by_barycentre(rows[i], down, pos)
+        c = _crossings(rows, down, pos)
+        if c < best:
+            best, best_rows = c, [r[:] for r in rows]
+    return best_rows
+
+
+class _Layered(NamedTuple):
+    """A layered graph: real vertices first, then long-edge placeholders."""
+
+    nodes: List[Optional[Dict]]  # node dict per vertex, None for placeholders
+    layer: List[int]
+    rows: List[List[int]]  # vertices of each layer, left to right
+    up: List[List[int]]  # neighbours in the layer above
+    down: List[List[int]]  # neighbours in the layer below
+    paths: List[List[int]]  # per drawn edge: source, placeholders..., target
+
+
+def _layered(nodes_and_edges: Dict[str, List[Dict]], max_iterations: int) -> _Layered:
+    """Layer and order the nodes/edges of get_nodes_edges output."""
+    index: Dict[str, int] = {}
+    nodes: List[Optional[Dict]] = []
+
+    def vertex(node: Dict) -> int:
+        if node["id"] not in index:
+            index[node["id"]] = len(nodes)
+            nodes.append(node)
+        return index[node["id"]]
+
+    for n in nodes_and_edges.get("nodes", []):
+        vertex(n)
+    succ: List[List[int]] = [[] for _ in nodes]
+    seen = set()
+    for e in nodes_and_edges.get("edges", []):
+        a = vertex({"id": e["from"], "label": e["from"]})
+        b = vertex({"id": e["to"], "label": e["to"]})
+        while len(succ) < len(nodes):
+            succ.append([])
+        if (a, b) not in seen:
+            seen.add((a, b))
+            succ[a].append(b)
+    if not nodes:
+        return _Layered([], [], [], [], [], [])
+
+    layer, forward = _layers(succ)
+    n_out = [0] * len(nodes)
+    n_in = [0] * len(nodes)
+    for u, v in forward:
+        if layer[v] - layer[u] > 1:
+            n_out[u] += 1
+            n_in[v] += 1
+    up: List[List[int]] = [[] for _ in nodes]
+    down: List[List[int]] = [[] for _ in nodes]
+    # Shared placeholder lines: below a source (layer + 1, + 2, ...) and
+    # above a target (layer - 1, - 2, ...)
+    below: Dict[int, List[int]] = {}
+    above: Dict[int, List[int]] = {}
+
+    def extend(chain: List[int], end: int, span: int, step: int) -> None:
+        while len(chain) < span - 1:
+            d = len(nodes)
+            nodes.append(None)
+            layer.append(layer[end] + step * (len(chain) + 1))
+            prev = chain[-1] if chain else end
+            up.append([prev] if step > 0 else [])
+            down.append([] if step > 0 else [prev])
+            (down if step > 0 else up)[prev].append(d)
+            chain.append(d)
+
+    paths: List[List[int]] = []
+    for u, v in forward:
+        span = layer[v] - layer[u]
+        a, b = u, v  # the hop not covered by a shared line
+        mids: List[int] = []
+        if span > 1 and n_out[u] >= n_in[v]:
+            chain = below.setdefault(u, [])
+            extend(chain, u, span, 1)
+            mids = chain[:span - 1]
+            a = mids[-1]
+        elif span > 1:
+            chain = above.setdefault(v, [])
+            extend(chain, v, span, -1)
+            mids = chain[span - 2::-1]
+            b = mids[0]
+        down[a].append(b)
+        up[b].append(a)
+        paths.append([u, *mids, v])
+
+    rows: List[List[int]] = [[] for _ in range(max(layer) + 1)]
+    for v, lv in enumerate(layer):
+        rows[lv].append(v)
+    rows = _order(rows, up, down, max(0, max_iterations))
+    return _Layered(nodes, layer, rows, up, down, paths)
+
+
+def _columns(
+    rows: List[List[int]], up: List[List[int]], width: List[int], gap: int, nodes: List[Optional[Dict]]
+) -> Tuple[List[int], List[int]]:
+    """
+    Left edge and centre of every vertex: left to right in layer order, each
+    vertex pulled towards the mean of its parents' centres without
+    overlapping its left neighbour. A node with real parents ignores the
+    long-edge lines arriving beside them, so shared lines do not drag a
+    chain sideways one column per layer.
+    """
+    x = [0] * len(width)
+    center = [0] * len(width)
+    for row in rows:
+        cursor = 0
+        for v in row:
+            w = width[v]
+            ps = up[v]
+            if nodes[v] is not None:
+                ps = [u for u in ps if nodes[u] is not None] or ps
+            want = sum(center[u] for u in ps) // len(ps) - w // 2 if ps else cursor
+            x[v] = max(cursor, want)
+            center[v] = x[v] + w // 2
+            cursor = x[v] + w + gap
+    return x, center
+
+
+def _cells(cells: Dict[int, str]) -> str:
+    if not cells:
+        return ""
+    line = [" "] * (max(cells) + 1)
+    for x, ch in cells.items():
+        line[x] = ch
+    return "".join(line).rstrip()
+
+
+def rxp_ascii_dag(
+    nodes_and_edges: Optional[Dict[str, List[Dict]]] = None,
+    color: Optional[bool] = None,
+    unicode: bool = True,
+    max_iterations: int = 8,
+) -> str:
+    """
+    Draw the pipeline DAG as layered text.
+
+    Args:
+        nodes_and_edges: dict with keys 'nodes' and 'edges' as returned by
+            get_nodes_edges() (any subgraph selection applies). If None,
+            get_nodes_edges() is called. Edge endpoints that are not nodes
+            are drawn with their id as label.
+        color: colour node labels by pipeline_color; None (default) colours
+            only when the terminal supports it.
+        unicode: draw edges with box-drawing characters; False uses |, -, +
+            and v only.
+        max_iterations: maximum number of crossing-reduction sweeps.
+
+    Returns:
+        The drawing as a string (empty for an empty graph), one text row per
+        line; dependencies are above their dependents.
+
+    Example:
+        print(rxp_ascii_dag(get_nodes_edges(focus="model", hops=2)))
+    """
+    if nodes_and_edges is None:
+        from .plotting import get_nodes_edges
+
+        nodes_and_edges = get_nodes_edges()
+    if color is None:
+        color = _supports_color()
+
+    g = _layered(nodes_and_edges, max_iterations)
+    if not g.nodes:
+        return ""
+    rows, up, down = g.rows, g.up, g.down
+    labels = [str(n.get("label") or n["id"]) if n is not None else None for n in g.nodes]
+    ansi = [
+        _hex_to_ansi(n.get("pipeline_color") or "") if color and n is not None else ""
+        for n in g.nodes
+    ]
+    width = [len(s) if s is not None else 1 for s in labels]
+    x, center = _columns(rows, up, width, _GAP, g.nodes)
+
+    chars = _UNICODE if unicode else _ASCII
+    arrow = "▼" if unicode else "v"
+    out: List[str] = []
+    for i, row in enumerate(rows):
+        pieces: List[str] = []
+        col = 0
+        for v in row:
+            pieces.append(" " * (x[v] - col))
+            text = labels[v]
+            if text is None:
+                pieces.append(chars[_VERTICAL])
+            else:
+                pieces.append(_colorize(text, ansi[v]))
+            col = x[v] + width[v]
+        out.append("".join(pieces).rstrip())
+        if i == len(rows) - 1:
+            break
+
+        # Three rows per gap: stubs under the sources, horizontal routing,
+        # then arrows (or pass-through lines) above the targets.
+        out.append(_cells({center[u]: chars[_VERTICAL] for u in row if down[u]}))
+        masks: Dict[int, int] = {}
+        spans: List[Tuple[int, int]] = []
+        for u in row:
+            a = center[u]
+            for v in down[u]:
+                b = center[v]
+                if a == b:
+                    masks[a] = masks.get(a, 0) | _VERTICAL
+                    continue
+                masks[a] = masks.get(a, 0) | _UP | (_RIGHT if b > a else _LEFT)
+                masks[b] = masks.get(b, 0) | _DOWN | (_LEFT if b > a else _RIGHT)
+                spans.append((min(a, b), max(a, b)))
+        if spans:
+            # Difference array: each column strictly inside a span gets a horizontal line
+            diff = [0] * (max(hi for _, hi in spans) + 1)
+            for lo, hi in spans:
+                diff[lo + 1] += 1
+                diff[hi] -= 1
+            depth = 0
+            for c, d in enumerate(diff):
+                depth += d
+                if depth:
+                    masks[c] = masks.get(c, 0) | _HORIZONTAL
+        out.append(_cells({c: chars[m] for c, m in masks.items()}))
+        out.append(_cells({
+            center[v]: chars[_VERTICAL] if labels[v] is None else arrow
+            for v in rows[i + 1]
+            if up[v]
+        }))
+    return "\n".join(out)
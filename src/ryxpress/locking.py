@@ -0,0 +1,156 @@
+"""
+Advisory locks shared by the ryxpress functions that touch the Nix store.
+
+Behavior:
+
+- Locks are built on fcntl.flock(), so they are attached to the open file
+  description and are released by the kernel when the owning process dies:
+  there is no PID/timestamp staleness heuristic to get wrong.
+- Two scopes are provided:
+    - project_lock(): one lock per project, stored in _rixpress/.rxp.lock
+    - store_lock(): one host-wide lock for operations that affect the whole
+      Nix store (e.g. 'nix-store --gc'), stored in the temp directory
+- Each lock can be taken in shared mode (read-only work such as rxp_read or a
+  dry-run rxp_gc; any number of holders) or exclusive mode (destructive GC;
+  a single holder and no shared holders).
+- On platforms without fcntl (Windows), locks degrade to no-ops and a debug
+  message is logged.
+- Raises LockTimeoutError when the lock cannot be obtained in time.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["ProjectLock", "LockTimeoutError", "project_lock", "store_lock"]
+
+
+class LockTimeoutError(RuntimeError):
+    pass
+
+
+_POLL_INTERVAL = 0.05
+
+
+class ProjectLock:
+    """
+    Context manager around an flock()-based shared/exclusive lock file.
+
+    Args:
+        path: lock file path (created if needed, never deleted).
+        shared: take a shared (read) lock instead of an exclusive one.
+        timeout: seconds to wait for the lock. 0 fails immediately, None waits forever.
+        create_parent: create the lock file's parent directory if missing. When
+            False and the directory does not exist, the lock is a no-op (there is
+            nothing to protect yet).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        shared: bool = False,
+        timeout: Optional[float] = 0,
+        create_parent: bool = False,
+    ):
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = timeout
+        self.create_parent = create_parent
+        self.acquired = False
+        self.fd: Optional[int] = None
+
+    @property
+    def mode(self) -> str:
+        return "shared" if self.shared else "exclusive"
+
+    def acquire(self) -> bool:
+        try:
+            import fcntl
+        except ImportError:
+            logger.debug("fcntl unavailable; %s lock on %s is a no-op", self.mode, self.path)
+            return False
+
+        if not self.path.parent.is_dir():
+            if not self.create_parent:
+                return False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o666)
+        op = (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self.fd, op)
+                break
+            except (BlockingIOError, PermissionError):
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(self.fd)
+                    self.fd = None
+                    raise LockTimeoutError(
+                        f"Could not acquire {self.mode} lock on {self.path}: "
+                        "another ryxpress process holds a conflicting lock."
+                    )
+                time.sleep(_POLL_INTERVAL)
+
+        if not self.shared:
+            # Informational only: the kernel lock, not this content, is authoritative.
+            try:
+                os.ftruncate(self.fd, 0)
+                os.write(self.fd, f"{os.getpid()}\n".encode("utf-8"))
+            except OSError:
+                pass
+        self.acquired = True
+        return True
+
+    def release(self) -> None:
+        if self.fd is None:
+            return
+        try:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        except Exception:
+            pass
+        try:
+            os.close(self.fd)
+        except Exception:
+            pass
+        self.fd = None
+        self.acquired = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def project_lock(
+    project_path: Union[str, Path] = ".",
+    shared: bool = False,
+    timeout: Optional[float] = 0,
+) -> ProjectLock:
+    """
+    Return a lock scoped to a single project (_rixpress/.rxp.lock).
+
+    The lock is a no-op when the project has no _rixpress directory yet.
+    """
+    return ProjectLock(Path(project_path) / "_rixpress" / ".rxp.lock", shared=shared, timeout=timeout)
+
+
+def store_lock(shared: bool = False, timeout: Optional[float] = 0) -> ProjectLock:
+    """
+    Return the host-wide lock for operations that affect the whole Nix store.
+
+    Targeted deletions take it in shared mode so that several projects can
+    collect garbage concurrently; a full 'nix-store --gc' takes it exclusively.
+    """
+    import tempfile
+
+    return ProjectLock(Path(tempfile.gettempdir()) / "rixpress_store.lock", shared=shared, timeout=timeout)
@@ -0,0 +1,385 @@
+"""
+Query derivation history across all build logs through a persistent index.
+
+Behavior:
+
+- The index is a SQLite database in _rixpress/.rxp-index.sqlite with one row
+  per (log, derivation). It is refreshed incrementally before every query:
+  only logs whose size or mtime changed since they were indexed are parsed
+  (through the .rxpc sidecar when it is fresh); logs that disappeared are
+  dropped. A query over thousands of logs therefore costs one directory scan
+  plus an indexed SQL lookup.
+- Build times come from the log filename (build_log_YYYYMMDD_HHMMSS_*.json),
+  falling back to the file's modification time.
+- rxp_history(derivation) lists every build of a derivation, newest first;
+  rxp_find() searches by store path and/or derivation; both accept
+  build_success and since/until (date, datetime or ISO string) filters.
+- rxp_provenance(store_path) is the reverse lookup: which derivation (and
+  which log) produced a /nix/store path or a file inside it. It is an indexed
+  lookup on the same table, used by rxp_read for store paths and by rxp_gc
+  to name the derivations behind the paths it reports.
+- If the index cannot be written (read-only project), an in-memory index is
+  built for the call instead; results are the same, only slower.
+- Raises FileNotFoundError when the _rixpress directory does not exist.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .inspect_logs import _load_log
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_history", "rxp_find", "rxp_provenance", "rxp_reindex"]
+
+
+_INDEX_NAME = ".rxp-index.sqlite"
+_SCHEMA_VERSION = 1
+_LOG_RE = re.compile(r"^build_log.*\.json$")
+_LOG_TIME_RE = re.compile(r"build_log_([0-9]{8})_([0-9]{6})")
+_STORE_ROOT_RE = re.compile(r"^(/nix/store/[^/]+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    filename   TEXT PRIMARY KEY,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    build_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS builds (
+    log           TEXT NOT NULL REFERENCES logs(filename) ON DELETE CASCADE,
+    derivation    TEXT NOT NULL,
+    build_success INTEGER,
+    path          TEXT,
+    output        TEXT
+);
+CREATE INDEX IF NOT EXISTS builds_derivation ON builds(derivation);
+CREATE INDEX IF NOT EXISTS builds_path ON builds(path);
+CREATE INDEX IF NOT EXISTS builds_log ON builds(log);
+-- content digests of output files, recorded by rxp_verify
+CREATE TABLE IF NOT EXISTS digests (
+    path      TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    digest    TEXT NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+-- per store path disk usage and closure, recorded by rxp_du
+CREATE TABLE IF NOT EXISTS du (
+    path   TEXT PRIMARY KEY,
+    files  INTEGER NOT NULL,
+    bytes  INTEGER NOT NULL,
+    inodes BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS requisites (
+    path  TEXT PRIMARY KEY,
+    paths TEXT NOT NULL
+);
+"""
+
+
+def _build_time(filename: str, mtime_ns: int) -> str:
+    """ISO timestamp of a build, from its log filename or the file mtime."""
+    m = _LOG_TIME_RE.search(filename)
+    if m:
+        try:
+            return datetime.strptime(m.group(1) + m.group(2), "%Y%m%d%H%M%S").isoformat()
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime_ns / 1e9).replace(microsecond=0).isoformat()
+
+
+def _as_bound(value: Union[str, date, datetime, None], upper: bool) -> Optional[str]:
+    """Normalize a since/until filter to an ISO string comparable with build_time."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        value = value.isoformat()
+    value = str(value)
+    if len(value) == 10:  # a plain date covers the whole day when used as an upper bound
+        return value + ("T23:59:59.999999" if upper else "T00:00:00")
+    return value
+
+
+def _connect(rixpress_dir: Path):
+    import sqlite3
+
+    path = rixpress_dir / _INDEX_NAME
+    try:
+        conn = sqlite3.connect(str(path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.Error:
+        logger.debug("Cannot open %s; using an in-memory index", path, exc_info=True)
+        conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS builds; DROP TABLE IF EXISTS logs;")
+        conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _refresh(conn, rixpress_dir: Path, full: bool = False) -> Dict[str, int]:
+    """Bring the index in line with the logs on disk; returns counts of changes."""
+    on_disk: Dict[str, os.stat_result] = {}
+    with os.scandir(rixpress_dir) as it:
+        for entry in it:
+            if _LOG_RE.search(entry.name) and entry.is_file():
+                on_disk[entry.name] = entry.stat()
+
+    indexed = {} if full else {
+        name: (size, mtime_ns) for name, size, mtime_ns in conn.execute("SELECT filename, size, mtime_ns FROM logs")
+    }
+    stale = [n for n in indexed if n not in on_disk]
+    todo = [
+        n for n, st in on_disk.items() if indexed.get(n) != (st.st_size, st.st_mtime_ns)
+    ]
+    if not stale and not todo and not full:
+        return {"added": 0, "removed": 0, "logs": len(on_disk)}
+
+    with conn:
+        if full:
+            conn.execute("DELETE FROM builds")
+            conn.execute("DELETE FROM logs")
+        for name in stale + [n for n in todo if n in indexed]:
+            conn.execute("DELETE FROM logs WHERE filename = ?", (name,))
+        for name in todo:
+            st = on_disk[name]
+            try:
+                keys, columns = _load_log(rixpress_dir / name, columnar=True)
+            except Exception:
+                logger.debug("Skipping unreadable log %s", name, exc_info=True)
+                continue
+            conn.execute(
+                "INSERT INTO logs VALUES (?, ?, ?, ?)",
+                (name, st.st_size, st.st_mtime_ns, _build_time(name, st.st_mtime_ns)),
+            )
+            col = dict(zip(keys, columns))
+            n = len(columns[0]) if columns else 0
+            none = [None] * n
+            conn.executemany(
+                "INSERT INTO builds VALUES (?, ?, ?, ?, ?)",
+                [
+                    (name, str(d), None if ok is None else int(bool(ok)), p, json.dumps(out))
+                    for d, ok, p, out in zip(
+                        col.get("derivation", none),
+                        col.get("build_success", none),
+                        col.get("path", none),
+                        col.get("output", none),
+                    )
+                    if d is not None
+                ],
+            )
+    return {"added": len(todo), "removed": len(stale), "logs": len(on_disk)}
+
+
+def _open_index(project_path: Union[str, Path]):
+    rixpress_dir = Path(project_path) / "_rixpress"
+    if not rixpress_dir.is_dir():
+        raise FileNotFoundError("_rixpress directory not found. Did you initialise the project?")
+    conn = _connect(rixpress_dir)
+    _refresh(conn, rixpress_dir)
+    return conn
+
+
+def _query(
+    project_path: Union[str, Path],
+    where: List[str],
+    params: List[Any],
+    build_success: Optional[bool],
+    since: Union[str, date, datetime, None],
+    until: Union[str, date, datetime, None],
+) -> List[Dict[str, Any]]:
+    if build_success is not None:
+        where.append("b.build_success = ?")
+        params.append(int(build_success))
+    lo, hi = _as_bound(since, upper=False), _as_bound(until, upper=True)
+    if lo is not None:
+        where.append("l.build_time >= ?")
+        params.append(lo)
+    if hi is not None:
+        where.append("l.build_time <= ?")
+        params.append(hi)
+
+    sql = (
+        "SELECT b.derivation, b.build_success, b.path, b.output, b.log, l.build_time "
+        "FROM builds b JOIN logs l ON l.filename = b.log"
+    )
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY l.build_time DESC, b.log DESC, b.rowid"
+
+    conn = _open_index(project_path)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "derivation": d,
+            "build_success": None if ok is None else bool(ok),
+            "path": p,
+            "output": json.loads(out) if out else out,
+            "log": log,
+            "build_time": bt,
+        }
+        for d, ok, p, out, log, bt in rows
+    ]
+
+
+def rxp_history(
+    derivation: str,
+    project_path: Union[str, Path] = ".",
+    build_success: Optional[bool] = None,
+    since: Union[str, date, datetime, None] = None,
+    until: Union[str, date, datetime, None] = None,
+) -> List[Dict[str, Any]]:
+    """
+    List every recorded build of a derivation across all build logs.
+
+    Args:
+        derivation: derivation name.
+        project_path: path to project root (defaults to ".").
+        build_success: if True/False, only return successful/failed builds.
+        since: only builds at or after this date/datetime (ISO string accepted).
+        until: only builds at or before this date/datetime; a plain date
+            includes the whole day.
+
+    Returns:
+        A list of dicts, newest first, with keys derivation, build_success,
+        path, output, log (log filename) and build_time (ISO string).
+        rxp_history("mtcars_mpg", build_success=True)[0] answers "when did it
+        last build successfully, and where".
+
+    Raises:
+        FileNotFoundError: if the _rixpress directory does not exist.
+    """
+    return _query(project_path, ["b.derivation = ?"], [derivation], build_success, since, until)
+
+
+def rxp_find(
+    path: Optional[str] = None,
+    derivation: Optional[str] = None,
+    project_path: Union[str, Path] = ".",
+    build_success: Optional[bool] = None,
+    since: Union[str, date, datetime, None] = None,
+    until: Union[str, date, datetime, None] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search builds across all logs.
+
+    Args:
+        path: a /nix/store path; files inside a store path match the store
+            path that contains them.
+        derivation: derivation name; may contain '*' and '?' wildcards.
+        project_path: path to project root (defaults to ".").
+        build_success: if True/False, only return successful/failed builds.
+        since: only builds at or after this date/datetime (ISO string accepted).
+        until: only builds at or before this date/datetime.
+
+    Returns:
+        Matching builds, newest first, in the same shape as rxp_history().
+
+    Raises:
+        FileNotFoundError: if the _rixpress directory does not exist.
+    """
+    where: List[str] = []
+    params: List[Any] = []
+    if path is not None:
+        where.append("b.path = ?")
+        params.append(_store_root(path) or str(path).rstrip("/"))
+    if derivation is not None:
+        where.append("b.derivation GLOB ?")
+        params.append(derivation)
+    return _query(project_path, where, params, build_success, since, until)
+
+
+def _store_root(path: str) -> Optional[str]:
+    m = _STORE_ROOT_RE.match(str(path))
+    return m.group(1) if m else None
+
+
+def rxp_provenance(store_path: str, project_path: Union[str, Path] = ".") -> Optional[Dict[str, Any]]:
+    """
+    Find the derivation and build log that produced a /nix/store path.
+
+    Args:
+        store_path: a /nix/store path, or a file or directory inside one.
+        project_path: path to project root (defaults to ".").
+
+    Returns:
+        None if no log of this project mentions the store path. Otherwise the
+        most recent matching build, shaped like rxp_history() rows, plus:
+        - store_path: the top-level /nix/store/<hash>-<name> path
+        - file: the part of store_path inside it (None for the store path itself)
+
+    Raises:
+        FileNotFoundError: if the _rixpress directory does not exist.
+    """
+    root = _store_root(store_path)
+    if root is None:
+        return None
+    matches = _query(project_path, ["b.path = ?"], [root], None, None, None)
+    if not matches:
+        return None
+    found = dict(matches[0])
+    rest = str(store_path)[len(root):].strip("/")
+    found["store_path"] = root
+    found["file"] = rest or None
+    return found
+
+
+def _derivations_for_paths(project_path: Union[str, Path], paths: Sequence[str]) -> Dict[str, str]:
+    """Batch reverse lookup: store path -> derivation of its most recent build."""
+    roots = {p: _store_root(p) for p in paths}
+    wanted = sorted({r for r in roots.values() if r})
+    by_root: Dict[str, str] = {}
+    if not wanted:
+        return {}
+    conn = _open_index(project_path)
+    try:
+        for i in range(0, len(wanted), 500):
+            chunk = wanted[i:i + 500]
+            rows = conn.execute(
+                "SELECT b.path, b.derivation FROM builds b JOIN logs l ON l.filename = b.log "
+                f"WHERE b.path IN ({','.join('?' * len(chunk))}) ORDER BY l.build_time, b.log",
+                chunk,
+            )
+            for path, deriv in rows:
+                by_root[path] = deriv  # later (newer) builds win
+    finally:
+        conn.close()
+    return {p: by_root[r] for p, r in roots.items() if r in by_root}
+
+
+def rxp_reindex(project_path: Union[str, Path] = ".", full: bool = False) -> Dict[str, int]:
+    """
+    Update the build log index now (queries do this automatically).
+
+    Args:
+        project_path: path to project root (defaults to ".").
+        full: rebuild the index from scratch instead of incrementally.
+
+    Returns:
+        A dict with the number of logs added (or re-parsed), removed, and on disk.
+
+    Raises:
+        FileNotFoundError: if the _rixpress directory does not exist.
+    """
+    rixpress_dir = Path(project_path) / "_rixpress"
+    if not rixpress_dir.is_dir():
+        raise FileNotFoundError("_rixpress directory not found. Did you initialise the project?")
+    conn = _connect(rixpress_dir)
+    try:
+        return _refresh(conn, rixpress_dir, full=full)
+    finally:
+        conn.close()
@@ -0,0 +1,802 @@
+"""
+Define and build rixpress pipelines from Python, without going through R.
+
+Behavior:
+
+- rxp_py, rxp_py_file, rxp_r and rxp_r_file mirror the rixpress R functions
+  of the same names and return RxpDerivation values; rxp_pipeline assigns a
+  group (and color) to a list of them.
+- rxp_populate writes pipeline.nix and _rixpress/dag.json in the format
+  rixpress::rxp_populate produces, so everything else in ryxpress (rxp_read,
+  rxp_trace, plotting, ...) works on the result unchanged:
+    - dependencies are the other derivations whose names appear as
+      identifiers in an expression (string literals are ignored);
+    - Python derivations read their dependencies with pickle (or decoder),
+      R derivations with readRDS (or decoder), and write their value with
+      pickle / saveRDS (or encoder);
+    - _rixpress/default_libraries.py and default_libraries.R are generated
+      from the packages declared in default.nix (written empty-ish when
+      there is no default.nix and the files do not exist yet).
+- rxp_build runs nix-build on pipeline.nix and writes a
+  build_log_<timestamp>_<hash>.json like rixpress::rxp_make, so a
+  pure-Python pipeline never starts R. rxp_populate(build=True) calls it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from .r_runner import RRunResult
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    "RxpDerivation",
+    "rxp_py",
+    "rxp_py_file",
+    "rxp_r",
+    "rxp_r_file",
+    "rxp_pipeline",
+    "rxp_populate",
+    "rxp_build",
+]
+
+
+_PY_IDENT_RE = re.compile(r"(?<![\w.])([A-Za-z_]\w*)")
+_R_IDENT_RE = re.compile(r"(?<![\w.$@:])([A-Za-z.][\w.]*)")
+_STRING_RE = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+_RESERVED = {"default", "all-derivations", "allDerivations", "defaultPkgs", "defaultShell"}
+
+# Nix attribute names whose Python import name differs
+_PY_IMPORT_NAMES = {
+    "beautifulsoup4": "bs4",
+    "pillow": "PIL",
+    "pyyaml": "yaml",
+    "scikit-learn": "sklearn",
+    "scikitlearn": "sklearn",
+}
+_PY_SKIP = {"pip", "ipykernel"}
+
+
+@dataclass
+class RxpDerivation:
+    """One step of a pipeline; build it with rxp_py, rxp_py_file, rxp_r or rxp_r_file."""
+
+    name: str
+    lang: str  # "py" or "r"
+    expr: Optional[str] = None
+    path: Optional[str] = None
+    read_function: Optional[str] = None
+    sha256: Optional[str] = None
+    user_functions: List[str] = field(default_factory=list)
+    additional_files: List[str] = field(default_factory=list)
+    encoder: Optional[str] = None
+    decoder: Union[None, str, Dict[str, str]] = None
+    noop_build: bool = False
+    pipeline_group: str = "default"
+    pipeline_color: Optional[str] = None
+
+    @property
+    def type(self) -> str:
+        return "rxp_py" if self.lang == "py" else "rxp_r"
+
+    @property
+    def is_file(self) -> bool:
+        return self.path is not None
+
+
+def _as_list(value: Union[None, str, Sequence[str]]) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _check_name(name: str) -> str:
+    # Names are Nix attributes as well as Python/R variables
+    if not isinstance(name, str) or not name:
+        raise TypeError("name must be a non-empty string")
+    if not name.isascii() or not name.isidentifier() or name in _RESERVED:
+        raise ValueError(f"Invalid derivation name: {name!r}")
+    return name
+
+
+def rxp_py(
+    name: str,
+    expr: str,
+    user_functions: Union[None, str, Sequence[str]] = None,
+    additional_files: Union[None, str, Sequence[str]] = None,
+    encoder: Optional[str] = None,
+    decoder: Union[None, str, Dict[str, str]] = None,
+    noop_build: bool = False,
+) -> RxpDerivation:
+    """
+    A derivation that evaluates a Python expression.
+
+    Args:
+        name: derivation (and variable) name.
+        expr: Python expression; names of other derivations used in it become dependencies.
+        user_functions: file(s) exec'd before expr (e.g. "functions.py").
+        additional_files: extra files or directories copied into the build directory.
+        encoder: name of a function f(obj, path) used instead of pickle to write the value.
+        decoder: name of a function f(path) used instead of pickle to read
+            dependencies, or a dict mapping dependency names to decoders.
+        noop_build: emit a placeholder instead of building this derivation
+            (and everything that depends on it).
+
+    Returns:
+        An RxpDerivation.
+    """
+    if not isinstance(expr, str) or not expr.strip():
+        raise TypeError("expr must be a non-empty string")
+    return RxpDerivation(
+        name=_check_name(name),
+        lang="py",
+        expr=expr,
+        user_functions=_as_list(user_functions),
+        additional_files=_as_list(additional_files),
+        encoder=encoder,
+        decoder=decoder,
+        noop_build=noop_build,
+    )
+
+
+def rxp_py_file(
+    name: str,
+    path: str,
+    read_function: str,
+    user_functions: Union[None, str, Sequence[str]] = None,
+    additional_files: Union[None, str, Sequence[str]] = None,
+    encoder: Optional[str] = None,
+    sha256: Optional[str] = None,
+    noop_build: bool = False,
+) -> RxpDerivation:
+    """
+    A derivation that reads a file (local, or a URL fetched by Nix) with Python.
+
+    Args:
+        name: derivation (and variable) name.
+        path: path relative to the project root, or an http(s) URL.
+        read_function: Python expression evaluating to a callable taking the
+            file path, e.g. "lambda x: polars.read_csv(x, separator='|')".
+        user_functions: file(s) exec'd before read_function.
+        additional_files: extra files or directories copied into the build directory.
+        encoder: name of a function f(obj, path) used instead of pickle to write the value.
+        sha256: Nix hash of a URL; when omitted it is computed with nix-prefetch-url
+            by rxp_populate.
+        noop_build: emit a placeholder instead of building this derivation.
+
+    Returns:
+        An RxpDerivation.
+    """
+    return RxpDerivation(
+        name=_check_name(name),
+        lang="py",
+        path=str(path),
+        read_function=read_function,
+        sha256=sha256,
+        user_functions=_as_list(user_functions),
+        additional_files=_as_list(additional_files),
+        encoder=encoder,
+        noop_build=noop_build,
+    )
+
+
+def rxp_r(
+    name: str,
+    expr: str,
+    user_functions: Union[None, str, Sequence[str]] = None,
+    additional_files: Union[None, str, Sequence[str]] = None,
+    encoder: Optional[str] = None,
+    decoder: Union[None, str, Dict[str, str]] = None,
+    noop_build: bool = False,
+) -> RxpDerivation:
+    """
+    A derivation that evaluates an R expression (run with Rscript inside the Nix build).
+
+    Args:
+        name: derivation (and variable) name.
+        expr: R expression as a string, e.g. "dplyr::select(mtcars_head, mpg)".
+        user_functions: file(s) sourced before expr (e.g. "functions.R").
+        additional_files: extra files or directories copied into the build directory.
+        encoder: name of an R function f(obj, path) used instead of saveRDS.
+        decoder: name of an R function f(path) used instead of readRDS to read
+            dependencies, or a dict mapping dependency names to decoders.
+        noop_build: emit a placeholder instead of building this derivation.
+
+    Returns:
+        An RxpDerivation.
+    """
+    if not isinstance(expr, str) or not expr.strip():
+        raise TypeError("expr must be a non-empty string")
+    return RxpDerivation(
+        name=_check_name(name),
+        lang="r",
+        expr=expr,
+        user_functions=_as_list(user_functions),
+        additional_files=_as_list(additional_files),
+        encoder=encoder,
+        decoder=decoder,
+        noop_build=noop_build,
+    )
+
+
+def rxp_r_file(
+    name: str,
+    path: str,
+    read_function: str,
+    user_functions: Union[None, str, Sequence[str]] = None,
+    additional_files: Union[None, str, Sequence[str]] = None,
+    encoder: Optional[str] = None,
+    sha256: Optional[str] = None,
+    noop_build: bool = False,
+) -> RxpDerivation:
+    """
+    A derivation that reads a file (local, or a URL fetched by Nix) with R.
+
+    Args:
+        name: derivation (and variable) name.
+        path: path relative to the project root, or an http(s) URL.
+        read_function: R function (or function expression) taking the file path,
+            e.g. "read.csv" or "function(x) read.csv(x, sep = '|')".
+        user_functions: file(s) sourced before read_function.
+        additional_files: extra files or directories copied into the build directory.
+        encoder: name of an R function f(obj, path) used instead of saveRDS.
+        sha256: Nix hash of a URL; computed with nix-prefetch-url when omitted.
+        noop_build: emit a placeholder instead of building this derivation.
+
+    Returns:
+        An RxpDerivation.
+    """
+    return RxpDerivation(
+        name=_check_name(name),
+        lang="r",
+        path=str(path),
+        read_function=read_function,
+        sha256=sha256,
+        user_functions=_as_list(user_functions),
+        additional_files=_as_list(additional_files),
+        encoder=encoder,
+        noop_build=noop_build,
+    )
+
+
+def rxp_pipeline(name: str, derivations: Iterable[RxpDerivation], color: Optional[str] = None) -> List[RxpDerivation]:
+    """
+    Put derivations in a named group (shown by the DAG plots).
+
+    Args:
+        name: group name recorded as pipeline_group in dag.json.
+        derivations: the derivations of the group.
+        color: optional color recorded as pipeline_color.
+
+    Returns:
+        The derivations, updated in place, as a list.
+    """
+    out = list(derivations)
+    for d in out:
+        d.pipeline_group = name
+        d.pipeline_color = color
+    return out
+
+
+# -- dependency detection ----------------------------------------------------
+
+
+def _identifiers(code: str, lang: str) -> List[str]:
+    stripped = _STRING_RE.sub("''", code)
+    regex = _PY_IDENT_RE if lang == "py" else _R_IDENT_RE
+    return regex.findall(stripped)
+
+
+def _dependencies(derivs: Sequence[RxpDerivation]) -> Dict[str, List[str]]:
+    names = {d.name for d in derivs}
+    deps: Dict[str, List[str]] = {}
+    for d in derivs:
+        found: List[str] = []
+        if d.expr is not None:
+            for ident in _identifiers(d.expr, d.lang):
+                if ident in names and ident != d.name and ident not in found:
+                    found.append(ident)
+        deps[d.name] = found
+
+    # Reject cycles (Nix would only report infinite recursion)
+    state: Dict[str, int] = {}
+
+    def visit(n: str, trail: List[str]) -> None:
+        if state.get(n) == 2:
+            return
+        if state.get(n) == 1:
+            cycle = trail[trail.index(n):] + [n]
+            raise ValueError(f"Cycle in pipeline: {' -> '.join(cycle)}")
+        state[n] = 1
+        for m in deps[n]:
+            visit(m, trail + [n])
+        state[n] = 2
+
+    for d in derivs:
+        visit(d.name, [])
+    return deps
+
+
+def _noop_closure(derivs: Sequence[RxpDerivation], deps: Dict[str, List[str]]) -> Dict[str, bool]:
+    noop = {d.name: d.noop_build for d in derivs}
+    changed = True
+    while changed:
+        changed = False
+        for name, ds in deps.items():
+            if not noop[name] and any(noop[x] for x in ds):
+                noop[name] = changed = True
+    return noop
+
+
+# -- Nix generation -----------------------------------------------------------
+
+
+def _nix_string(s: str) -> str:
+    """Escape text for a Nix ''...'' string."""
+    return s.replace("''", "'''").replace("${", "''${")
+
+
+def _shell(s: str) -> str:
+    """Escape text for a double-quoted shell string."""
+    return s.replace("\\", "\\\\").replace('"', '\\"').replace("$", "\\$").replace("`", "\\`")
+
+
+def _py_literal(s: str) -> str:
+    """Body of a single-quoted Python string literal."""
+    return s.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n")
+
+
+def _user(s: str) -> str:
+    """Escape user-provided code embedded in a buildPhase command string."""
+    return _nix_string(_shell(s))
+
+
+def _nix_path(p: str) -> str:
+    p = p.replace("\\", "/").rstrip("/")
+    if p.startswith("/"):
+        raise ValueError(f"Paths in a pipeline must be relative to the project root: {p}")
+    if not p.startswith("./") and not p.startswith("../"):
+        p = "./" + p
+    if re.search(r"[^\w./+-]", p):
+        return f'(./. + "/{p[2:]}")' if p.startswith("./") else f'(./. + "/{p}")'
+    return p
+
+
+def _rel(p: str) -> str:
+    """Project-relative path as it appears in a build directory filled from a fileset."""
+    p = p.replace("\\", "/").rstrip("/")
+    return p[2:] if p.startswith("./") else p
+
+
+def _is_url(p: str) -> bool:
+    return p.startswith("http://") or p.startswith("https://")
+
+
+def _prefetch_url(url: str) -> str:
+    import shutil
+    import subprocess
+
+    exe = shutil.which("nix-prefetch-url")
+    if exe is None:
+        raise FileNotFoundError(f"nix-prefetch-url not found on PATH; pass sha256= for {url}")
+    proc = subprocess.run([exe, url], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        raise RuntimeError(f"nix-prefetch-url failed for {url}: {proc.stderr.strip()}")
+    return proc.stdout.strip().splitlines()[-1].strip()
+
+
+_HEADER = """let
+  default = import ./default.nix;
+  defaultPkgs = default.pkgs;
+  defaultShell = default.shell;
+  defaultBuildInputs = defaultShell.buildInputs;
+  defaultConfigurePhase = ''
+    cp ${./_rixpress/default_libraries.py} libraries.py
+    cp ${./_rixpress/default_libraries.R} libraries.R
+    mkdir -p $out
+    mkdir -p .julia_depot
+    export JULIA_DEPOT_PATH=$PWD/.julia_depot
+    export HOME_PATH=$PWD
+  '';
+
+  # Function to create R derivations
+  makeRDerivation = { name, buildInputs, configurePhase, buildPhase, src ? null }:
+    defaultPkgs.stdenv.mkDerivation {
+      inherit name src;
+      dontUnpack = true;
+      inherit buildInputs configurePhase buildPhase;
+      installPhase = ''
+        cp ${name} $out/
+      '';
+    };
+  # Function to create Python derivations
+  makePyDerivation = { name, buildInputs, configurePhase, buildPhase, src ? null }:
+    let
+      pickleFile = "${name}";
+    in
+      defaultPkgs.stdenv.mkDerivation {
+        inherit name src;
+        dontUnpack = true;
+        buildInputs = buildInputs;
+        inherit configurePhase buildPhase;
+        installPhase = ''
+          cp ${pickleFile} $out
+        '';
+      };
+
+  # Define all derivations
+"""
+
+
+def _decoder_for(d: RxpDerivation, dep: str) -> Optional[str]:
+    if isinstance(d.decoder, dict):
+        return d.decoder.get(dep)
+    return d.decoder
+
+
+def _py_program(d: RxpDerivation, deps: List[str], file_name: Optional[str]) -> List[str]:
+    lines = ["exec(open('libraries.py').read())"]
+    for dep in deps:
+        decoder = _decoder_for(d, dep)
+        if decoder:
+            lines.append(f"{dep} = {_user(decoder)}('${{{dep}}}/{dep}')")
+        else:
+            lines.append(f"with open('${{{dep}}}/{dep}', 'rb') as f: {dep} = pickle.load(f)")
+    for f in d.user_functions:
+        lines.append(f"exec(open('{_user(_py_literal(_rel(f)))}').read())")
+    if file_name is not None:
+        lines.append(f"file_path = '{_user(_py_literal(file_name))}'")
+        lines.append(f"data = eval('{_user(_py_literal(d.read_function or ''))}')(file_path)")
+        value = "data"
+    else:
+        lines.append(f"exec('{d.name} = {_user(_py_literal(d.expr or ''))}')")
+        value = f"globals()['{d.name}']"
+    if d.encoder:
+        lines.append(f"{_user(d.encoder)}({value}, '{d.name}')")
+    else:
+        lines.append(f"with open('{d.name}', 'wb') as f:")
+        lines.append(f"    pickle.dump({value}, f)")
+    return lines
+
+
+def _r_program(d: RxpDerivation, deps: List[str], file_name: Optional[str]) -> List[str]:
+    lines = ["source('libraries.R')"]
+    for dep in deps:
+        decoder = _decoder_for(d, dep) or "readRDS"
+        lines.append(f"{dep} <- {_user(decoder)}('${{{dep}}}/{dep}')")
+    for f in d.user_functions:
+        lines.append(f"source('{_user(_py_literal(_rel(f)))}')")
+    if file_name is not None:
+        lines.append(f"file_path <- '{_user(_py_literal(file_name))}'")
+        lines.append(f"data <- ({_user(d.read_function or '')})(file_path)")
+        value = "data"
+    else:
+        lines.append(f"{d.name} <- {_user(d.expr or '')}")
+        value = d.name
+    encoder = d.encoder or "saveRDS"
+    lines.append(f"{_user(encoder)}({value}, '{d.name}')")
+    return lines
+
+
+def _derivation_nix(d: RxpDerivation, deps: List[str], noop: bool, sha256: Optional[str]) -> str:
+    maker = "makePyDerivation" if d.lang == "py" else "makeRDerivation"
+    out = [f"  {d.name} = {maker} {{", f'    name = "{d.name}";']
+
+    copy_src: Optional[str] = None
+    file_name: Optional[str] = None
+    local_files = [*d.user_functions, *d.additional_files]
+    if d.is_file:
+        file_name = os.path.basename(d.path.rstrip("/").split("?")[0]) or d.name
+        if _is_url(d.path):
+            if local_files:
+                raise ValueError(f"{d.name}: user_functions/additional_files cannot be combined with a URL path")
+            out += [
+                "    src = defaultPkgs.fetchurl {",
+                f'      url = "{d.path}";',
+                f'      sha256 = "{sha256}";',
+                "    };",
+            ]
+            copy_src = f"cp -r $src {file_name}"
+        elif local_files:
+            # toSource keeps the layout relative to the project root
+            local_files.insert(0, d.path)
+            file_name = _rel(d.path)
+            copy_src = "cp -r $src/* ."
+        else:
+            out.append(f"    src = {_nix_path(d.path)};")
+            copy_src = f"cp -r $src {file_name}"
+    elif local_files:
+        copy_src = "cp -r $src/* ."
+    if local_files and copy_src == "cp -r $src/* .":
+        unions = " ".join(_nix_path(f) for f in local_files)
+        out += [
+            "    src = defaultPkgs.lib.fileset.toSource {",
+            "      root = ./.;",
+            f"      fileset = defaultPkgs.lib.fileset.unions [ {unions} ];",
+            "    };",
+        ]
+
+    out += ["    buildInputs = defaultBuildInputs;", "    configurePhase = defaultConfigurePhase;", "    buildPhase = ''"]
+    if noop:
+        out.append(f'      echo "noop_build: {d.name} was not built" > {d.name}')
+    else:
+        if copy_src:
+            out.append(f"      {copy_src}")
+        if d.lang == "py":
+            out.append('      python -c "')
+            out += _py_program(d, deps, file_name)
+            out.append('"')
+        else:
+            out.append('      Rscript -e "')
+            out += [f"        {line}" for line in _r_program(d, deps, file_name)]
+            out[-1] += '"'
+    out += ["    '';", "  };", ""]
+    return "\n".join(out)
+
+
+def _pipeline_nix(derivs: Sequence[RxpDerivation], deps, noop, hashes) -> str:
+    names = " ".join(d.name for d in derivs)
+    body = "\n".join(_derivation_nix(d, deps[d.name], noop[d.name], hashes.get(d.name)) for d in derivs)
+    return (
+        _HEADER
+        + body
+        + "\n  # Generic default target that builds all derivations\n"
+        + "  allDerivations = defaultPkgs.symlinkJoin {\n"
+        + '    name = "all-derivations";\n'
+        + f"    paths = with builtins; attrValues {{ inherit {names}; }};\n"
+        + "  };\n\n"
+        + "in\n{\n"
+        + f"  inherit {names};\n"
+        + "  default = allDerivations;\n"
+        + "}\n"
+    )
+
+
+def _dag_json(derivs: Sequence[RxpDerivation], deps, noop) -> Dict[str, list]:
+    entries = []
+    for d in derivs:
+        if d.is_file:
+            decoder = {}
+        elif isinstance(d.decoder, dict):
+            decoder = dict(d.decoder)
+        else:
+            decoder = [d.decoder or ("pickle.load" if d.lang == "py" else "readRDS")]
+        entries.append(
+            {
+                "deriv_name": [d.name],
+                "depends": list(deps[d.name]),
+                "decoder": decoder,
+                "type": [d.type],
+                "noop_build": [bool(noop[d.name])],
+                "pipeline_group": [d.pipeline_group],
+                "pipeline_color": [d.pipeline_color] if d.pipeline_color else {},
+            }
+        )
+    return {"derivations": entries}
+
+
+# -- default libraries ----------------------------------------------------------
+
+
+def _inherit_blocks(text: str, scope_re: str) -> List[str]:
+    names: List[str] = []
+    for m in re.finditer(r"inherit\s*\(\s*" + scope_re + r"\s*\)([^;]*);", text):
+        names.extend(m.group(1).split())
+    return names
+
+
+def _default_libraries(default_nix: Path) -> Dict[str, List[str]]:
+    """Python modules and R packages declared for the pipeline in default.nix."""
+    text = re.sub(r"#[^\n]*", "", default_nix.read_text(encoding="utf-8"))
+    py_attrs = _inherit_blocks(text, r"pkgs\.python\d*Packages")
+    py = ["pickle"]
+    for attr in py_attrs:
+        if attr in _PY_SKIP:
+            continue
+        mod = _PY_IMPORT_NAMES.get(attr.lower(), attr.replace("-", "_"))
+        if mod not in py:
+            py.append(mod)
+
+    r: List[str] = []
+    m = re.search(r"rpkgs\s*=\s*builtins\.attrValues\s*\{([^}]*)\}", text)
+    if m:
+        r.extend(_inherit_blocks(m.group(1), r"pkgs\.rPackages"))
+    for name in re.findall(r"buildRPackage\s*\{\s*name\s*=\s*\"([^\"]+)\"", text):
+        if name not in r:
+            r.append(name)
+    return {"py": py, "r": sorted(set(r), key=r.index)}
+
+
+def _write_default_libraries(project: Path) -> None:
+    rixpress_dir = project / "_rixpress"
+    py_file = rixpress_dir / "default_libraries.py"
+    r_file = rixpress_dir / "default_libraries.R"
+    default_nix = project / "default.nix"
+    if default_nix.is_file():
+        libs = _default_libraries(default_nix)
+    elif py_file.exists() and r_file.exists():
+        return
+    else:
+        libs = {"py": ["pickle"], "r": []}
+    py_file.write_text("".join(f"import {m}\n" for m in libs["py"]), encoding="utf-8")
+    r_file.write_text("".join(f"library({p})\n" for p in libs["r"]), encoding="utf-8")
+
+
+# -- public API -------------------------------------------------------------------
+
+
+def rxp_populate(
+    derivations: Iterable[Union[RxpDerivation, Iterable[RxpDerivation]]],
+    project_path: Union[str, Path] = ".",
+    build: bool = False,
+    **build_kwargs,
+) -> Optional[RRunResult]:
+    """
+    Write pipeline.nix and _rixpress/dag.json for a list of derivations.
+
+    Args:
+        derivations: RxpDerivation values (lists returned by rxp_pipeline may be nested).
+        project_path: project root; pipeline.nix is written there (defaults to ".").
+        build: also build the pipeline with rxp_build.
+        **build_kwargs: passed to rxp_build (max_jobs, cores, timeout, ...).
+
+    Returns:
+        None, or the RRunResult of rxp_build when build=True.
+
+    Raises:
+        ValueError: on duplicate names, dependency cycles or invalid paths.
+    """
+    flat: List[RxpDerivation] = []
+    for item in derivations:
+        flat.extend([item] if isinstance(item, RxpDerivation) else list(item))
+    if not flat:
+        raise ValueError("A pipeline needs at least one derivation")
+    seen = set()
+    for d in flat:
+        if not isinstance(d, RxpDerivation):
+            raise TypeError(f"Expected RxpDerivation, got {type(d).__name__}")
+        if d.name in seen:
+            raise ValueError(f"Duplicate derivation name: {d.name}")
+        seen.add(d.name)
+
+    deps = _dependencies(flat)
+    noop = _noop_closure(flat, deps)
+    hashes = {
+        d.name: d.sha256 or _prefetch_url(d.path)
+        for d in flat
+        if d.is_file and _is_url(d.path) and not noop[d.name]
+    }
+
+    project = Path(project_path)
+    rixpress_dir = project / "_rixpress"
+    rixpress_dir.mkdir(parents=True, exist_ok=True)
+    _write_default_libraries(project)
+
+    (project / "pipeline.nix").write_text(_pipeline_nix(flat, deps, noop, hashes), encoding="utf-8")
+    dag_tmp = rixpress_dir / "dag.json.tmp"
+    dag_tmp.write_text(json.dumps(_dag_json(flat, deps, noop), indent=2) + "\n", encoding="utf-8")
+    os.replace(dag_tmp, rixpress_dir / "dag.json")
+    logger.info("Wrote %s and %s", project / "pipeline.nix", rixpress_dir / "dag.json")
+
+    if build:
+        return rxp_build(project_path=project, **build_kwargs)
+    return None
+
+
+def _outputs(path: str) -> Union[str, List[str]]:
+    try:
+        names = sorted(os.listdir(path)) if os.path.isdir(path) else []
+    except OSError:
+        names = []
+    return names[0] if len(names) == 1 else names
+
+
+def rxp_build(
+    project_path: Union[str, Path] = ".",
+    max_jobs: int = 1,
+    cores: int = 1,
+    timeout: Optional[int] = None,
+    nix_build_cmd: str = "nix-build",
+    nix_instantiate_cmd: str = "nix-instantiate",
+) -> RRunResult:
+    """
+    Build pipeline.nix with nix-build and write a build log to _rixpress.
+
+    Args:
+        project_path: project root containing pipeline.nix (defaults to ".").
+        max_jobs: passed to nix-build --max-jobs.
+        cores: passed to nix-build --cores.
+        timeout: optional timeout in seconds for nix-build.
+        nix_build_cmd: the nix-build binary to use.
+        nix_instantiate_cmd: the nix-instantiate binary used to compute output paths.
+
+    Returns:
+        An RRunResult with nix-build's returncode, stdout and stderr. The
+        build log is written even when some derivations fail to build.
+
+    Raises:
+        FileNotFoundError: if pipeline.nix or the Nix binaries are missing.
+        RuntimeError: if output paths cannot be evaluated.
+    """
+    import shutil
+    import subprocess
+    from datetime import datetime
+
+    for name, val in (("max_jobs", max_jobs), ("cores", cores)):
+        if not isinstance(val, int):
+            raise TypeError(f"{name} must be an int, got {type(val).__name__}")
+        if val < 0:
+            raise ValueError(f"{name} must be >= 0")
+
+    project = Path(project_path).resolve()
+    if not (project / "pipeline.nix").is_file():
+        raise FileNotFoundError(f"pipeline.nix not found in {project}. Run rxp_populate first.")
+    for exe in (nix_build_cmd, nix_instantiate_cmd):
+        if shutil.which(exe) is None:
+            raise FileNotFoundError(f"'{exe}' not found in PATH. Ensure Nix is installed.")
+
+    # Output paths of every attribute, without building anything
+    proc = subprocess.run(
+        [
+            nix_instantiate_cmd,
+            "--eval",
+            "--strict",
+            "--json",
+            "-E",
+            "builtins.mapAttrs (n: v: v.outPath) (import ./pipeline.nix)",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=str(project),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Could not evaluate pipeline.nix: {proc.stderr.strip()}")
+    out_paths: Dict[str, str] = json.loads(proc.stdout)
+
+    build = subprocess.run(
+        [
+            nix_build_cmd,
+            "pipeline.nix",
+            "--keep-going",
+            "--no-out-link",
+            "--max-jobs",
+            str(max_jobs),
+            "--cores",
+            str(cores),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=timeout,
+        cwd=str(project),
+    )
+
+    entries = []
+    for attr, path in out_paths.items():
+        name = "all-derivations" if attr == "default" else attr
+        ok = os.path.exists(path)
+        entries.append(
+            {"derivation": name, "build_success": ok, "path": path, "output": _outputs(path) if ok else []}
+        )
+    entries.sort(key=lambda e: e["derivation"])
+
+    all_path = out_paths.get("default", "")
+    store_hash = os.path.basename(all_path).split("-", 1)[0] or "nohash"
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_path = project / "_rixpress" / f"build_log_{stamp}_{store_hash}.json"
+    tmp = log_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(entries, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, log_path)
+    logger.info("Build log written to %s", log_path)
+
+    return RRunResult(returncode=build.returncode, stdout=build.stdout, stderr=build.stderr)
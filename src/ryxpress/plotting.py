@@ -1,16 +1,22 @@
 """
 Export pipeline DAG for CI and prepare node/edge data.
 
-This module provides two functions translated from the original R code:
+This module provides functions translated from the original R code:
 
-- get_nodes_edges(path_dag="_rixpress/dag.json")
+- get_nodes_edges(path_dag="_rixpress/dag.json", focus=None, hops=None, ...)
     Reads the pipeline DAG JSON produced by rxp_populate and returns a dict
-    with 'nodes' and 'edges' lists suitable for further processing.
+    with 'nodes' and 'edges' lists suitable for further processing,
+    optionally restricted to the neighbourhood of some nodes or to some
+    pipeline groups, with groups optionally collapsed into super-nodes.
 
 - rxp_dag_for_ci(nodes_and_edges=None, output_file="_rixpress/dag.dot")
     Uses python-igraph to build a graph from the nodes/edges and writes a DOT
     file to output_file. Raises ImportError if python-igraph is not available.
 
+- rxp_phart(dot_path=None, nodes_and_edges=None)
+    Prints the DAG (from a DOT file or from get_nodes_edges) as layered text
+    with ryxpress.layout.rxp_ascii_dag; no graph library is needed.
+
 Notes:
 - This implementation is defensive about JSON shape: it tolerates derivation
   entries where fields may be scalars or lists, and normalizes them.
@@ -22,8 +28,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -64,23 +71,8 @@ def _extract_scalar(value) -> Optional[str]:
     return str(value)
 
 
-def get_nodes_edges(path_dag: Union[str, Path] = "_rixpress/dag.json") -> Dict[str, List[Dict]]:
-    """
-    Read _rixpress/dag.json and return a dict with 'nodes' and 'edges'.
-
-    Args:
-        path_dag: path to the dag.json file (defaults to "_rixpress/dag.json").
-
-    Returns:
-        A dict with keys 'nodes' and 'edges':
-        - nodes: list of {"id": <name>, "label": <name>, "group": <type>,
-                          "pipeline_group": <group>, "pipeline_color": <color>}
-        - edges: list of {"from": <dep>, "to": <deriv>, "arrows": "to"}
-
-    Raises:
-        FileNotFoundError: if the JSON file is missing.
-        ValueError: if the JSON contents don't contain derivations.
-    """
+def _read_nodes_edges(path_dag: Union[str, Path]) -> Tuple[Dict[str, Dict], List[Dict[str, str]]]:
+    """All nodes (by id, in file order) and edges of a dag.json."""
     path = Path(path_dag)
     if not path.exists():
         raise FileNotFoundError("dag.json missing! Did you run 'rxp_populate()'?")
@@ -138,9 +130,146 @@ def get_nodes_edges(path_dag: Union[str, Path] = "_rixpress/dag.json") -> Dict[s
             # if dep_str not in nodes_seen:
             #     nodes_seen[dep_str] = {"id": dep_str, "label": dep_str, "group": None}
 
-    # Convert nodes_seen to a list preserving insertion order
-    nodes = list(nodes_seen.values())
+    return nodes_seen, edges
+
+
+def _neighbourhood(
+    seeds: Sequence[str], edges: List[Dict[str, str]], hops: Optional[int], direction: str
+) -> Set[str]:
+    """Node ids within hops edges of the seeds (breadth-first; unlimited when hops is None)."""
+    up: Dict[str, List[str]] = {}
+    down: Dict[str, List[str]] = {}
+    for e in edges:
+        down.setdefault(e["from"], []).append(e["to"])
+        up.setdefault(e["to"], []).append(e["from"])
+    maps = [m for d, m in (("upstream", up), ("downstream", down)) if direction in (d, "both")]
+
+    selected = set(seeds)
+    frontier = list(seeds)
+    depth = 0
+    while frontier and (hops is None or depth < hops):
+        nxt = []
+        for n in frontier:
+            for m in maps:
+                for other in m.get(n, ()):
+                    if other not in selected:
+                        selected.add(other)
+                        nxt.append(other)
+        frontier = nxt
+        depth += 1
+    return selected
+
+
+def _collapse(
+    nodes: List[Dict], edges: List[Dict[str, str]], groups: Optional[Set[str]]
+) -> Tuple[List[Dict], List[Dict[str, str]]]:
+    """Replace the nodes of each collapsed pipeline_group by one super-node."""
+    owner: Dict[str, str] = {}
+    supers: Dict[str, Dict] = {}
+    out_nodes: List[Dict] = []
+    for n in nodes:
+        g = n.get("pipeline_group") or "default"
+        if groups is not None and g not in groups:
+            out_nodes.append(n)
+            continue
+        sid = f"group:{g}"
+        owner[n["id"]] = sid
+        if sid not in supers:
+            supers[sid] = {
+                "id": sid,
+                "label": g,
+                "group": "pipeline_group",
+                "pipeline_group": g,
+                "pipeline_color": n.get("pipeline_color"),
+                "members": [],
+            }
+            out_nodes.append(supers[sid])
+        supers[sid]["members"].append(n["id"])
+    for sn in supers.values():
+        sn["label"] = f"{sn['label']} ({len(sn['members'])})"
+
+    seen: Set[Tuple[str, str]] = set()
+    out_edges: List[Dict[str, str]] = []
+    for e in edges:
+        a, b = owner.get(e["from"], e["from"]), owner.get(e["to"], e["to"])
+        if a == b or (a, b) in seen:
+            continue
+        seen.add((a, b))
+        out_edges.append({"from": a, "to": b, "arrows": "to"})
+    return out_nodes, out_edges
+
+
+def get_nodes_edges(
+    path_dag: Union[str, Path] = "_rixpress/dag.json",
+    focus: Union[None, str, Sequence[str]] = None,
+    hops: Optional[int] = None,
+    direction: str = "both",
+    groups: Union[None, str, Sequence[str]] = None,
+    collapse_groups: Union[bool, str, Sequence[str]] = False,
+) -> Dict[str, List[Dict]]:
+    """
+    Read _rixpress/dag.json and return a dict with 'nodes' and 'edges',
+    optionally restricted to a subgraph.
+
+    Args:
+        path_dag: path to the dag.json file (defaults to "_rixpress/dag.json").
+        focus: derivation name(s); keep only nodes within hops of them.
+        hops: maximum distance from focus (None: everything reachable).
+        direction: follow edges "upstream" (dependencies), "downstream"
+            (dependents) or "both" (default) from focus.
+        groups: pipeline_group name(s); keep only nodes in these groups.
+        collapse_groups: True to replace every pipeline_group by one node, or
+            group name(s) to collapse only those. Super-nodes have
+            id "group:<name>", group "pipeline_group" and a "members" list;
+            edges between them are deduplicated.
+
+    Returns:
+        A dict with keys 'nodes' and 'edges':
+        - nodes: list of {"id": <name>, "label": <name>, "group": <type>,
+                          "pipeline_group": <group>, "pipeline_color": <color>}
+        - edges: list of {"from": <dep>, "to": <deriv>, "arrows": "to"}
+        Only edges between selected nodes are kept when selecting. Selection
+        happens before any graph library is involved, so rendering the
+        result costs time proportional to the selection.
+
+    Raises:
+        FileNotFoundError: if the JSON file is missing.
+        ValueError: if the JSON contents don't contain derivations, a focus
+            node is unknown, direction is invalid or hops is negative.
+    """
+    if hops is not None and hops < 0:
+        raise ValueError(f"hops must be >= 0, got {hops}")
+    if isinstance(groups, str):
+        groups = [groups]
+    if isinstance(collapse_groups, str):
+        collapse_groups = [collapse_groups]
+    nodes_seen, edges = _read_nodes_edges(path_dag)
+    if focus is None and groups is None and not collapse_groups:
+        # Convert nodes_seen to a list preserving insertion order
+        return {"nodes": list(nodes_seen.values()), "edges": edges}
+
+    selected: Optional[Set[str]] = None
+    if focus is not None:
+        if direction not in ("both", "upstream", "downstream"):
+            raise ValueError(f"direction must be 'both', 'upstream' or 'downstream', got {direction!r}")
+        seeds = [focus] if isinstance(focus, str) else list(focus)
+        unknown = [f for f in seeds if f not in nodes_seen]
+        if unknown:
+            raise ValueError(f"Unknown derivation(s): {', '.join(unknown)}")
+        selected = _neighbourhood(seeds, edges, hops, direction)
+    if groups is not None:
+        wanted = set(groups)
+        in_groups = {i for i, n in nodes_seen.items() if n["pipeline_group"] in wanted}
+        selected = in_groups if selected is None else selected & in_groups
+
+    if selected is None:
+        nodes = list(nodes_seen.values())
+    else:
+        nodes = [n for i, n in nodes_seen.items() if i in selected]
+        edges = [e for e in edges if e["from"] in selected and e["to"] in selected]
 
+    if collapse_groups:
+        nodes, edges = _collapse(nodes, edges, None if collapse_groups is True else set(collapse_groups))
     return {"nodes": nodes, "edges": edges}
 
 
@@ -177,19 +306,17 @@ def rxp_dag_for_ci(nodes_and_edges: Optional[Dict[str, List[Dict]]] = None,
     out_path = Path(output_file)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Create the graph from edge tuples. TupleList will create vertices named by
-    # the unique labels encountered in the tuples.
-    # If there are no edges but there are nodes, create an empty graph and add vertices.
+    # Vertices: every node (a subgraph selection may leave some without
+    # edges), then any edge endpoint that is not a node, in the order met.
+    vertex_names = {n["id"]: None for n in nodes_and_edges.get("nodes", [])}
+    for a, b in edge_tuples:
+        vertex_names.setdefault(a, None)
+        vertex_names.setdefault(b, None)
+    g = igraph.Graph(directed=True)
+    if vertex_names:
+        g.add_vertices(list(vertex_names))
     if edge_tuples:
-        g = igraph.Graph.TupleList(edge_tuples, directed=True, vertex_name_attr="name")
-    else:
-        # no edges — create graph and add vertices from nodes list
-        nodes = nodes_and_edges.get("nodes", [])
-        vertex_names = [n["id"] for n in nodes]
-        g = igraph.Graph(directed=True)
-        if vertex_names:
-            g.add_vertices(vertex_names)
-            # set the 'name' attribute automatically when vertices are named
+        g.add_edges(edge_tuples)
 
     # Set vertex 'label' attribute from vertex name
     # g.vs['name'] should exist; copy to 'label'
@@ -215,75 +342,106 @@ def rxp_dag_for_ci(nodes_and_edges: Optional[Dict[str, List[Dict]]] = None,
     except Exception as e:
         raise RuntimeError(f"Failed to write DOT file to {out_path}: {e}") from e
 
-def rxp_phart(dot_path: str) -> None:
-    """
-    Render a DOT graph file as an ASCII diagram using phart, showing node labels.
-
-    This function reads a DOT file, parses it with pydot and networkx, and
-    renders it in ASCII using phart. Node labels from the DOT file are used
-    instead of numeric node IDs.
 
-    Dependencies:
-        - phart
-        - pydot
-        - networkx
+_DOT_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|->|--|[\[\]{};,=]|(?:[^\s\[\]{};,="-]|-(?![->]))+')
+_DOT_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+_DOT_PUNCTUATION = {"[", "]", "{", "}", ";", ",", "=", "->", "--"}
 
-    Make sure to add these dependencies to the execution environment to use this function.
 
-    Args:
-        dot_path: Path to the DOT file to render.
-
-    Raises:
-        FileNotFoundError: If the specified DOT file does not exist.
-        ValueError: If the DOT file is empty or cannot be parsed into a graph.
+def _read_dot(dot_path: Union[str, Path]) -> Dict[str, List[Dict]]:
     """
+    Parse the nodes (with their label attribute) and edges of a DOT file.
 
-    # Dependency checks
-    missing = []
-    try:
-        import phart
-        from phart import ASCIIRenderer
-    except ImportError:
-        missing.append("phart")
-    try:
-        import pydot
-    except ImportError:
-        missing.append("pydot")
-    try:
-        import networkx as nx
-    except ImportError:
-        missing.append("networkx")
-
-    if missing:
-        print(
-            f"The following dependencies are required but not installed: {', '.join(missing)}"
-        )
-        print(f"Please add them to the execution environment.")
-        return
-
-    # Check file exists
-    import os
-    if not os.path.exists(dot_path):
+    Covers what rxp_dag_for_ci and other simple DOT writers produce: node and
+    edge statements with attribute lists, edge chains and graph attributes.
+    """
+    path = Path(dot_path)
+    if not path.exists():
         raise FileNotFoundError(f"DOT file not found: {dot_path}")
-
-    # Load DOT file
-    with open(dot_path) as f:
-        dot_data = f.read()
-
-    if not dot_data.strip():
+    text = path.read_text(encoding="utf-8")
+    text = re.sub(r"/\*.*?\*/|//[^\n]*|^\s*#[^\n]*", "", text, flags=re.S | re.M)
+    if not text.strip():
         raise ValueError("DOT file is empty.")
 
-    # Parse DOT into networkx graph
-    graphs = pydot.graph_from_dot_data(dot_data)
-    if not graphs:
+    def unquote(tok: str) -> str:
+        if tok.startswith('"'):
+            return tok[1:-1].replace('\\"', '"')
+        return tok
+
+    tokens = _DOT_TOKEN.findall(text)
+    labels: Dict[str, str] = {}
+    edges: List[Tuple[str, str]] = []
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        if tok in _DOT_PUNCTUATION:
+            i += 1
+            continue
+        if tok in _DOT_KEYWORDS:
+            i += 1
+            if tok in ("node", "edge", "graph") and i < len(tokens) and tokens[i] == "[":
+                while i < len(tokens) and tokens[i] != "]":
+                    i += 1
+            continue
+        if i + 1 < len(tokens) and tokens[i + 1] == "=":
+            i += 3  # graph attribute such as rankdir=LR
+            continue
+        chain = [unquote(tok)]
+        i += 1
+        while i + 1 < len(tokens) and tokens[i] in ("->", "--"):
+            chain.append(unquote(tokens[i + 1]))
+            i += 2
+        attrs: Dict[str, str] = {}
+        if i < len(tokens) and tokens[i] == "[":
+            i += 1
+            while i < len(tokens) and tokens[i] != "]":
+                if i + 2 < len(tokens) and tokens[i + 1] == "=":
+                    attrs[unquote(tokens[i])] = unquote(tokens[i + 2])
+                    i += 3
+                else:
+                    i += 1
+        for name in chain:
+            labels.setdefault(name, name)
+        if len(chain) == 1 and "label" in attrs:
+            labels[chain[0]] = attrs["label"]
+        edges.extend(zip(chain, chain[1:]))
+
+    if not labels:
         raise ValueError("No valid graphs found in DOT file.")
+    return {
+        "nodes": [{"id": k, "label": v} for k, v in labels.items()],
+        "edges": [{"from": a, "to": b, "arrows": "to"} for a, b in edges],
+    }
+
+
+def rxp_phart(
+    dot_path: Union[None, str, Path] = None,
+    nodes_and_edges: Optional[Dict[str, List[Dict]]] = None,
+    color: Optional[bool] = None,
+    unicode: bool = True,
+) -> None:
+    """
+    Print the pipeline DAG as a layered ASCII/Unicode diagram, showing node labels.
+
+    The diagram is drawn by rxp_ascii_dag, so no graph library is needed
+    (earlier versions required phart, pydot and networkx). With a DOT file,
+    its nodes, labels and edges are read directly; otherwise the nodes and
+    edges of dag.json are drawn with labels coloured by pipeline_color.
 
-    G = nx.nx_pydot.from_pydot(graphs[0])
+    Args:
+        dot_path: Path to a DOT file to render (e.g. written by rxp_dag_for_ci).
+        nodes_and_edges: dict as returned by get_nodes_edges(), used when
+            dot_path is None. If both are None, get_nodes_edges() is called.
+        color: colour labels by pipeline_color (None: when the terminal
+            supports it). DOT files carry no pipeline colours.
+        unicode: use box-drawing characters; False draws with plain ASCII.
 
-    # Map node keys to labels for display
-    mapping = {node: data.get("label", str(node)) for node, data in G.nodes(data=True)}
-    H = nx.relabel_nodes(G, mapping)
+    Raises:
+        FileNotFoundError: If the specified DOT file does not exist.
+        ValueError: If the DOT file is empty or cannot be parsed into a graph.
+    """
+    from .layout import rxp_ascii_dag
 
-    # Render ASCII
-    renderer = ASCIIRenderer(H)
-    print(renderer.render())
+    if dot_path is not None:
+        nodes_and_edges = _read_dot(dot_path)
+    print(rxp_ascii_dag(nodes_and_edges, color=color, unicode=unicode))
@@ -0,0 +1,161 @@
+"""
+Warm the page cache (and optionally the artifact cache) ahead of the first read.
+
+Behavior:
+
+- rxp_prefetch resolves derivation outputs from a build log exactly like
+  rxp_read does, then touches every output file from a thread pool:
+  os.posix_fadvise(POSIX_FADV_WILLNEED) where available (the kernel reads
+  the file ahead asynchronously), otherwise a sequential read that discards
+  the data. Directory outputs are walked.
+- With decode=True, single-file outputs are also decoded (pickle, then rds2py)
+  into the in-process artifact cache used by rxp_read(cache=True), so the
+  first real read returns immediately.
+- With wait=False the work runs in the background and a
+  concurrent.futures.Future resolving to the summary is returned.
+- Files that cannot be opened or decoded are counted and skipped; nothing is
+  raised for them. Missing logs raise as rxp_inspect does.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from .instrument import bind
+from .read_load import _ARTIFACT_CACHE, _decode_path, _resolve_from_rows
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_prefetch"]
+
+
+_READ_CHUNK = 1 << 20
+
+
+def _files_under(path: str) -> List[str]:
+    if os.path.isdir(path):
+        out: List[str] = []
+        for root, _dirs, files in os.walk(path, followlinks=True):
+            out.extend(os.path.join(root, f) for f in files)
+        return out
+    return [path]
+
+
+def _warm_file(path: str) -> int:
+    """Ask the kernel to read path ahead (or read it); returns its size, -1 on error."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return -1
+    try:
+        size = os.fstat(fd).st_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            while os.read(fd, _READ_CHUNK):
+                pass
+        return size
+    except OSError:
+        return -1
+    finally:
+        os.close(fd)
+
+
+def _decode_into_cache(path: str) -> bool:
+    if path in _ARTIFACT_CACHE:
+        return True
+    ok, obj = _decode_path(path)
+    if ok:
+        _ARTIFACT_CACHE[path] = obj
+    return ok
+
+
+def _prefetch(targets: Dict[str, Union[str, List[str]]], decode: bool, workers: int) -> Dict[str, int]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    files: List[str] = []
+    seen = set()
+    for resolved in targets.values():
+        for p in resolved if isinstance(resolved, list) else [resolved]:
+            for f in _files_under(p):
+                if f not in seen:
+                    seen.add(f)
+                    files.append(f)
+    decodable = [r for r in targets.values() if isinstance(r, str) and os.path.isfile(r)] if decode else []
+
+    summary = {"derivations": len(targets), "files": 0, "bytes": 0, "failed": 0, "decoded": 0, "decode_failed": 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for size in pool.map(bind(_warm_file), files):
+            if size < 0:
+                summary["failed"] += 1
+            else:
+                summary["files"] += 1
+                summary["bytes"] += size
+        for ok in pool.map(bind(_decode_into_cache), decodable):
+            summary["decoded" if ok else "decode_failed"] += 1
+    return summary
+
+
+def rxp_prefetch(
+    names: Union[str, Sequence[str]] = "all",
+    project_path: Union[str, Path] = ".",
+    which_log: Optional[str] = None,
+    decode: bool = False,
+    workers: Optional[int] = None,
+    wait: bool = True,
+):
+    """
+    Prefetch derivation outputs into the OS page cache, optionally decoding them.
+
+    Args:
+        names: a derivation name, a list of names, or "all" for every
+            successfully built derivation in the log.
+        project_path: path to project root (defaults to ".").
+        which_log: optional regex to select a specific log file. If None, the most recent log is used.
+        decode: also decode single-file outputs into the in-process cache used
+            by rxp_read(cache=True).
+        workers: size of the thread pool (defaults to min(32, cpu_count + 4)).
+        wait: if False, run in the background and return a Future.
+
+    Returns:
+        A summary dict with counts of derivations, files, bytes, failed,
+        decoded and decode_failed; or, with wait=False, a Future resolving to it.
+        Names that do not resolve to a store path are ignored.
+
+    Raises:
+        FileNotFoundError: if _rixpress or its logs are missing.
+        ValueError: if which_log matches no log.
+    """
+    from .inspect_logs import rxp_inspect
+
+    rows = rxp_inspect(project_path=project_path, which_log=which_log) or []
+    if isinstance(names, str) and names == "all":
+        wanted = [
+            str(r.get("derivation"))
+            for r in rows
+            if r.get("build_success") and r.get("derivation") not in (None, "all-derivations")
+        ]
+    else:
+        wanted = [names] if isinstance(names, str) else list(names)
+
+    targets: Dict[str, Union[str, List[str]]] = {}
+    for name in wanted:
+        resolved = _resolve_from_rows(rows, name)
+        if resolved == name:
+            logger.debug("No outputs recorded for %s; skipping", name)
+            continue
+        targets[name] = resolved
+
+    n_workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    if wait:
+        return _prefetch(targets, decode, n_workers)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rxp-prefetch")
+    future = runner.submit(_prefetch, targets, decode, n_workers)
+    runner.shutdown(wait=False)
+    return future
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-import shutil
-import subprocess
-import tempfile
+import json
+import os
+import re
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+from .instrument import count, span, traced
 
-__all__ = ["RRunResult", "rxp_make"]
+
+__all__ = ["RRunResult", "RMakeHandle", "rxp_make", "rxp_make_async"]
+
+
+# Fingerprint of the last successful populate, relative to the project directory
+_MAKE_CACHE = Path("_rixpress") / ".rxp-make-cache.json"
+# Project files referenced from pipeline.nix (./functions.py, ./data/x.csv, ...)
+_NIX_PATH_RE = re.compile(r"(?<![\w/])\./[\w.+/-]+")
 
 
 @dataclass
@@ -16,12 +25,22 @@ class RRunResult:
     returncode: int
     stdout: str
     stderr: str
+    # None when everything ran; "populate" or "make" when cache=True skipped that step
+    skipped: Optional[str] = None
+    # Resource usage of the process tree, from os.wait4 (None when nothing ran)
+    max_rss_kb: Optional[int] = None
+    cpu_time: Optional[float] = None
+    # "timeout" or "cancelled" when the process group was killed
+    terminated: Optional[str] = None
 
     def __str__(self):
         return (
             f"RRunResult(\n"
             f"  returncode={self.returncode},\n"
-            f"  stdout=\n{self.stdout}\n"
+            + (f"  skipped={self.skipped!r},\n" if self.skipped else "")
+            + (f"  terminated={self.terminated!r},\n" if self.terminated else "")
+            + (f"  max_rss_kb={self.max_rss_kb}, cpu_time={self.cpu_time:.2f}s,\n" if self.cpu_time is not None else "")
+            + f"  stdout=\n{self.stdout}\n"
             f"  stderr=\n{self.stderr}\n"
             f")"
         )
@@ -31,7 +50,298 @@ class RRunResult:
         return self.__str__()
 
 
-def rxp_make(
+def _hash_path(h, path: Path) -> None:
+    """Feed a file (or every file under a directory) into h, in fixed-size chunks."""
+    files = [path]
+    if path.is_dir():
+        files = sorted(
+            Path(root) / f for root, _dirs, names in os.walk(path) for f in names
+        )
+    for f in files:
+        h.update(str(f).encode("utf-8", "surrogateescape") + b"\0")
+        try:
+            with open(f, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(chunk)
+        except OSError:
+            h.update(b"<missing>")
+        h.update(b"\0")
+
+
+def _skip_nix_path(rel: str) -> bool:
+    """
+    True for pipeline.nix paths that must not be hashed: the project root
+    (`root = ./.;` of a fileset, whose members are listed separately),
+    default.nix (hashed already) and the outputs rxp_make itself writes
+    under _rixpress/ and result*.
+    """
+    parts = Path(os.path.normpath(rel)).parts
+    if not parts or parts == (".",) or parts[0] in ("_rixpress", "default.nix"):
+        return True
+    return parts[0].startswith("result")
+
+
+def _make_fingerprint(script_path: Path, project: Path) -> Optional[str]:
+    """
+    Digest of everything rxp_populate reads or writes: the script, default.nix
+    (which also pins the rixpress version), the generated pipeline.nix and
+    dag.json, the default libraries and the project files pipeline.nix
+    references. None when the pipeline has not been populated yet.
+    """
+    import hashlib
+
+    from . import __version__
+
+    pipeline = project / "pipeline.nix"
+    rixpress_dir = project / "_rixpress"
+    if not pipeline.is_file() or not (rixpress_dir / "dag.json").is_file():
+        return None
+    h = hashlib.sha256(f"ryxpress {__version__}\0".encode())
+    for p in (
+        script_path,
+        project / "default.nix",
+        pipeline,
+        rixpress_dir / "dag.json",
+        rixpress_dir / "default_libraries.py",
+        rixpress_dir / "default_libraries.R",
+    ):
+        _hash_path(h, p)
+    text = pipeline.read_text(encoding="utf-8", errors="replace")
+    for rel in sorted(set(_NIX_PATH_RE.findall(text))):
+        if _skip_nix_path(rel):
+            continue
+        target = project / rel
+        if target.exists():
+            _hash_path(h, target)
+    return h.hexdigest()
+
+
+def _latest_log(project: Path) -> Optional[Path]:
+    logs = list((project / "_rixpress").glob("build_log*.json"))
+    return max(logs, key=lambda p: p.stat().st_mtime) if logs else None
+
+
+def _build_complete(project: Path, log_name: Optional[str]) -> bool:
+    """True if log_name is still the latest log and every derivation in it built and exists."""
+    latest = _latest_log(project)
+    if latest is None or latest.name != log_name:
+        return False
+    try:
+        rows = json.loads(latest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return bool(rows) and all(
+        r.get("build_success") and isinstance(r.get("path"), str) and os.path.exists(r["path"]) for r in rows
+    )
+
+
+def _read_make_cache(project: Path) -> Dict[str, str]:
+    try:
+        return json.loads((project / _MAKE_CACHE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_make_cache(project: Path, script_path: Path) -> None:
+    fingerprint = _make_fingerprint(script_path, project)
+    latest = _latest_log(project)
+    if fingerprint is None:
+        return
+    target = project / _MAKE_CACHE
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"fingerprint": fingerprint, "log": latest.name if latest else None}), encoding="utf-8"
+    )
+    os.replace(tmp, target)
+
+
+class RMakeHandle:
+    """
+    Handle on a pipeline run started by rxp_make_async.
+
+    Rscript runs in its own session, so the whole process tree (Rscript,
+    nix-build and anything they start) can be signalled as one process group.
+    """
+
+    def __init__(self, result: Optional[RRunResult] = None):
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._result = result
+        self._proc = None
+        self._reaped = False
+        self._terminated: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+        if result is not None:
+            self._done.set()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of Rscript (also its process group id); None if nothing was started."""
+        return self._proc.pid if self._proc is not None else None
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the run to finish; returns False if timeout elapsed first."""
+        return self._done.wait(timeout)
+
+    def result(self, timeout: Optional[float] = None) -> RRunResult:
+        """
+        The RRunResult of the run, waiting for it if needed.
+
+        Raises:
+            TimeoutError: if the run has not finished within timeout seconds.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("rxp_make is still running")
+        return self._result
+
+    def cancel(self, grace: float = 5.0) -> bool:
+        """
+        Stop the run: SIGTERM to the process group, then SIGKILL after grace seconds.
+
+        Returns:
+            False if the run had already finished, True otherwise.
+        """
+        if self._done.is_set():
+            return False
+        self._kill("cancelled", grace)
+        return True
+
+    # -- internals ---------------------------------------------------------
+
+    def _start(
+        self,
+        args: Sequence[str],
+        cwd: Path,
+        timeout: Optional[float],
+        limits: List[Tuple[int, Tuple[int, int]]],
+        on_exit: Callable[[int], None],
+        skipped: Optional[str],
+    ) -> "RMakeHandle":
+        import subprocess
+
+        preexec = None
+        if limits:
+            import resource
+
+            def preexec():
+                for which, pair in limits:
+                    resource.setrlimit(which, pair)
+
+        count("subprocesses")
+        self._proc = subprocess.Popen(
+            list(args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=str(cwd),
+            start_new_session=True,
+            preexec_fn=preexec,
+        )
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._kill, args=("timeout", 5.0))
+            self._timer.daemon = True
+            self._timer.start()
+        threading.Thread(
+            target=self._wait, args=(on_exit, skipped), name="rxp-make-wait", daemon=True
+        ).start()
+        return self
+
+    def _wait(self, on_exit: Callable[[int], None], skipped: Optional[str]) -> None:
+        import sys
+
+        proc = self._proc
+        chunks: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+
+        def drain(name: str) -> None:
+            chunks[name].append(getattr(proc, name).read())
+
+        readers = [threading.Thread(target=drain, args=(n,), daemon=True) for n in chunks]
+        for t in readers:
+            t.start()
+        # wait4 instead of Popen.wait: it also reports the tree's resource usage
+        _pid, status, usage = os.wait4(proc.pid, 0)
+        with self._lock:
+            self._reaped = True
+            proc.returncode = _exit_code(status)
+        if self._timer is not None:
+            self._timer.cancel()
+        for t in readers:
+            t.join()
+        for stream in (proc.stdout, proc.stderr):
+            stream.close()
+
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        try:
+            on_exit(proc.returncode)
+        finally:
+            self._result = RRunResult(
+                returncode=proc.returncode,
+                stdout="".join(chunks["stdout"]),
+                stderr="".join(chunks["stderr"]),
+                skipped=skipped,
+                max_rss_kb=max_rss,
+                cpu_time=usage.ru_utime + usage.ru_stime,
+                terminated=self._terminated,
+            )
+            self._done.set()
+
+    def _kill(self, reason: str, grace: float) -> None:
+        import signal
+
+        with self._lock:
+            if self._reaped or self._proc is None:
+                return
+            if self._terminated is None:
+                self._terminated = reason
+            pgid = self._proc.pid
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            return
+        if not self._done.wait(grace):
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+
+def _exit_code(status: int) -> int:
+    """os.waitstatus_to_exitcode (Python 3.9+) for older interpreters too."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _rlimits(
+    memory_limit: Optional[int], cpu_limit: Optional[int], open_files_limit: Optional[int]
+) -> List[Tuple[int, Tuple[int, int]]]:
+    """(resource, (soft, hard)) pairs to apply in the child; hard limits are never raised."""
+    wanted = [("RLIMIT_AS", memory_limit), ("RLIMIT_CPU", cpu_limit), ("RLIMIT_NOFILE", open_files_limit)]
+    if all(v is None for _, v in wanted):
+        return []
+    try:
+        import resource
+    except ImportError:
+        raise ValueError("Resource limits are not supported on this platform") from None
+    limits = []
+    for name, value in wanted:
+        if value is None:
+            continue
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"resource limits must be positive ints, got {value!r}")
+        which = getattr(resource, name)
+        _soft, hard = resource.getrlimit(which)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        limits.append((which, (value, value if hard == resource.RLIM_INFINITY else hard)))
+    return limits
+
+
+def rxp_make_async(
     script: Union[str, Path] = "gen-pipeline.R",
     verbose: int = 0,
     max_jobs: int = 1,
@@ -39,27 +349,24 @@ def rxp_make(
     rscript_cmd: str = "Rscript",
     timeout: Optional[int] = None,
     cwd: Optional[Union[str, Path]] = None,
-) -> RRunResult:
+    cache: bool = False,
+    memory_limit: Optional[int] = None,
+    cpu_limit: Optional[int] = None,
+    open_files_limit: Optional[int] = None,
+) -> RMakeHandle:
     """
-    Run the rixpress R pipeline (rxp_populate + rxp_make) by sourcing an R script.
+    Start rxp_make in the background and return a handle to wait for or cancel it.
 
-    Args:
-        script: Path or name of the R script to run (defaults to "gen-pipeline.R").
-            If a relative path is given and doesn't exist in the working directory,
-            this function will attempt to locate the script on PATH.
-        verbose: integer passed to rixpress::rxp_make(verbose = ...)
-        max_jobs: integer passed to rixpress::rxp_make(max_jobs = ...)
-        cores: integer passed to rixpress::rxp_make(cores = ...)
-        rscript_cmd: the Rscript binary to use (defaults to "Rscript")
-        timeout: optional timeout in seconds for the subprocess.run call
-        cwd: optional working directory to run Rscript in. If None, the directory
-            containing the provided script will be used. This is important because
-            pipeline.nix and related files are often imported with relative paths
-            (e.g. ./default.nix), so Rscript needs to be run where those files are reachable.
+    Takes the same arguments as rxp_make. Rscript is started in a new session;
+    on timeout or cancel() the whole process group is sent SIGTERM, then
+    SIGKILL, so no child processes are left behind.
 
     Returns:
-        An RRunResult containing returncode, stdout, stderr.
+        An RMakeHandle; handle.result() gives the RRunResult.
     """
+    import shutil
+    import tempfile
+
     # Validate integers
     for name, val in (("verbose", verbose), ("max_jobs", max_jobs), ("cores", cores)):
         if not isinstance(val, int):
@@ -90,12 +397,25 @@ def rxp_make(
         # default to the script's parent directory so relative imports (./default.nix) work
         run_cwd = script_path.parent
 
+    populate = True
+    if cache:
+        fingerprint = _make_fingerprint(script_path, run_cwd)
+        state = _read_make_cache(run_cwd)
+        if fingerprint is not None and state.get("fingerprint") == fingerprint:
+            if _build_complete(run_cwd, state.get("log")):
+                return RMakeHandle(
+                    RRunResult(returncode=0, stdout="Pipeline is up to date; nothing to do.\n", stderr="", skipped="make")
+                )
+            populate = False
+
     # Verify Rscript binary exists
     if shutil.which(rscript_cmd) is None:
         raise FileNotFoundError(
             f"Rscript binary '{rscript_cmd}' not found in PATH. Ensure R is installed or adjust rscript_cmd."
         )
 
+    limits = _rlimits(memory_limit, cpu_limit, open_files_limit)
+
     # Prepare wrapper R script that:
     #  - loads rixpress,
     #  - sources the user's script,
@@ -105,6 +425,7 @@ def rxp_make(
 suppressPackageStartupMessages(library(rixpress))
 
 script_path <- "{script_path.as_posix()}"
+run_populate <- {"TRUE" if populate else "FALSE"}
 
 if (!file.exists(script_path)) {{
   stop("Script not found: ", script_path)
@@ -113,12 +434,14 @@ if (!file.exists(script_path)) {{
 result_value <- NULL
 
 res <- tryCatch({{
-  # Source & evaluate the user's script and capture the returned value (if any)
-  result_value <- eval(parse(script_path))
-  # If the script returned a list (a pipeline), run rxp_populate on it
-  if (!is.null(result_value) && is.list(result_value)) {{
-    pipeline <- result_value
-    pipeline <- rixpress::rxp_populate(pipeline)
+  if (run_populate) {{
+    # Source & evaluate the user's script and capture the returned value (if any)
+    result_value <- eval(parse(script_path))
+    # If the script returned a list (a pipeline), run rxp_populate on it
+    if (!is.null(result_value) && is.list(result_value)) {{
+      pipeline <- result_value
+      pipeline <- rixpress::rxp_populate(pipeline)
+    }}
   }}
   # Finally, run rxp_make with the given integer parameters
   rixpress::rxp_make(
@@ -141,19 +464,109 @@ quit(status = 0)
         tf.write(wrapper)
         wrapper_path = Path(tf.name)
 
-    try:
-        # Run Rscript on the wrapper file using the desired working directory
-        proc = subprocess.run(
-            [rscript_cmd, str(wrapper_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=timeout,
-            cwd=str(run_cwd),
-        )
-        return RRunResult(returncode=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
-    finally:
+    def on_exit(returncode: int) -> None:
         try:
             wrapper_path.unlink()
         except Exception:
             pass
+        if cache and returncode == 0:
+            _write_make_cache(run_cwd, script_path)
+
+    try:
+        # Run Rscript on the wrapper file using the desired working directory
+        return RMakeHandle()._start(
+            [rscript_cmd, str(wrapper_path)],
+            run_cwd,
+            timeout,
+            limits,
+            on_exit,
+            None if populate else "populate",
+        )
+    except BaseException:
+        on_exit(1)
+        raise
+
+
+@traced("rxp_make")
+def rxp_make(
+    script: Union[str, Path] = "gen-pipeline.R",
+    verbose: int = 0,
+    max_jobs: int = 1,
+    cores: int = 1,
+    rscript_cmd: str = "Rscript",
+    timeout: Optional[int] = None,
+    cwd: Optional[Union[str, Path]] = None,
+    cache: bool = False,
+    memory_limit: Optional[int] = None,
+    cpu_limit: Optional[int] = None,
+    open_files_limit: Optional[int] = None,
+) -> RRunResult:
+    """
+    Run the rixpress R pipeline (rxp_populate + rxp_make) by sourcing an R script.
+
+    Args:
+        script: Path or name of the R script to run (defaults to "gen-pipeline.R").
+            If a relative path is given and doesn't exist in the working directory,
+            this function will attempt to locate the script on PATH.
+        verbose: integer passed to rixpress::rxp_make(verbose = ...)
+        max_jobs: integer passed to rixpress::rxp_make(max_jobs = ...)
+        cores: integer passed to rixpress::rxp_make(cores = ...)
+        rscript_cmd: the Rscript binary to use (defaults to "Rscript")
+        timeout: optional timeout in seconds; the whole process group
+            (Rscript, nix-build and their children) is killed when it expires.
+        cwd: optional working directory to run Rscript in. If None, the directory
+            containing the provided script will be used. This is important because
+            pipeline.nix and related files are often imported with relative paths
+            (e.g. ./default.nix), so Rscript needs to be run where those files are reachable.
+        cache: skip work a previous successful run already did. The fingerprint
+            covers the script, default.nix (and so the pinned rixpress version),
+            pipeline.nix, dag.json, the default libraries and the project files
+            pipeline.nix references. When it matches the last successful run the
+            script is not sourced and only rixpress::rxp_make runs; when, in
+            addition, the latest build log is the one that run produced and every
+            derivation in it succeeded and is still present, nothing runs at all
+            (not even Rscript). Files sourced by the script itself are not tracked.
+        memory_limit: optional address-space cap in bytes (RLIMIT_AS).
+        cpu_limit: optional CPU-time cap in seconds (RLIMIT_CPU).
+        open_files_limit: optional cap on open file descriptors (RLIMIT_NOFILE).
+            Limits apply to Rscript and every process it starts; builds run by
+            a Nix daemon (multi-user installs) are outside that tree.
+
+    Returns:
+        An RRunResult containing returncode, stdout, stderr, skipped
+        ("populate" or "make") when cache=True avoided a step, and the peak
+        RSS (max_rss_kb) and CPU time (cpu_time, seconds) of the process tree.
+
+    Raises:
+        subprocess.TimeoutExpired: if timeout expired (the process group has been killed).
+    """
+    handle = rxp_make_async(
+        script=script,
+        verbose=verbose,
+        max_jobs=max_jobs,
+        cores=cores,
+        rscript_cmd=rscript_cmd,
+        timeout=timeout,
+        cwd=cwd,
+        cache=cache,
+        memory_limit=memory_limit,
+        cpu_limit=cpu_limit,
+        open_files_limit=open_files_limit,
+    )
+    try:
+        with span("rscript") as s:
+            result = handle.result()
+            s.set("skipped", result.skipped)
+            s.set("max_rss_kb", result.max_rss_kb)
+            s.set("child_cpu_time", result.cpu_time)
+    except KeyboardInterrupt:
+        handle.cancel()
+        handle.wait()
+        raise
+    if result.terminated == "timeout":
+        import subprocess
+
+        raise subprocess.TimeoutExpired(
+            [rscript_cmd], timeout, output=result.stdout, stderr=result.stderr
+        )
+    return result
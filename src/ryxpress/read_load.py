@@ -4,7 +4,9 @@ Helpers to read/load artifacts from the Nix store for ryxpress.
 Behavior:
 
 - Resolve derivation outputs (single path or list of paths) via rxp_inspect
-  or by accepting a literal /nix/store/... path.
+  or by accepting a literal /nix/store/... path. A store directory holding
+  several files is resolved through the derivation that produced it (see
+  rxp_provenance) to the outputs its build log records.
 - When a single file is resolved:
   - Try to unpickle the file first (regardless of extension). If that succeeds,
     return the loaded object.
@@ -16,26 +18,53 @@ Behavior:
 """
 from __future__ import annotations
 
-import importlib
-import inspect
 import logging
 import os
-import pickle
 import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Sequence, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from .inspect_logs import rxp_inspect
+from .instrument import count, span, traced
+from .locking import LockTimeoutError, project_lock
 
 logger = logging.getLogger(__name__)
 
 
-__all__ = ["rxp_read", "rxp_load"]
+__all__ = ["rxp_read", "rxp_load", "clear_artifact_cache"]
 
 
 _PICKLE_EXT_RE = re.compile(r"\.(?:pickle|pkl)$", flags=re.IGNORECASE)
 _RDS_EXT_RE = re.compile(r"\.rds$", flags=re.IGNORECASE)
 
+# Decoded artifacts keyed by resolved file path. Store paths are immutable, so
+# entries never go stale; only rxp_read(cache=True) (and warmers) populate it.
+_ARTIFACT_CACHE: Dict[str, object] = {}
+
+# How long readers wait for a destructive rxp_gc on the same project to finish.
+_READ_LOCK_TIMEOUT = 60.0
+
+
+@contextmanager
+def _read_lock(project_path: Union[str, Path]):
+    """
+    Hold the project lock in shared mode while resolving and loading artifacts,
+    so a concurrent destructive rxp_gc cannot delete them mid-read. Readers never
+    block each other. If the lock cannot be obtained in time, reading proceeds
+    unlocked (consistent with the silent-failure policy of this module).
+    """
+    lock = project_lock(project_path, shared=True, timeout=_READ_LOCK_TIMEOUT)
+    try:
+        lock.acquire()
+    except LockTimeoutError:
+        logger.warning("Timed out waiting for rxp_gc on %s; reading without the project lock.", project_path)
+    except OSError:
+        logger.debug("Could not open project lock for %s", project_path, exc_info=True)
+    try:
+        yield
+    finally:
+        lock.release()
+
 
 def rxp_read_load_setup(
     derivation_name: str,
@@ -58,9 +87,12 @@ def rxp_read_load_setup(
                 files = [str(p) for p in sorted(store_path.iterdir())]
                 if len(files) == 1:
                     return files[0]
-                else:
-                    # Mirror R behaviour: return the directory path string if multiple files
-                    return derivation_name
+                # Several files: use the outputs recorded by the derivation that built it
+                outputs = _outputs_from_provenance(derivation_name, project_path)
+                if outputs:
+                    return outputs[0] if len(outputs) == 1 else outputs
+                # Mirror R behaviour: return the directory path string if multiple files
+                return derivation_name
             else:
                 # It's a file path -> return it
                 return str(store_path)
@@ -69,6 +101,8 @@ def rxp_read_load_setup(
             return derivation_name
 
     # Otherwise, attempt to inspect build log; but do not raise on failure.
+    from .inspect_logs import rxp_inspect
+
     try:
         rows = rxp_inspect(project_path=project_path, which_log=which_log)
     except Exception:
@@ -78,6 +112,11 @@ def rxp_read_load_setup(
     if not isinstance(rows, list):
         return derivation_name
 
+    return _resolve_from_rows(rows, derivation_name)
+
+
+def _resolve_from_rows(rows: List[dict], derivation_name: str) -> Union[str, List[str]]:
+    """Output path(s) of derivation_name according to build log rows (same return contract as above)."""
     # Find rows where the derivation column equals derivation_name.
     deriv_keys = ("derivation", "deriv", "name")
     path_key = "path"
@@ -143,6 +182,23 @@ def rxp_read_load_setup(
     return deduped
 
 
+def _outputs_from_provenance(store_path: str, project_path: Union[str, Path]) -> List[str]:
+    """Output files of the build that produced store_path, per the log index (silent on failure)."""
+    try:
+        from .log_index import rxp_provenance
+
+        prov = rxp_provenance(store_path, project_path=project_path)
+    except Exception:
+        logger.debug("Provenance lookup failed for %s", store_path, exc_info=True)
+        return []
+    if not prov or prov["file"] is not None:
+        return []
+    outs = prov["output"]
+    if not isinstance(outs, (list, tuple)):
+        outs = [] if outs is None else [outs]
+    return [os.path.join(store_path, str(o)) for o in outs if o is not None]
+
+
 def _is_pickle_path(path: str) -> bool:
     return bool(_PICKLE_EXT_RE.search(path))
 
@@ -158,6 +214,8 @@ def _load_rds_with_rds2py(path: str):
     Silent on failure (no warnings/errors).
     """
     try:
+        import importlib
+
         mod = importlib.import_module("rds2py")
     except Exception:
         return None
@@ -173,10 +231,12 @@ def _load_rds_with_rds2py(path: str):
         return None
 
 
+@traced("rxp_read")
 def rxp_read(
     derivation_name: str,
     which_log: Optional[str] = None,
     project_path: Union[str, Path] = ".",
+    cache: bool = False,
 ) -> Union[object, str, List[str]]:
     """
     Read the output of a derivation.
@@ -185,6 +245,9 @@ def rxp_read(
         derivation_name: name of the derivation to read.
         which_log: optional regex to select a specific log file. If None, the most recent log is used.
         project_path: path to project root (defaults to ".").
+        cache: if True, keep the decoded object in an in-process cache keyed by
+            its store path, so later reads of the same output skip decoding.
+            Cached objects are shared between callers; don't mutate them.
 
     Returns:
         The loaded object if successfully unpickled or parsed via rds2py.
@@ -192,9 +255,55 @@ def rxp_read(
 
     Note:
         All failures are silent; no exceptions/warnings are raised for "can't load" cases.
+        The project lock is held in shared mode while reading, so concurrent
+        readers proceed in parallel but a destructive rxp_gc waits for them.
+    """
+    with _read_lock(project_path):
+        return _read_resolved(derivation_name, which_log=which_log, project_path=project_path, cache=cache)
+
+
+def _decode_path(path: str) -> Tuple[bool, object]:
     """
+    Decode a single artifact file: pickle first, then rds2py (regardless of
+    extension). Returns (True, obj) on success, (False, None) otherwise.
+    """
+    # Try to unpickle first (regardless of extension)
+    import pickle
+
+    with span("deserialize", path=path) as s:
+        try:
+            with open(path, "rb") as fh:
+                obj = pickle.load(fh)
+                s.add("bytes_read", fh.tell())
+            s.set("format", "pickle")
+            return True, obj
+        except Exception:
+            # Silent failure — try the next loader
+            logger.debug("pickle load failed for %s; will try rds2py if available", path, exc_info=True)
+
+        # Try rds2py as a fallback (regardless of extension)
+        rds_obj = _load_rds_with_rds2py(path)
+        if rds_obj is not None:
+            s.set("format", "rds")
+            try:
+                s.add("bytes_read", os.path.getsize(path))
+            except OSError:
+                pass
+            return True, rds_obj
+        return False, None
+
+
+def _read_resolved(
+    derivation_name: str,
+    which_log: Optional[str],
+    project_path: Union[str, Path],
+    cache: bool = False,
+) -> Union[object, str, List[str]]:
     resolved = rxp_read_load_setup(derivation_name, which_log=which_log, project_path=project_path)
+    return _load_resolved(resolved, cache=cache)
+
 
+def _load_resolved(resolved: Union[str, List[str]], cache: bool = False) -> Union[object, str, List[str]]:
     # If multiple outputs (list), return them directly
     if isinstance(resolved, list):
         return resolved
@@ -206,22 +315,27 @@ def rxp_read(
     if os.path.isdir(path):
         return path
 
-    # Try to unpickle first (regardless of extension)
-    try:
-        with open(path, "rb") as fh:
-            obj = pickle.load(fh)
-        return obj
-    except Exception:
-        # Silent failure — try the next loader
-        logger.debug("pickle load failed for %s; will try rds2py if available", path, exc_info=True)
+    if path in _ARTIFACT_CACHE:
+        count("cache_hits")
+        return _ARTIFACT_CACHE[path]
+
+    count("cache_misses")
+    ok, obj = _decode_path(path)
+    if not ok:
+        # Nothing worked; return the path string (no errors/warnings)
+        return path
+    if cache:
+        _ARTIFACT_CACHE[path] = obj
+    return obj
 
-    # Try rds2py as a fallback (regardless of extension)
-    rds_obj = _load_rds_with_rds2py(path)
-    if rds_obj is not None:
-        return rds_obj
 
-    # Nothing worked; return the path string (no errors/warnings)
-    return path
+def clear_artifact_cache(paths: Optional[Sequence[str]] = None) -> None:
+    """Drop cached artifacts: all of them, or only those stored under the given paths."""
+    if paths is None:
+        _ARTIFACT_CACHE.clear()
+        return
+    for p in paths:
+        _ARTIFACT_CACHE.pop(str(p), None)
 
 
 def rxp_load(
@@ -245,34 +359,39 @@ def rxp_load(
         The loaded object is assigned to the caller's globals under `derivation_name`.
         All failures are silent.
     """
-    resolved = rxp_read_load_setup(derivation_name, which_log=which_log, project_path=project_path)
+    with _read_lock(project_path):
+        resolved = rxp_read_load_setup(derivation_name, which_log=which_log, project_path=project_path)
 
-    # If multiple outputs, return them
-    if isinstance(resolved, list):
-        return resolved
+        # If multiple outputs, return them
+        if isinstance(resolved, list):
+            return resolved
 
-    path = str(resolved)
+        path = str(resolved)
 
-    if os.path.isdir(path):
-        return path
+        if os.path.isdir(path):
+            return path
 
-    # Try to unpickle first
-    try:
-        with open(path, "rb") as fh:
-            obj = pickle.load(fh)
-    except Exception:
-        obj = None
-        logger.debug("pickle load failed for %s; will try rds2py if available", path, exc_info=True)
+        # Try to unpickle first
+        import pickle
+
+        try:
+            with open(path, "rb") as fh:
+                obj = pickle.load(fh)
+        except Exception:
+            obj = None
+            logger.debug("pickle load failed for %s; will try rds2py if available", path, exc_info=True)
 
-    # If pickle failed, try rds2py
-    if obj is None:
-        obj = _load_rds_with_rds2py(path)
+        # If pickle failed, try rds2py
+        if obj is None:
+            obj = _load_rds_with_rds2py(path)
 
-    if obj is None:
-        # Nothing we can load silently; return the path
-        return path
+        if obj is None:
+            # Nothing we can load silently; return the path
+            return path
 
     # Assign into caller's globals (best-effort); silence any assignment errors
+    import inspect
+
     try:
         caller_frame = inspect.currentframe().f_back
         if caller_frame is not None:
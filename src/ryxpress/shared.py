@@ -0,0 +1,385 @@
+"""
+Share decoded artifacts between worker processes through shared memory.
+
+Behavior:
+
+- ArtifactServer runs in one process (e.g. a gunicorn master before forking,
+  or a small sidecar process). It resolves derivation outputs like rxp_read,
+  decodes each store path once and publishes it in a named
+  multiprocessing.shared_memory segment. Segment names are derived from the
+  store path, so any process on the host can find them without a registry.
+- Objects are re-serialized with pickle protocol 5 and their large buffers
+  (numpy arrays, Arrow/pandas blocks, bytearrays, ...) are stored out-of-band.
+  Workers rebuild objects whose buffers point directly into the shared
+  segment instead of holding their own copy. Files that cannot be decoded
+  (e.g. RDS files without rds2py) are published as raw bytes.
+- Workers call rxp_read_shared(), which behaves like rxp_read but attaches to
+  the published segment when there is one. Objects loaded this way are
+  read-only views; don't mutate them. Attached segments stay mapped for the
+  life of the worker.
+- Segment names are predictable, so a segment is only trusted when it is
+  owned by the current user with mode 0600 (how ArtifactServer creates
+  them): workers fall back to rxp_read and servers raise PermissionError on
+  any other segment, instead of unpickling or replacing it.
+- Segments belong to the server: ArtifactServer.close() (or leaving its
+  'with' block) unlinks them. Workers never unlink. Each segment records
+  the pid of the server that created it; a server only replaces an existing
+  segment of the same name when that pid is no longer running (left over by
+  a server that died), and raises FileExistsError if its owner is alive.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .read_load import _decode_path, _load_resolved, _read_lock, rxp_read_load_setup
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["ArtifactServer", "SharedArtifact", "rxp_read_shared"]
+
+
+_MAGIC = b"RXPSHM02"
+# magic, kind, number of out-of-band buffers, pid of the owning server
+_HEADER = struct.Struct("<8sQQQ")
+# offset, length of one payload entry (the pickle stream or a buffer)
+_ENTRY = struct.Struct("<QQ")
+_KIND_RAW = 0
+_KIND_PICKLE = 1
+_ALIGN = 64
+
+# Segments attached by this process, keyed by store path. Kept open for the
+# life of the process because loaded objects may reference their memory.
+_ATTACHED: Dict[str, "SharedArtifact"] = {}
+
+
+def _segment_name(path: str) -> str:
+    """Shared memory name for a store path (short enough for macOS' 31-char limit)."""
+    return "rxp_" + hashlib.sha1(os.path.realpath(path).encode("utf-8")).hexdigest()[:24]
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return True  # unknown owner: assume it is alive
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _check_trusted(fd: int, name: str) -> None:
+    """Raise PermissionError unless the segment is owned by this user with mode 0600."""
+    if os.name != "posix":
+        return
+    st = os.fstat(fd)
+    if st.st_uid != os.getuid() or st.st_mode & 0o777 != 0o600:
+        raise PermissionError(
+            f"Shared memory segment {name} is not owned by this user with mode 0600 "
+            f"(uid {st.st_uid}, mode {oct(st.st_mode & 0o777)}); refusing to use it"
+        )
+
+
+def _owner_pid(name: str) -> Optional[int]:
+    """
+    Pid recorded in an existing segment, or None when it cannot be told.
+
+    Raises:
+        PermissionError: if the segment was not created by this user.
+    """
+    from multiprocessing import shared_memory
+
+    # Read the header without registering the segment with this process'
+    # resource tracker (attaching and unregistering would drop the
+    # registration of a segment this process created itself).
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+        try:
+            _check_trusted(shm._fd, name)
+            header = bytes(shm.buf[:_HEADER.size]) if shm.size >= _HEADER.size else None
+        finally:
+            shm.close()
+    except TypeError:
+        try:
+            import _posixshmem
+            import mmap
+        except ImportError:
+            return None
+        try:
+            fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, 0)
+        except FileNotFoundError:
+            return None
+        try:
+            _check_trusted(fd, name)
+            if os.fstat(fd).st_size < _HEADER.size:
+                return None
+            with mmap.mmap(fd, _HEADER.size, prot=mmap.PROT_READ) as m:
+                header = m[:_HEADER.size]
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        return None
+    if header is None:
+        return None
+    magic, _kind, _nbuf, owner = _HEADER.unpack(header)
+    return owner if magic == _MAGIC else None
+
+
+def _attach(name: str):
+    """
+    Attach to an existing segment without letting this process' resource tracker unlink it.
+
+    Raises:
+        PermissionError: if the segment was not created by this user (see _check_trusted).
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            logger.debug("Could not unregister %s from the resource tracker", name, exc_info=True)
+    try:
+        _check_trusted(shm._fd, name)
+    except PermissionError:
+        shm.close()
+        raise
+    return shm
+
+
+class SharedArtifact:
+    """
+    A published artifact attached from shared memory.
+
+    Attributes:
+        path: the store path the artifact was decoded from.
+        kind: "pickle" for decoded objects, "raw" for undecodable files.
+        view: read-only memoryview of the payload (the pickle stream or the raw file bytes).
+    """
+
+    def __init__(self, path: str, shm):
+        self.path = path
+        self._shm = shm
+        buf = shm.buf
+        size = buf.nbytes
+        if size < _HEADER.size:
+            raise ValueError(f"Shared memory segment for {path} is not a ryxpress artifact")
+        magic, kind, nbuf, _owner = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or kind not in (_KIND_RAW, _KIND_PICKLE) or _HEADER.size + (nbuf + 1) * _ENTRY.size > size:
+            raise ValueError(f"Shared memory segment for {path} is not a ryxpress artifact")
+        entries = [
+            _ENTRY.unpack_from(buf, _HEADER.size + i * _ENTRY.size) for i in range(nbuf + 1)
+        ]
+        if any(off + length > size for off, length in entries):
+            raise ValueError(f"Shared memory segment for {path} is malformed")
+        self.kind = "pickle" if kind == _KIND_PICKLE else "raw"
+        self._ro = buf.toreadonly()
+        self.view = self._ro[entries[0][0]:entries[0][0] + entries[0][1]]
+        self._buffers = [self._ro[off:off + length] for off, length in entries[1:]]
+
+    def load(self) -> object:
+        """Rebuild the object; out-of-band buffers are views into shared memory, not copies."""
+        if self.kind == "raw":
+            return self.path
+        import pickle
+
+        return pickle.loads(self.view, buffers=self._buffers)
+
+    def close(self) -> None:
+        """Unmap the segment. Fails with BufferError while loaded objects still reference it."""
+        self.view.release()
+        for b in self._buffers:
+            b.release()
+        self._buffers = []
+        self._ro.release()
+        self._shm.close()
+        _ATTACHED.pop(self.path, None)
+
+    def __repr__(self) -> str:
+        return f"SharedArtifact(path={self.path!r}, kind={self.kind!r}, size={self.view.nbytes})"
+
+
+class ArtifactServer:
+    """
+    Decode artifacts once and publish them in shared memory for other processes.
+
+    Args:
+        project_path: path to the project root (defaults to ".").
+        which_log: optional regex selecting the build log used to resolve names.
+
+    Example:
+        with ArtifactServer() as server:
+            server.publish_all()
+            ...  # start workers; they call rxp_read_shared("mtcars_head")
+    """
+
+    def __init__(self, project_path: Union[str, Path] = ".", which_log: Optional[str] = None):
+        self.project_path = project_path
+        self.which_log = which_log
+        self.segments: Dict[str, object] = {}
+
+    def publish(self, derivation_name: str) -> Optional[str]:
+        """
+        Publish the output of one derivation (or a literal store path).
+
+        Returns:
+            The shared memory segment name, or None when the derivation does not
+            resolve to a single file (directories and multi-output derivations
+            are left to rxp_read).
+
+        Raises:
+            FileExistsError: if another running server already published the
+                same store path.
+        """
+        with _read_lock(self.project_path):
+            path = rxp_read_load_setup(derivation_name, which_log=self.which_log, project_path=self.project_path)
+            if isinstance(path, list) or not os.path.isfile(path):
+                return None
+            name = _segment_name(path)
+            if name in self.segments:
+                return name
+            ok, obj = _decode_path(path)
+            if ok:
+                import pickle
+
+                buffers: List = []
+                payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+                chunks = [memoryview(payload)] + [b.raw() for b in buffers]
+                kind = _KIND_PICKLE
+            else:
+                with open(path, "rb") as fh:
+                    chunks = [memoryview(fh.read())]
+                kind = _KIND_RAW
+
+        self.segments[name] = self._write_segment(name, kind, chunks)
+        logger.debug("Published %s as %s (%d buffer(s))", path, name, len(chunks) - 1)
+        return name
+
+    def publish_all(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Publish several derivations (all successful ones from the build log by default).
+
+        Returns:
+            Mapping derivation name -> segment name (None when not publishable).
+        """
+        if names is None:
+            from .inspect_logs import rxp_inspect
+
+            rows = rxp_inspect(project_path=self.project_path, which_log=self.which_log) or []
+            names = [
+                str(r.get("derivation"))
+                for r in rows
+                if r.get("build_success") and r.get("derivation") not in (None, "all-derivations")
+            ]
+        return {n: self.publish(n) for n in names}
+
+    @staticmethod
+    def _write_segment(name: str, kind: int, chunks: List[memoryview]):
+        from multiprocessing import shared_memory
+
+        table = _HEADER.size + _ENTRY.size * len(chunks)
+        entries = []
+        offset = _align(table)
+        for c in chunks:
+            entries.append((offset, c.nbytes))
+            offset = _align(offset + c.nbytes)
+
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+        except FileExistsError:
+            owner = _owner_pid(name)
+            if owner is None or _pid_alive(owner):
+                who = f"server pid {owner}" if owner is not None else "an unknown owner"
+                raise FileExistsError(
+                    f"Shared memory segment {name} is already published by {who}; "
+                    "close that ArtifactServer first"
+                ) from None
+            # Left over by a server that died without cleaning up: replace it
+            logger.info("Replacing segment %s left by dead server pid %d", name, owner)
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+
+        buf = shm.buf
+        _HEADER.pack_into(buf, 0, _MAGIC, kind, len(chunks) - 1, os.getpid())
+        for i, ((off, length), c) in enumerate(zip(entries, chunks)):
+            _ENTRY.pack_into(buf, _HEADER.size + i * _ENTRY.size, off, length)
+            buf[off:off + length] = c.cast("B")
+        return shm
+
+    def close(self) -> None:
+        """Unlink every segment published by this server."""
+        for name, shm in list(self.segments.items()):
+            try:
+                shm.close()
+                shm.unlink()
+            except (OSError, BufferError):
+                logger.debug("Could not remove shared memory segment %s", name, exc_info=True)
+        self.segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def rxp_read_shared(
+    derivation_name: str,
+    which_log: Optional[str] = None,
+    project_path: Union[str, Path] = ".",
+) -> Union[object, str, List[str]]:
+    """
+    Read the output of a derivation from an ArtifactServer, falling back to rxp_read.
+
+    Args:
+        derivation_name: name of the derivation to read, or a /nix/store path.
+        which_log: optional regex to select a specific log file. If None, the most recent log is used.
+        project_path: path to project root (defaults to ".").
+
+    Returns:
+        The object rebuilt from shared memory when the output has been published
+        (large buffers are zero-copy, read-only views). Otherwise, exactly what
+        rxp_read would return.
+    """
+    with _read_lock(project_path):
+        path = rxp_read_load_setup(derivation_name, which_log=which_log, project_path=project_path)
+        if isinstance(path, str) and os.path.isfile(path):
+            art = _ATTACHED.get(path)
+            if art is None:
+                name = _segment_name(path)
+                try:
+                    shm = _attach(name)
+                except FileNotFoundError:
+                    shm = None
+                except PermissionError as e:
+                    logger.warning("%s; reading %s from the store instead", e, path)
+                    shm = None
+                try:
+                    art = SharedArtifact(path, shm) if shm is not None else None
+                except ValueError as e:
+                    logger.warning("%s; reading it from the store instead", e)
+                    shm.close()
+                    art = None
+                if art is not None:
+                    _ATTACHED[path] = art
+            if art is not None:
+                return art.load()
+        return _load_resolved(path)
@@ -18,11 +18,14 @@ Behavior:
 from __future__ import annotations
 
 import json
+import os
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+from .instrument import count, span, traced
+
 
 __all__ = ["rxp_trace"]
 
@@ -68,17 +71,40 @@ def _supports_color() -> bool:
     return sys.stdout.isatty()
 
 
+# Parsed dag.json files keyed by resolved path, validated against (mtime_ns, size).
+_DAG_CACHE: Dict[str, Tuple[Tuple[int, int], Tuple[List[dict], Dict[str, Optional[str]]]]] = {}
+
+
+def clear_dag_cache(path: Optional[Union[str, Path]] = None) -> None:
+    """Forget parsed DAGs: all of them, or only the one at path."""
+    if path is None:
+        _DAG_CACHE.clear()
+    else:
+        _DAG_CACHE.pop(os.path.realpath(path), None)
+
+
 def _load_dag(path: Union[str, Path]) -> Tuple[List[dict], Dict[str, Optional[str]]]:
     """
     Load dag.json and return (derivations_list, color_map).
-    
+
     color_map maps derivation name -> pipeline_color (or None).
+    The result is cached until the file's mtime or size changes; treat it as read-only.
     """
     p = Path(path)
-    if not p.exists():
+    try:
+        st = p.stat()
+    except OSError:
         raise FileNotFoundError(f"Could not find dag file at: {path}. By default rxp_trace expects '_rixpress/dag.json'. If your dag.json is elsewhere, pass dag_file explicitly.")
+    key = os.path.realpath(p)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _DAG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        count("cache_hits")
+        return cached[1]
+    count("cache_misses")
     try:
-        with p.open("r", encoding="utf-8") as fh:
+        with span("load_dag", file=str(p)) as s, p.open("r", encoding="utf-8") as fh:
+            s.add("bytes_read", st.st_size)
             dag = json.load(fh)
     except Exception as e:
         raise RuntimeError(f"Failed to parse dag.json: {e}")
@@ -98,6 +124,7 @@ def _load_dag(path: Union[str, Path]) -> Tuple[List[dict], Dict[str, Optional[st
                 pc = pc[0] if pc else None
             color_map[name] = pc if isinstance(pc, str) else None
     
+    _DAG_CACHE[key] = (stamp, (derivations, color_map))
     return derivations, color_map
 
 
@@ -223,6 +250,7 @@ def _marked_vec(target: str, graph: Dict[str, List[str]], transitive: bool) -> L
     return imm_unique + [f"{t}*" for t in trans_only]
 
 
+@traced("rxp_trace")
 def rxp_trace(
     name: Optional[str] = None,
     dag_file: Union[str, Path] = Path("_rixpress") / "dag.json",
@@ -0,0 +1,240 @@
+"""
+Verify the integrity of the store outputs referenced by a build log.
+
+Behavior:
+
+- rxp_verify selects a log like rxp_inspect and checks every derivation in it:
+    - existence: the store path and each recorded output must exist. This is
+      done first, without reading any data, so missing outputs are reported
+      even when hashing a large closure would take a while.
+    - content: every file under each store path is hashed on a thread pool
+      with streaming hashlib (fixed-size chunks, so memory stays bounded
+      whatever the file size; hashlib releases the GIL while hashing).
+      Digests are recorded in the project's log index the first time a file
+      is seen; a later digest that differs is reported as corrupted. Nix
+      store contents are immutable, so any difference means damage.
+    - optionally, nix_verify=True runs 'nix-store --verify-path' in batches;
+      a failing batch is re-checked path by path to name the bad paths.
+- Returns a report dict (see rxp_verify); never raises for missing or
+  corrupted outputs themselves.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["rxp_verify"]
+
+
+_CHUNK = 1 << 20
+_NIX_MODIFIED_RE = re.compile(r"path '(/nix/store/[^']+)' was modified")
+
+
+def _hash_file(path: str, algorithm: str) -> Tuple[str, int, Optional[str]]:
+    """(path, size, hexdigest) of a file, hashed in fixed-size chunks; digest None on error."""
+    import hashlib
+
+    try:
+        h = hashlib.new(algorithm)
+        size = 0
+        with open(path, "rb", buffering=0) as fh:
+            buf = bytearray(_CHUNK)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+                size += n
+        return path, size, h.hexdigest()
+    except OSError:
+        logger.debug("Could not hash %s", path, exc_info=True)
+        return path, -1, None
+
+
+def _walk_files(root: str) -> List[str]:
+    if not os.path.isdir(root):
+        return [root]
+    out: List[str] = []
+    for dirpath, _dirs, files in os.walk(root):
+        for f in files:
+            p = os.path.join(dirpath, f)
+            if not os.path.islink(p):
+                out.append(p)
+    return out
+
+
+def _nix_verify(paths: Sequence[str], batch_size: int, timeout: int) -> Tuple[List[str], Optional[str]]:
+    """
+    Run 'nix-store --verify-path' in batches. Returns (bad_paths, error) where
+    error is set when nix-store could not be run at all.
+    """
+    import shutil
+    import subprocess
+
+    nix_bin = shutil.which("nix-store")
+    if nix_bin is None:
+        return [], "nix-store not found on PATH"
+
+    def run(batch: Sequence[str]) -> Tuple[int, str]:
+        proc = subprocess.run(
+            [nix_bin, "--verify-path", *batch],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout,
+        )
+        return proc.returncode, (proc.stdout or "") + (proc.stderr or "")
+
+    bad: List[str] = []
+    try:
+        for i in range(0, len(paths), batch_size):
+            batch = list(paths[i:i + batch_size])
+            code, out = run(batch)
+            if code == 0:
+                continue
+            named = [p for p in _NIX_MODIFIED_RE.findall(out) if p in batch]
+            if named:
+                bad.extend(named)
+            else:
+                bad.extend(p for p in batch if run([p])[0] != 0)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return bad, str(e)
+    return bad, None
+
+
+def rxp_verify(
+    which_log: Optional[str] = None,
+    project_path: Union[str, Path] = ".",
+    algorithm: str = "sha256",
+    workers: Optional[int] = None,
+    nix_verify: bool = False,
+    batch_size: int = 64,
+    timeout_sec: int = 300,
+) -> Dict[str, Any]:
+    """
+    Check that the outputs referenced by a build log exist and are intact.
+
+    Args:
+        which_log: optional regex to select a specific log file. If None, the most recent log is used.
+        project_path: path to project root (defaults to ".").
+        algorithm: hashlib algorithm used for content digests.
+        workers: size of the hashing thread pool (defaults to min(32, cpu_count + 4)).
+        nix_verify: also run 'nix-store --verify-path' on the store paths.
+        batch_size: number of store paths per 'nix-store --verify-path' call.
+        timeout_sec: timeout for each nix-store call.
+
+    Returns:
+        A dict with keys:
+        - ok: True when nothing is missing or corrupted
+        - derivations, files, bytes: what was checked
+        - missing: list of {"derivation", "path"} for absent store paths/outputs
+        - corrupted: list of {"derivation", "path", "expected", "actual", "source"}
+          where source is "digest" (differs from the recorded digest) or "nix"
+        - unreadable: files that exist but could not be read
+        - recorded: number of digests recorded for the first time
+        - nix_error: why nix-store could not be run (only with nix_verify=True)
+
+    Raises:
+        FileNotFoundError: if _rixpress or its logs are missing.
+        ValueError: if which_log matches no log, or algorithm is unknown.
+    """
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .inspect_logs import rxp_inspect
+    from .log_index import _connect
+
+    if algorithm not in hashlib.algorithms_available:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}")
+
+    rows = rxp_inspect(project_path=project_path, which_log=which_log) or []
+
+    missing: List[Dict[str, str]] = []
+    owner: Dict[str, str] = {}  # file -> derivation
+    store_paths: List[str] = []
+    for r in rows:
+        deriv = str(r.get("derivation"))
+        base = r.get("path")
+        if not isinstance(base, str) or not base:
+            continue
+        if not os.path.exists(base):
+            missing.append({"derivation": deriv, "path": base})
+            continue
+        if deriv == "all-derivations":
+            continue  # a symlink farm over the other outputs
+        store_paths.append(base)
+        outs = r.get("output") or []
+        for o in outs if isinstance(outs, list) else [outs]:
+            p = str(o) if str(o).startswith("/") else os.path.join(base, str(o))
+            if not os.path.lexists(p):
+                missing.append({"derivation": deriv, "path": p})
+        for f in _walk_files(base):
+            owner.setdefault(f, deriv)
+
+    # Largest files first so the pool isn't left waiting on one big file at the end
+    files = sorted(owner, key=lambda f: -(os.path.getsize(f) if os.path.isfile(f) else 0))
+    n_workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        hashed = list(pool.map(lambda f: _hash_file(f, algorithm), files))
+
+    corrupted: List[Dict[str, Optional[str]]] = []
+    unreadable: List[str] = []
+    recorded = 0
+    total_bytes = 0
+    conn = _connect(Path(project_path) / "_rixpress")
+    try:
+        known = {}
+        for i in range(0, len(files), 500):
+            chunk = files[i:i + 500]
+            known.update(
+                conn.execute(
+                    f"SELECT path, digest FROM digests WHERE algorithm = ? AND path IN ({','.join('?' * len(chunk))})",
+                    [algorithm, *chunk],
+                ).fetchall()
+            )
+        new_rows = []
+        for path, size, digest in hashed:
+            if digest is None:
+                unreadable.append(path)
+                continue
+            total_bytes += size
+            expected = known.get(path)
+            if expected is None:
+                new_rows.append((path, algorithm, size, digest))
+            elif expected != digest:
+                corrupted.append(
+                    {"derivation": owner[path], "path": path, "expected": expected, "actual": digest, "source": "digest"}
+                )
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)", new_rows)
+        recorded = len(new_rows)
+    finally:
+        conn.close()
+
+    report: Dict[str, Any] = {
+        "ok": False,
+        "derivations": len(store_paths),
+        "files": len(files) - len(unreadable),
+        "bytes": total_bytes,
+        "missing": missing,
+        "corrupted": corrupted,
+        "unreadable": unreadable,
+        "recorded": recorded,
+    }
+
+    if nix_verify and store_paths:
+        by_path = {p: d for d, p in ((str(r.get("derivation")), r.get("path")) for r in rows)}
+        bad, error = _nix_verify(sorted(set(store_paths)), batch_size, timeout_sec)
+        report["nix_error"] = error
+        for p in bad:
+            corrupted.append({"derivation": by_path.get(p), "path": p, "expected": None, "actual": None, "source": "nix"})
+
+    report["ok"] = not missing and not corrupted and not unreadable
+    return report
@@ -0,0 +1,297 @@
+"""
+Watch a project's _rixpress directory and keep ryxpress caches hot.
+
+Behavior:
+
+- RxpWatcher runs a background thread that reacts to changes of
+  build_log_*.json and dag.json. On Linux it uses inotify (through ctypes,
+  no third-party package); elsewhere, or if inotify is unavailable, it falls
+  back to polling the directory every `interval` seconds.
+- On every change it:
+    - brings the build log index up to date (rxp_reindex), which also writes
+      the log's .rxpc sidecar, so the next rxp_inspect/rxp_history is warm;
+    - re-parses dag.json into the DAG cache when it changed;
+    - drops cached artifacts (rxp_read(cache=True)) whose files disappeared,
+      e.g. after rxp_gc removed a log and its outputs.
+- Subscribers registered with subscribe() receive one dict per change:
+  {"event": "log_added" | "log_modified" | "log_removed" | "dag_changed",
+   "filename": ..., "path": ..., "time": ...}. Callbacks run on the watcher
+  thread; exceptions they raise are logged and ignored.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = ["RxpWatcher"]
+
+
+_LOG_RE = re.compile(r"^build_log.*\.json$")
+_DAG_NAME = "dag.json"
+
+# inotify constants (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_NONBLOCK = 0x00000800
+_IN_CLOEXEC = 0x00080000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _watched(name: str) -> bool:
+    return name == _DAG_NAME or bool(_LOG_RE.search(name))
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around inotify for a single directory."""
+
+    def __init__(self, directory: Path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), _IN_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def read(self, timeout: float) -> Optional[List[str]]:
+        """Names touched within timeout; None once the watched directory is gone."""
+        import select
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names: List[str] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_DELETE_SELF:
+                return None
+            if raw:
+                names.append(os.fsdecode(raw))
+        return names
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class RxpWatcher:
+    """
+    Background watcher for a project's _rixpress directory.
+
+    Args:
+        project_path: path to project root (defaults to ".").
+        interval: polling period in seconds when inotify is not used; with
+            inotify it only bounds how long stop() may take.
+        use_inotify: force (True) or disable (False) inotify; None picks it
+            when available.
+
+    Example:
+        with RxpWatcher() as w:
+            w.subscribe(lambda ev: print(ev["event"], ev["filename"]))
+            ...
+    """
+
+    def __init__(
+        self,
+        project_path: Union[str, Path] = ".",
+        interval: float = 1.0,
+        use_inotify: Optional[bool] = None,
+    ):
+        self.project_path = Path(project_path)
+        self.rixpress_dir = self.project_path / "_rixpress"
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        self._subscribers: List[Callable[[Dict[str, object]], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+    def subscribe(self, callback: Callable[[Dict[str, object]], None]) -> Callable[[], None]:
+        """Register callback for change events; returns a function that unsubscribes it."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def start(self) -> "RxpWatcher":
+        if self._thread is not None:
+            return self
+        if not self.rixpress_dir.is_dir():
+            raise FileNotFoundError("_rixpress directory not found. Did you initialise the project?")
+        self._snapshot = self._scan()
+        inotify = None
+        if self.use_inotify is not False:
+            try:
+                inotify = _Inotify(self.rixpress_dir)
+            except (OSError, AttributeError):
+                if self.use_inotify:
+                    raise
+                logger.debug("inotify unavailable; polling %s", self.rixpress_dir, exc_info=True)
+        self.backend = "inotify" if inotify is not None else "poll"
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(inotify,), name="rxp-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.interval + 5)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # -- internals ---------------------------------------------------------
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snap: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.rixpress_dir) as it:
+                for entry in it:
+                    if _watched(entry.name):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snap[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return snap
+
+    def _run(self, inotify: Optional[_Inotify]) -> None:
+        try:
+            while not self._stop.is_set():
+                if inotify is None:
+                    if not self._stop.wait(self.interval):
+                        self._diff(self._scan())
+                    continue
+                names = inotify.read(min(self.interval, 0.5))
+                if names is None:
+                    logger.warning("%s was removed; watcher stopped", self.rixpress_dir)
+                    return
+                touched = {n for n in names if _watched(n)}
+                if touched:
+                    self._diff(self._stat(touched), touched)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _stat(self, names) -> Dict[str, Tuple[int, int]]:
+        """Current (size, mtime_ns) of the given names only; missing files are omitted."""
+        snap: Dict[str, Tuple[int, int]] = {}
+        for name in names:
+            try:
+                st = os.stat(self.rixpress_dir / name)
+            except OSError:
+                continue
+            snap[name] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def _diff(self, current: Dict[str, Tuple[int, int]], names=None) -> None:
+        """
+        Compare current stats with the previous ones and handle what changed.
+        With names (inotify), only those entries are compared; otherwise
+        current is a full directory scan.
+        """
+        old = self._snapshot
+        candidates = names if names is not None else (current.keys() | old.keys())
+        changes: List[Tuple[str, str]] = []
+        for name in sorted(candidates):
+            before, after = old.get(name), current.get(name)
+            if before == after:
+                continue
+            if after is None:
+                old.pop(name, None)
+            else:
+                old[name] = after
+            if name == _DAG_NAME:
+                changes.append(("dag_changed", name))
+            elif before is None:
+                changes.append(("log_added", name))
+            elif after is None:
+                changes.append(("log_removed", name))
+            else:
+                changes.append(("log_modified", name))
+        if changes:
+            self._refresh_caches(changes)
+            for event, name in changes:
+                self._publish(event, name)
+
+    def _refresh_caches(self, changes: List[Tuple[str, str]]) -> None:
+        events = {e for e, _ in changes}
+        if events & {"log_added", "log_modified", "log_removed"}:
+            try:
+                from .log_index import rxp_reindex
+
+                rxp_reindex(self.project_path)
+            except Exception:
+                logger.debug("Could not update the log index", exc_info=True)
+        if "dag_changed" in events:
+            from .tracing import _load_dag, clear_dag_cache
+
+            dag = self.rixpress_dir / _DAG_NAME
+            clear_dag_cache(dag)
+            try:
+                _load_dag(dag)
+            except Exception:
+                logger.debug("Could not re-read %s", dag, exc_info=True)
+        if "log_removed" in events:
+            from .read_load import _ARTIFACT_CACHE, clear_artifact_cache
+
+            clear_artifact_cache([p for p in list(_ARTIFACT_CACHE) if not os.path.exists(p)])
+
+    def _publish(self, event: str, name: str) -> None:
+        payload = {
+            "event": event,
+            "filename": name,
+            "path": str(self.rixpress_dir / name),
+            "time": time.time(),
+        }
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for cb in subscribers:
+            try:
+                cb(payload)
+            except Exception:
+                logger.debug("Watcher subscriber failed", exc_info=True)
@@ -0,0 +1,104 @@
+"""
+Tests for rxp_make_many with a fake Rscript.
+"""
+import os
+import time
+
+import pytest
+
+from ryxpress.batch import rxp_make_many
+
+
+def _fake_rscript(bindir, events):
+    exe = bindir / "Rscript"
+    exe.write_text(
+        "#!/bin/sh\n"
+        "cores=$(grep -o 'cores = [0-9]*' \"$1\" | grep -o '[0-9]*$')\n"
+        "jobs=$(grep -o 'max_jobs = [0-9]*' \"$1\" | grep -o '[0-9]*$')\n"
+        f"echo \"start $(basename $PWD) $cores $jobs\" >> {events}\n"
+        "sleep 0.2\n"
+        f"echo \"end $(basename $PWD) $cores $jobs\" >> {events}\n"
+        "[ \"$(basename $PWD)\" != p2 ]\n"
+    )
+    exe.chmod(0o755)
+
+
+def test_make_many_respects_budgets(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    events = tmp_path / "events"
+    _fake_rscript(bindir, events)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+
+    projects = []
+    for i in range(5):
+        p = tmp_path / f"p{i}"
+        p.mkdir()
+        (p / "gen-pipeline.R").write_text("list()\n")
+        projects.append(str(p))
+    projects.append(str(tmp_path / "missing"))
+
+    streamed = []
+    summary = rxp_make_many(
+        projects,
+        max_parallel=2,
+        cores_budget=4,
+        jobs_budget=2,
+        on_result=lambda project, res: streamed.append((project, time.monotonic())),
+    )
+
+    assert list(summary["results"]) == projects
+    assert summary["failed"] == [str(tmp_path / "p2"), str(tmp_path / "missing")]
+    assert summary["results"][str(tmp_path / "missing")].returncode == 127
+    assert len(streamed) == 6
+
+    running = {}
+    peak = 0
+    for line in events.read_text().splitlines():
+        kind, name, cores, jobs = line.split()
+        if kind == "start":
+            running[name] = (int(cores), int(jobs))
+            peak = max(peak, len(running))
+            assert sum(c for c, _ in running.values()) <= 4
+            assert sum(j for _, j in running.values()) <= 2
+        else:
+            running.pop(name)
+    assert peak == 2
+
+
+def test_make_many_cancels_running_projects_on_error(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    pids = tmp_path / "pids"
+    exe = bindir / "Rscript"
+    exe.write_text(
+        "#!/bin/sh\n"
+        f"echo $$ >> {pids}\n"
+        # p0 finishes once all three have started; the others would run on
+        "if [ \"$(basename $PWD)\" = p0 ]; then\n"
+        f"  while [ $(wc -l < {pids}) -lt 3 ]; do sleep 0.05; done; exit 0\n"
+        "fi\n"
+        "exec sleep 30\n"
+    )
+    exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+    projects = []
+    for i in range(3):
+        p = tmp_path / f"p{i}"
+        p.mkdir()
+        (p / "gen-pipeline.R").write_text("list()\n")
+        projects.append(str(p))
+
+    def fail(project, res):
+        raise RuntimeError("stop")
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="stop"):
+        rxp_make_many(projects, max_parallel=3, cores_budget=3, on_result=fail)
+    assert time.monotonic() - start < 15
+
+    started = [int(x) for x in pids.read_text().split()]
+    assert len(started) == 3
+    for pid in started:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
@@ -0,0 +1,139 @@
+"""
+Tests for the ryxpress command-line interface and its daemon mode.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from ryxpress import cli
+
+FIXTURES = Path(__file__).resolve().parent / "_rixpress"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    shutil.copytree(FIXTURES, tmp_path / "_rixpress")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("RYXPRESS_SOCKET", raising=False)
+    return tmp_path
+
+
+def test_logs_and_dag_print_json(project, capsys):
+    assert cli.main(["logs"]) == 0
+    logs = json.loads(capsys.readouterr().out)
+    assert logs and all("filename" in row for row in logs)
+
+    assert cli.main(["dag"]) == 0
+    dag = json.loads(capsys.readouterr().out)
+    assert {"nodes", "edges"} <= set(dag)
+
+    assert cli.main(["dag", "--ascii", "--no-color"]) == 0
+    drawing = capsys.readouterr().out
+    assert all(n["label"] in drawing for n in dag["nodes"])
+
+    assert cli.main(["dag", "--html", "dag.html"]) == 0
+    assert "HTML report written" in capsys.readouterr().out
+
+
+def test_errors_return_nonzero(project, capsys):
+    assert cli.main(["inspect", "--which-log", "no-such-log"]) == 1
+    assert "error" in capsys.readouterr().err
+
+
+def test_daemon_cache_hits_index_queries_and_is_bounded(project, monkeypatch):
+    daemon = cli._Daemon(str(project / "unused.sock"))
+    monkeypatch.setattr(daemon, "_watch", lambda rix: None)
+    request = {"argv": ["history", "mtcars_head"], "cwd": str(project)}
+    first = daemon.handle(request)
+    assert first["returncode"] == 0
+    # The SQLite index touches _rixpress (-wal/-shm files); that is not a change
+    for _ in range(3):
+        assert daemon.handle(request) is first
+    assert len(daemon.results) == 1
+
+    log = next((project / "_rixpress").glob("build_log*.json"))
+    shutil.copy(log, project / "_rixpress" / "build_log_29990101_000000_new.json")
+    assert daemon.handle(request) is not first
+
+    daemon.max_results = 2
+    for argv in (["logs"], ["inspect"], ["history", "mtcars_head"]):
+        daemon.handle({"argv": argv, "cwd": str(project)})
+    assert [k[0] for k in daemon.results] == [("inspect",), ("history", "mtcars_head")]
+
+
+def test_daemon_reruns_dag_commands_that_write_files(project, monkeypatch):
+    daemon = cli._Daemon(str(project / "unused.sock"))
+    monkeypatch.setattr(daemon, "_watch", lambda rix: None)
+    report = project / "dag.html"
+    for argv in (["dag", "--html", str(report)], ["dag", "--htm=" + str(report)]):
+        assert daemon.handle({"argv": argv, "cwd": str(project)})["returncode"] == 0
+        assert report.exists()
+        report.unlink()
+        assert daemon.handle({"argv": argv, "cwd": str(project)})["returncode"] == 0
+        assert report.exists()
+        report.unlink()
+    assert not daemon.results
+    daemon.handle({"argv": ["dag", "--focus", "mtcars_head"], "cwd": str(project)})
+    assert len(daemon.results) == 1
+
+
+def test_daemon_cache_follows_project_path_and_dag_file(project, monkeypatch):
+    other = project / "b"
+    shutil.copytree(FIXTURES, other / "_rixpress")
+    (project / "a").mkdir()
+    daemon = cli._Daemon(str(project / "unused.sock"))
+    watched = []
+    monkeypatch.setattr(daemon, "_watch", watched.append)
+
+    request = {"argv": ["logs", "--project-path", "../b"], "cwd": str(project / "a")}
+    first = daemon.handle(request)
+    assert first["returncode"] == 0
+    assert daemon.handle(request) is first
+    assert watched[0] == str(other / "_rixpress")
+
+    log = next((other / "_rixpress").glob("build_log*.json"))
+    shutil.copy(log, other / "_rixpress" / "build_log_29990101_000000_new.json")
+    second = daemon.handle(request)
+    assert second is not first and "29990101" in second["stdout"]
+
+    dag = {"argv": ["dag", "--dag-file", "b/_rixpress/dag.json"], "cwd": str(project)}
+    assert daemon.handle(dag)["returncode"] == 0
+    assert daemon.handle(dag) is daemon.handle(dag)
+    shutil.copy(other / "_rixpress" / "dag.json", project / "elsewhere.json")
+    elsewhere = {"argv": ["dag", "--dag-file", "elsewhere.json"], "cwd": str(project)}
+    assert daemon.handle(elsewhere)["returncode"] == 0
+    assert all(k[0] != tuple(elsewhere["argv"]) for k in daemon.results)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or sys.platform == "win32", reason="needs Unix sockets")
+def test_daemon_serves_forwarded_calls(project, tmp_path, capsys, monkeypatch):
+    sock = str(tmp_path / "rxp.sock")
+    env = dict(os.environ, PYTHONPATH=str(SRC) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "ryxpress", "daemon", "--socket", sock],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(sock) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert os.path.exists(sock)
+
+        local = cli.main(["logs"])
+        expected = capsys.readouterr().out
+
+        monkeypatch.setenv("RYXPRESS_SOCKET", sock)
+        assert cli.main(["logs"]) == local == 0
+        assert capsys.readouterr().out == expected
+        assert cli.main(["daemon", "--stop", "--socket", sock]) == 0
+        proc.wait(timeout=10)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
@@ -0,0 +1,137 @@
+"""
+Tests for rxp_copy using a fake store laid out under tmp_path.
+"""
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from ryxpress.copy_artifacts import rxp_copy
+
+
+def _make_store(root: Path):
+    """Create two fake derivation outputs and a symlinkJoin-like all-derivations."""
+    store = root / "store"
+    a = store / "aaaa-mtcars_pl"
+    (a / "sub").mkdir(parents=True)
+    (a / "mtcars_pl").write_bytes(b"pickle-bytes")
+    (a / "sub" / "nested.txt").write_text("nested")
+    b = store / "bbbb-mtcars_head"
+    b.mkdir(parents=True)
+    (b / "mtcars_head").write_text("head")
+    all_d = store / "cccc-all-derivations"
+    all_d.mkdir()
+    (all_d / "mtcars_pl").symlink_to(a / "mtcars_pl")
+    (all_d / "sub").symlink_to(a / "sub")
+    (all_d / "mtcars_head").symlink_to(b / "mtcars_head")
+    for p in (a / "mtcars_pl", a / "sub" / "nested.txt", b / "mtcars_head"):
+        p.chmod(0o444)
+    return {"mtcars_pl": a, "mtcars_head": b, "all-derivations": all_d}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    outputs = _make_store(tmp_path)
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    log = [
+        {"derivation": name, "build_success": True, "path": str(p), "output": []}
+        for name, p in outputs.items()
+    ]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_copy_single_derivation_sets_modes(project):
+    rxp_copy("mtcars_pl", project_path=project, workers=4)
+    out = project / "pipeline-output"
+    assert (out / "mtcars_pl").read_bytes() == b"pickle-bytes"
+    assert (out / "sub" / "nested.txt").read_text() == "nested"
+    assert stat.S_IMODE(os.stat(out / "mtcars_pl").st_mode) == 0o644
+    assert stat.S_IMODE(os.stat(out / "sub").st_mode) == 0o755
+    assert not (out / "mtcars_head").exists()
+
+
+def test_copy_all_derivations_follows_symlinks(project):
+    rxp_copy(project_path=project)
+    out = project / "pipeline-output"
+    assert not (out / "mtcars_pl").is_symlink()
+    assert (out / "mtcars_head").read_text() == "head"
+    assert (out / "sub" / "nested.txt").read_text() == "nested"
+
+
+def test_copy_hardlink_mode(project):
+    rxp_copy("mtcars_head", project_path=project, hardlink=True)
+    src = project / "store" / "bbbb-mtcars_head" / "mtcars_head"
+    dst = project / "pipeline-output" / "mtcars_head"
+    assert os.stat(dst).st_ino == os.stat(src).st_ino
+    # re-running replaces the link instead of writing through it
+    rxp_copy("mtcars_head", project_path=project)
+    assert os.stat(dst).st_ino != os.stat(src).st_ino
+    assert stat.S_IMODE(os.stat(src).st_mode) == 0o444
+
+
+def test_incremental_copy_skips_unchanged_and_removes_stale(project):
+    out = project / "pipeline-output"
+    rxp_copy("mtcars_pl", project_path=project)
+    assert (out / ".rxp-manifest.json").exists()
+    copied = out / "mtcars_pl"
+    before = os.stat(copied).st_ino
+
+    # unchanged source -> file left alone
+    rxp_copy("mtcars_pl", project_path=project, incremental=True)
+    assert os.stat(copied).st_ino == before
+
+    # file disappears upstream -> removed only when asked
+    store_file = project / "store" / "aaaa-mtcars_pl" / "sub" / "nested.txt"
+    store_file.unlink()
+    rxp_copy("mtcars_pl", project_path=project, incremental=True)
+    assert (out / "sub" / "nested.txt").exists()
+    rxp_copy("mtcars_pl", project_path=project, incremental=True, delete_removed=True)
+    assert not (out / "sub" / "nested.txt").exists()
+    assert copied.exists()
+
+
+def test_copy_list_with_upstream(project):
+    dag = {
+        "derivations": [
+            {"deriv_name": ["mtcars_pl"], "depends": []},
+            {"deriv_name": ["mtcars_head"], "depends": ["mtcars_pl"]},
+        ]
+    }
+    (project / "_rixpress" / "dag.json").write_text(json.dumps(dag))
+    rxp_copy(["mtcars_head"], project_path=project, include_upstream=True)
+    out = project / "pipeline-output"
+    assert (out / "mtcars_head").exists()
+    assert (out / "mtcars_pl").exists()
+    manifest = json.loads((out / ".rxp-manifest.json").read_text())["files"]
+    assert manifest["mtcars_pl"]["origin"] == "mtcars_pl"
+    assert manifest["mtcars_head"]["origin"] == "mtcars_head"
+
+    with pytest.raises(ValueError):
+        rxp_copy(["mtcars_head", "nope"], project_path=project)
+
+
+def test_copy_to_reproducible_archive(project):
+    import tarfile
+
+    first = project / "a.tar.gz"
+    second = project / "b.tar.gz"
+    rxp_copy(["mtcars_pl", "mtcars_head"], project_path=project, archive=first)
+    rxp_copy(["mtcars_pl", "mtcars_head"], project_path=project, archive=second)
+    assert first.read_bytes() == second.read_bytes()
+    assert not (project / "pipeline-output").exists()
+
+    with tarfile.open(first) as tar:
+        names = tar.getnames()
+        assert names == sorted(names)
+        assert {"mtcars_pl", "mtcars_head", "sub", "sub/nested.txt"} <= set(names)
+        member = tar.getmember("mtcars_pl")
+        assert member.mtime == 0 and member.mode == 0o644
+        assert tar.extractfile(member).read() == b"pickle-bytes"
+
+    with pytest.raises(ValueError):
+        rxp_copy("mtcars_pl", project_path=project, archive=project / "out.zip")
@@ -0,0 +1,66 @@
+"""
+Tests for the self-contained HTML DAG report.
+"""
+import json
+import re
+
+from ryxpress.dag_html import rxp_dag_html
+from ryxpress.plotting import get_nodes_edges
+
+
+def _project(tmp_path):
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    derivs = [
+        {"deriv_name": ["raw"], "depends": [], "type": ["rxp_py"], "pipeline_group": ["etl"], "pipeline_color": ["#E69F00"]},
+        {"deriv_name": ["clean"], "depends": ["raw"], "type": ["rxp_py"], "pipeline_group": ["etl"]},
+        {"deriv_name": ["model"], "depends": ["clean"], "type": ["rxp_r"], "pipeline_group": ["model"]},
+        {"deriv_name": ["report</script>"], "depends": ["raw", "model"], "type": ["rxp_qmd"], "pipeline_group": ["model"]},
+    ]
+    (rix / "dag.json").write_text(json.dumps({"derivations": derivs}))
+    log = [
+        {"derivation": "raw", "build_success": True, "path": "/nix/store/a-raw", "output": ["raw"], "duration": 1.5},
+        {"derivation": "clean", "build_success": True, "path": "/nix/store/b-clean", "output": ["clean"]},
+        {"derivation": "model", "build_success": False, "path": "/nix/store/c-model", "output": []},
+    ]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    return tmp_path
+
+
+def _embedded(page):
+    raw = re.search(r'<script id="rxp-data" type="application/json">(.*?)</script>', page, re.S).group(1)
+    return json.loads(raw)
+
+
+def test_html_embeds_layout_and_build_status(tmp_path):
+    proj = _project(tmp_path)
+    out = rxp_dag_html(tmp_path / "out" / "dag.html", project_path=proj, json_output=tmp_path / "dag.json")
+
+    page = out.read_text()
+    assert page.count("</script>") == 2 and "http" not in page.split("<script>")[1]
+    data = _embedded(page)
+    assert data == json.loads((tmp_path / "dag.json").read_text())
+    assert data["log"] == "build_log_20260101_000000_x.json"
+
+    nodes = {n["id"]: n for n in data["nodes"]}
+    assert [nodes[n]["status"] for n in ("raw", "clean", "model", "report</script>")] == [
+        "built", "built", "failed", "not built"
+    ]
+    assert nodes["raw"]["duration"] == 1.5 and nodes["raw"]["build"]["path"] == "/nix/store/a-raw"
+    assert nodes["raw"]["y"] < nodes["clean"]["y"] < nodes["model"]["y"] < nodes["report</script>"]["y"]
+
+    # raw -> report spans three layers: two bends between its end points
+    long_edge = next(e for e in data["edges"] if e["from"] == "raw" and e["to"] == "report</script>")
+    assert len(long_edge["points"]) == 8
+    assert all(0 <= n["x"] and n["x"] + n["w"] <= data["width"] for n in data["nodes"])
+
+
+def test_html_collapsed_groups_and_no_logs(tmp_path):
+    proj = _project(tmp_path)
+    collapsed = get_nodes_edges(proj / "_rixpress" / "dag.json", collapse_groups=True)
+    data = _embedded(rxp_dag_html(tmp_path / "g.html", collapsed, project_path=proj).read_text())
+    assert {n["id"]: n["status"] for n in data["nodes"]} == {"group:etl": "built", "group:model": "failed"}
+
+    (proj / "_rixpress" / "build_log_20260101_000000_x.json").unlink()
+    data = _embedded(rxp_dag_html(tmp_path / "n.html", project_path=proj).read_text())
+    assert data["log"] is None and {n["status"] for n in data["nodes"]} == {"not built"}
@@ -0,0 +1,62 @@
+"""
+Tests for rxp_du (no real Nix required).
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+from ryxpress import disk_usage
+from ryxpress.disk_usage import rxp_du
+
+
+@pytest.fixture
+def project(tmp_path):
+    store = tmp_path / "store"
+    a = store / "aaaa-data"
+    b = store / "bbbb-model"
+    a.mkdir(parents=True)
+    b.mkdir()
+    (a / "data").write_bytes(os.urandom(64 * 1024))
+    (b / "model").write_bytes(os.urandom(16 * 1024))
+    os.link(a / "data", b / "shared")  # as 'nix-store --optimise' would
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    old = [{"derivation": "data", "build_success": True, "path": str(a), "output": ["data"]}]
+    new = old + [{"derivation": "model", "build_success": True, "path": str(b), "output": ["model"]}]
+    (rix / "build_log_20260101_000000_a.json").write_text(json.dumps(old))
+    (rix / "build_log_20260102_000000_b.json").write_text(json.dumps(new))
+    return tmp_path
+
+
+def _size(p):
+    return os.lstat(p).st_blocks * 512
+
+
+def test_du_dedupes_inodes_and_reports_unique_bytes(project):
+    a, b = project / "store" / "aaaa-data", project / "store" / "bbbb-model"
+    report = rxp_du(project)
+    rows = {r["derivation"]: r for r in report["derivations"]}
+    assert rows["data"]["bytes"] == _size(a / "data")
+    assert rows["data"]["unique_bytes"] == 0  # hard-linked into bbbb-model
+    assert rows["model"]["bytes"] == _size(b / "model") + _size(a / "data")
+    assert rows["model"]["unique_bytes"] == _size(b / "model")
+    assert rows["data"]["logs"] == 2
+    assert report["totals"]["bytes"] == _size(a / "data") + _size(b / "model")
+
+    logs = {r["log"][:24]: r for r in report["logs"]}
+    assert logs["build_log_20260101_00000"]["unique_bytes"] == 0
+    assert logs["build_log_20260102_00000"]["unique_bytes"] == _size(b / "model")
+    assert [r["derivation"] for r in report["derivations"]] == ["model", "data"]
+
+
+def test_du_uses_cache_and_notices_missing_paths(project, monkeypatch):
+    first = rxp_du(project)
+    monkeypatch.setattr(disk_usage, "_walk_sizes", lambda p: pytest.fail(f"walked {p}") if os.path.exists(p) else None)
+    assert rxp_du(project) == first
+
+    shutil.rmtree(project / "store" / "bbbb-model")
+    rows = {r["derivation"]: r for r in rxp_du(project)["derivations"]}
+    assert rows["model"]["present"] is False and rows["model"]["bytes"] == 0
+    assert rows["data"]["unique_bytes"] == rows["data"]["bytes"]
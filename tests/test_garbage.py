@@ -0,0 +1,59 @@
+"""
+Tests for rxp_gc metrics and structured events (no real Nix required).
+"""
+import json
+import os
+import shutil
+import stat
+from pathlib import Path
+
+import pytest
+
+from ryxpress.garbage import _parse_freed_bytes, rxp_gc
+
+HERE = Path(__file__).resolve().parent
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A copy of the test project plus a fake nix-store on PATH."""
+    proj = tmp_path / "proj"
+    shutil.copytree(HERE / "_rixpress", proj / "_rixpress")
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    fake = bindir / "nix-store"
+    fake.write_text("#!/bin/sh\necho '2 store paths deleted, 1.50 MiB freed'\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+    return proj
+
+
+def test_parse_freed_bytes():
+    assert _parse_freed_bytes("2 store paths deleted, 1.50 MiB freed") == int(1.5 * 1024 ** 2)
+    assert _parse_freed_bytes("nothing here") == 0
+
+
+def test_gc_dry_run_reports_metrics_and_events(project, tmp_path):
+    events = []
+    events_file = tmp_path / "events.jsonl"
+    summary = rxp_gc(
+        project_path=project,
+        keep_since="2100-01-01",
+        dry_run=True,
+        ask=False,
+        quiet=True,
+        on_event=events.append,
+        events_file=events_file,
+    )
+    metrics = summary["metrics"]
+    assert set(metrics["phase_durations"]) >= {"list", "inspect", "root", "delete", "log_cleanup"}
+    assert metrics["bytes_freed"] == 0
+    assert events[-1]["event"] == "summary"
+    assert any(e["event"] == "phase" and e["phase"] == "inspect" for e in events)
+    lines = [json.loads(l) for l in events_file.read_text().splitlines()]
+    assert [e["event"] for e in lines] == [e["event"] for e in events]
+
+
+def test_full_gc_counts_freed_bytes(project):
+    summary = rxp_gc(project_path=project, dry_run=False, ask=False, quiet=True)
+    assert summary["metrics"]["bytes_freed"] == int(1.5 * 1024 ** 2)
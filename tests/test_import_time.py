@@ -0,0 +1,99 @@
+"""
+Import-time budget and lazy-import audit for the ryxpress modules.
+
+Each module is imported in a fresh interpreter (python -X importtime) so the
+measurement is not affected by whatever pytest already imported. The budget
+can be relaxed on slow machines with RYXPRESS_IMPORT_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+MODULES = [
+    "ryxpress",
+    "ryxpress.inspect_logs",
+    "ryxpress.log_index",
+    "ryxpress.read_load",
+    "ryxpress.shared",
+    "ryxpress.prefetch",
+    "ryxpress.verify",
+    "ryxpress.disk_usage",
+    "ryxpress.copy_artifacts",
+    "ryxpress.garbage",
+    "ryxpress.locking",
+    "ryxpress.plotting",
+    "ryxpress.layout",
+    "ryxpress.dag_html",
+    "ryxpress.tracing",
+    "ryxpress.watch",
+    "ryxpress.instrument",
+    "ryxpress.init_proj",
+    "ryxpress.r_runner",
+    "ryxpress.batch",
+    "ryxpress.pipeline",
+    "ryxpress.cli",
+]
+
+# Modules that must only be imported when a code path actually needs them.
+HEAVY = {
+    "inspect", "pprint", "pickle", "subprocess", "signal", "tempfile", "shutil",
+    "tarfile", "gzip", "concurrent.futures", "sqlite3", "importlib.metadata",
+    "multiprocessing",
+    "rds2py", "igraph", "networkx", "pydot", "phart",
+}
+
+# Known, justified exceptions: dataclasses (RRunResult, RxpDerivation) imports inspect;
+# batch and pipeline import RRunResult.
+ALLOWED = {"ryxpress.r_runner": {"inspect"}, "ryxpress.pipeline": {"inspect"}, "ryxpress.batch": {"inspect"}}
+
+BUDGET_MS = float(os.environ.get("RYXPRESS_IMPORT_BUDGET_MS", "60"))
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    # Measure warm imports: with bytecode writing disabled every run would
+    # include compiling the module sources.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative_us(module: str) -> int:
+    """Cumulative import time of module in microseconds, from -X importtime."""
+    proc = _run(f"import {module}", "-X", "importtime")
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_budget(module):
+    # best of three to smooth out scheduler noise
+    best = min(_cumulative_us(module) for _ in range(3))
+    assert best / 1000.0 < BUDGET_MS, f"import {module} took {best / 1000.0:.1f} ms (budget {BUDGET_MS} ms)"
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_heavy_imports_are_deferred(module):
+    code = (
+        "import sys, json; before = set(sys.modules); "
+        f"import {module}; "
+        "print(json.dumps(sorted(set(sys.modules) - before)))"
+    )
+    loaded = set(json.loads(_run(code).stdout))
+    offending = (loaded & HEAVY) - ALLOWED.get(module, set())
+    assert not offending, f"import {module} eagerly loads {sorted(offending)}"
@@ -0,0 +1,77 @@
+"""
+Tests for build log inspection and its columnar sidecar.
+"""
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from ryxpress.inspect_logs import rxp_inspect, rxp_list_logs
+
+FIXTURES = Path(__file__).resolve().parent / "_rixpress"
+
+
+@pytest.fixture
+def project(tmp_path):
+    shutil.copytree(FIXTURES, tmp_path / "_rixpress")
+    return tmp_path
+
+
+def _latest(project):
+    return project / "_rixpress" / rxp_list_logs(project)[0]["filename"]
+
+
+def test_sidecar_is_written_and_reused(project):
+    log = _latest(project)
+    with log.open(encoding="utf-8") as fh:
+        expected = json.load(fh)
+
+    first = rxp_inspect(project)
+    sidecar = log.with_suffix(".rxpc")
+    assert first == expected
+    assert sidecar.exists()
+    assert all(not e["filename"].endswith(".rxpc") for e in rxp_list_logs(project))
+
+    # A fresh sidecar is served without touching the JSON content
+    st = os.stat(log)
+    log.write_text(" " * st.st_size)
+    os.utime(log, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert rxp_inspect(project) == expected
+
+
+def test_stale_or_corrupt_sidecar_falls_back_to_json(project):
+    log = _latest(project)
+    rxp_inspect(project)
+    rows = [{"derivation": "new", "build_success": False, "path": "/nix/store/x", "output": []}]
+    log.write_text(json.dumps(rows))
+    assert rxp_inspect(project) == rows
+
+    log.with_suffix(".rxpc").write_bytes(b"garbage")
+    assert rxp_inspect(project) == rows
+
+
+def test_columns_format_matches_rows(project):
+    rows = rxp_inspect(project)
+    cols = rxp_inspect(project, format="columns")
+    assert list(cols) == list(rows[0])
+    assert all(len(v) == len(rows) for v in cols.values())
+    assert [dict(zip(cols, vals)) for vals in zip(*cols.values())] == rows
+
+
+def test_columns_from_ragged_rows(project):
+    log = _latest(project)
+    log.write_text(json.dumps([{"derivation": "a", "build_success": True}, {"derivation": "b", "path": "/p"}]))
+    cols = rxp_inspect(project, format="columns")
+    assert cols == {"derivation": ["a", "b"], "build_success": [True, None], "path": [None, "/p"]}
+    assert not log.with_suffix(".rxpc").exists()
+
+
+def test_unknown_format_and_missing_backend(project, monkeypatch):
+    with pytest.raises(ValueError):
+        rxp_inspect(project, format="xml")
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    with pytest.raises(ImportError, match="pandas"):
+        rxp_inspect(project, format="pandas")
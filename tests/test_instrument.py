@@ -0,0 +1,103 @@
+"""
+Tests for the instrumentation layer (spans, counters and sinks).
+"""
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from ryxpress.instrument import bind, count, rxp_instrument, span
+from ryxpress.prefetch import rxp_prefetch
+from ryxpress.read_load import clear_artifact_cache, rxp_read
+from ryxpress.tracing import rxp_trace
+
+
+def _project(tmp_path):
+    out = tmp_path / "store" / "aaaa-model"
+    out.mkdir(parents=True)
+    (out / "model").write_bytes(pickle.dumps({"w": [1, 2, 3]}))
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    log = [{"derivation": "model", "build_success": True, "path": str(out), "output": ["model"]}]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    return tmp_path
+
+
+def test_disabled_spans_are_noops():
+    with span("anything") as s:
+        s.add("bytes_read", 10)
+        s.set("k", "v")
+
+
+def test_read_records_nested_spans_and_counters(tmp_path):
+    proj = _project(tmp_path)
+    clear_artifact_cache()
+    with rxp_instrument() as spans:
+        assert rxp_read("model", project_path=proj, cache=True) == {"w": [1, 2, 3]}
+        rxp_read("model", project_path=proj, cache=True)
+    clear_artifact_cache()
+
+    names = [s["name"] for s in spans]
+    assert names.count("rxp_read") == 2
+    assert {"rxp_inspect", "list_logs", "parse_json", "deserialize"} <= set(names)
+    first, second = [s for s in spans if s["name"] == "rxp_read"]
+    assert first["counters"]["cache_misses"] >= 1 and first["counters"]["bytes_read"] > 0
+    assert second["counters"]["cache_hits"] >= 2  # log sidecar and artifact cache
+    assert second["counters"]["bytes_read"] == 0
+    deserialize = next(s for s in spans if s["name"] == "deserialize")
+    assert deserialize["parent_id"] == first["span_id"] and deserialize["attributes"]["format"] == "pickle"
+    assert all(s["wall_time"] >= 0 and s["cpu_time"] >= 0 for s in spans)
+
+
+def test_jsonl_sink_and_errors(tmp_path):
+    out = tmp_path / "trace.jsonl"
+    with rxp_instrument(out):
+        try:
+            rxp_trace("x", dag_file=tmp_path / "missing.json")
+        except FileNotFoundError:
+            pass
+    (record,) = [json.loads(line) for line in out.read_text().splitlines()]
+    assert record["name"] == "rxp_trace" and record["error"].startswith("FileNotFoundError")
+
+
+def test_sink_hooks_and_failures_are_isolated():
+    class Sink:
+        def __init__(self):
+            self.events = []
+
+        def on_start(self, rec):
+            self.events.append(("start", rec["name"]))
+
+        def on_end(self, rec):
+            self.events.append(("end", rec["name"]))
+            raise RuntimeError("sink bug")
+
+    sink = Sink()
+    with rxp_instrument(sink):
+        with span("outer"):
+            with span("inner") as s:
+                s.add("subprocesses", 2)
+    assert sink.events == [("start", "outer"), ("start", "inner"), ("end", "inner"), ("end", "outer")]
+
+
+def test_pool_work_is_attributed_to_the_calling_span(tmp_path):
+    def work(n):
+        with span("task"):
+            count("bytes_read", n)
+
+    proj = _project(tmp_path)
+    clear_artifact_cache()
+    with rxp_instrument() as spans:
+        with span("outer"):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(bind(work), range(1, 101)))
+            rxp_prefetch("model", project_path=proj, decode=True, workers=2)
+    clear_artifact_cache()
+
+    outer = next(s for s in spans if s["name"] == "outer")
+    tasks = [s for s in spans if s["name"] == "task"]
+    assert len(tasks) == 100 and all(s["parent_id"] == outer["span_id"] for s in tasks)
+    deserialize = next(s for s in spans if s["name"] == "deserialize")
+    assert deserialize["parent_id"] == outer["span_id"]
+    children = [s for s in spans if s["parent_id"] == outer["span_id"]]
+    assert outer["counters"]["bytes_read"] == sum(s["counters"]["bytes_read"] for s in children)
+    assert outer["counters"]["bytes_read"] >= 5050 + deserialize["counters"]["bytes_read"] > 5050
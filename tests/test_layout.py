@@ -0,0 +1,90 @@
+"""
+Tests for the layered text renderer of the DAG.
+"""
+import random
+import time
+
+from ryxpress.layout import _crossings, _layered, rxp_ascii_dag
+from ryxpress.plotting import _read_dot, rxp_phart
+
+
+def _graph(edges, colors=None):
+    names = {n: None for e in edges for n in e}
+    nodes = [{"id": n, "label": n, "pipeline_color": (colors or {}).get(n)} for n in names]
+    return {"nodes": nodes, "edges": [{"from": a, "to": b, "arrows": "to"} for a, b in edges]}
+
+
+def test_layers_and_long_edges():
+    g = _graph([("mtcars", "head"), ("mtcars", "tail"), ("head", "model"), ("tail", "model"),
+                ("mtcars", "report"), ("model", "report")])
+    lines = rxp_ascii_dag(g, color=False).splitlines()
+    rows = {name: next(i for i, line in enumerate(lines) if name in line)
+            for name in ("mtcars", "head", "tail", "model", "report")}
+    assert rows["mtcars"] < rows["head"] == rows["tail"] < rows["model"] < rows["report"]
+    # mtcars -> report skips two layers: a vertical line runs past head/tail and model
+    assert "│" in lines[rows["model"]].replace("model", "")
+    assert lines[rows["report"] - 1].strip() == "▼"
+
+    ascii_only = rxp_ascii_dag(g, color=False, unicode=False)
+    assert all(ord(ch) < 128 for ch in ascii_only) and "v" in ascii_only
+
+
+def test_colour_cycles_and_dangling_endpoints():
+    g = _graph([("a", "b"), ("b", "c"), ("c", "a")], colors={"a": "#E69F00"})
+    g["edges"].append({"from": "b", "to": "outside"})
+    out = rxp_ascii_dag(g, color=True)
+    assert "\033[38;2;230;159;0ma\033[0m" in out
+    assert "outside" in out
+    assert rxp_ascii_dag({"nodes": [], "edges": []}) == ""
+
+
+def test_crossing_reduction_untangles():
+    # Sources in the wrong order for their children: one sweep removes the crossing
+    g = _graph([("a", "y"), ("b", "x")])
+    g["nodes"] = [g["nodes"][i] for i in (0, 2, 3, 1)]  # a, b, x, y
+    assert _crossings([[0, 1], [2, 3]], [[3], [2], [], []], [0, 1, 0, 1]) == 1
+    untouched = rxp_ascii_dag(g, color=False, max_iterations=0).splitlines()[4]
+    assert untouched.index("x") < untouched.index("y")
+    top, bottom = rxp_ascii_dag(g, color=False).splitlines()[::4]
+    assert top.index("a") < top.index("b") and bottom.index("y") < bottom.index("x")
+
+
+def test_thousand_nodes_render_quickly():
+    rng = random.Random(0)
+    edges = []
+    for i in range(1, 1000):
+        for _ in range(rng.randint(1, 3)):
+            edges.append((f"n{rng.randint(max(0, i - 50), i - 1)}", f"n{i}"))
+    g = _graph(edges)
+    start = time.perf_counter()
+    out = rxp_ascii_dag(g, color=False)
+    assert time.perf_counter() - start < 1.0
+    assert all(f"n{i}" in out for i in (0, 500, 999))
+
+
+def test_phart_reads_dot_without_graph_libraries(tmp_path, capsys):
+    dot = tmp_path / "dag.dot"
+    dot.write_text(
+        "/* Created by igraph */\n"
+        "digraph {\n"
+        "  0 [\n    label=mtcars\n  ];\n"
+        '  1 [\n    label="mtcars head"\n  ];\n'
+        "  0 -> 1;\n"
+        "}\n"
+    )
+    assert _read_dot(dot)["edges"] == [{"from": "0", "to": "1", "arrows": "to"}]
+    rxp_phart(str(dot), color=False)
+    out = capsys.readouterr().out
+    assert out.index("mtcars") < out.index("mtcars head") and "▼" in out
+
+
+def test_fan_out_and_fan_in_share_long_edge_lines():
+    chain = [(f"n{i}", f"n{i + 1}") for i in range(999)]
+    for extra in ([("n0", f"n{i}") for i in range(2, 1000)], [(f"n{i}", "n999") for i in range(998)]):
+        g = _graph(chain + extra)
+        start = time.perf_counter()
+        out = rxp_ascii_dag(g, color=False)
+        assert time.perf_counter() - start < 1.0
+        # one shared line beside the chain, not one line per edge
+        assert max(len(line) for line in out.splitlines()) < 10
+        assert len(_layered(g, 8).nodes) < 2000
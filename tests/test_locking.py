@@ -0,0 +1,26 @@
+"""
+Tests for the flock()-based project/store locks.
+"""
+import pytest
+
+from ryxpress.locking import LockTimeoutError, project_lock
+
+
+def test_shared_locks_coexist_and_exclusive_conflicts(tmp_path):
+    (tmp_path / "_rixpress").mkdir()
+    with project_lock(tmp_path, shared=True) as a, project_lock(tmp_path, shared=True) as b:
+        assert a.acquired and b.acquired
+        with pytest.raises(LockTimeoutError):
+            project_lock(tmp_path, shared=False, timeout=0.1).acquire()
+    # all shared holders released -> exclusive succeeds, and blocks readers
+    with project_lock(tmp_path, shared=False) as ex:
+        assert ex.acquired
+        with pytest.raises(LockTimeoutError):
+            project_lock(tmp_path, shared=True, timeout=0).acquire()
+
+
+def test_project_lock_is_noop_without_rixpress_dir(tmp_path):
+    lock = project_lock(tmp_path, shared=True)
+    assert lock.acquire() is False
+    lock.release()
+    assert not (tmp_path / "_rixpress").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for the cross-log query API (rxp_history, rxp_find, rxp_reindex).
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ryxpress.log_index import rxp_find, rxp_history, rxp_provenance, rxp_reindex
+
+FIXTURES = Path(__file__).resolve().parent / "_rixpress"
+
+
+@pytest.fixture
+def project(tmp_path):
+    shutil.copytree(FIXTURES, tmp_path / "_rixpress")
+    return tmp_path
+
+
+def _write_log(project, stamp, rows):
+    p = project / "_rixpress" / f"build_log_{stamp}_zzzz.json"
+    p.write_text(json.dumps(rows))
+    return p
+
+
+def test_history_matches_logs(project):
+    hist = rxp_history("mtcars_head", project_path=project)
+    assert hist
+    assert [h["build_time"] for h in hist] == sorted((h["build_time"] for h in hist), reverse=True)
+    assert hist[0]["log"].startswith("build_log_20260124_185536")
+    assert all(h["derivation"] == "mtcars_head" for h in hist)
+
+
+def test_incremental_updates_and_filters(project):
+    assert rxp_reindex(project)["added"] == len(list((project / "_rixpress").glob("build_log*.json")))
+    assert rxp_reindex(project)["added"] == 0
+
+    path = "/nix/store/" + "a" * 32 + "-mtcars_head"
+    log = _write_log(project, "20270101_120000", [
+        {"derivation": "mtcars_head", "build_success": True, "path": path, "output": ["mtcars_head"]},
+    ])
+    latest_ok = rxp_history("mtcars_head", project_path=project, build_success=True)[0]
+    assert latest_ok["path"] == path and latest_ok["output"] == ["mtcars_head"]
+    assert latest_ok["build_time"] == "2027-01-01T12:00:00"
+
+    assert rxp_find(path=path + "/mtcars_head", project_path=project)[0]["log"] == log.name
+    assert rxp_history("mtcars_head", project_path=project, since="2027-01-01", until="2027-01-01")[0]["path"] == path
+    assert not rxp_history("mtcars_head", project_path=project, since="2027-01-02")
+    assert {h["derivation"] for h in rxp_find(derivation="mtcars_*", project_path=project)} >= {"mtcars_head"}
+
+    os.unlink(log)
+    assert not rxp_find(path=path, project_path=project)
+
+
+def test_provenance_resolves_store_paths(project):
+    from ryxpress.log_index import _derivations_for_paths
+    from ryxpress.read_load import _outputs_from_provenance
+
+    path = "/nix/store/" + "b" * 32 + "-mtcars_tail"
+    log = _write_log(project, "20270101_120000", [
+        {"derivation": "mtcars_tail", "build_success": True, "path": path, "output": ["mtcars_tail"]},
+    ])
+    prov = rxp_provenance(path + "/mtcars_tail", project_path=project)
+    assert prov["derivation"] == "mtcars_tail" and prov["log"] == log.name
+    assert prov["store_path"] == path and prov["file"] == "mtcars_tail"
+    assert rxp_provenance("/nix/store/" + "c" * 32 + "-unknown", project_path=project) is None
+    assert _outputs_from_provenance(path, project) == [path + "/mtcars_tail"]
+    assert _derivations_for_paths(project, [path, "/tmp/x"]) == {path: "mtcars_tail"}
@@ -0,0 +1,121 @@
+"""
+Tests for the Python pipeline API (stub nix-build / nix-instantiate, no real Nix).
+"""
+import json
+import os
+import shutil
+import stat
+from pathlib import Path
+
+import pytest
+
+from ryxpress.pipeline import rxp_build, rxp_pipeline, rxp_populate, rxp_py, rxp_py_file, rxp_r
+
+HERE = Path(__file__).parent
+
+
+def _pipeline():
+    return [
+        rxp_py_file(
+            "mtcars_pl",
+            "https://example.org/mtcars.csv",
+            "lambda x: polars.read_csv(x, separator='|')",
+            sha256="1m8fwb871n6wqs62iis6kjaj12ymg586vq3cbny5i75bk0nddm2z",
+        ),
+        rxp_py(
+            "mtcars_pl_am",
+            "mtcars_pl.filter(polars.col('am') == 1)",
+            user_functions="functions.py",
+            encoder="serialize_to_json",
+        ),
+        rxp_r("mtcars_head", "my_head(mtcars_pl_am)", user_functions="functions.R", decoder="jsonlite::fromJSON"),
+        rxp_r("mtcars_mpg", "dplyr::select(mtcars_head, mpg)"),
+    ]
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name in ("default.nix", "functions.py", "functions.R"):
+        shutil.copy(HERE / name, tmp_path / name)
+    return tmp_path
+
+
+def test_populate_matches_rixpress_output(project):
+    rxp_populate(_pipeline(), project_path=project)
+
+    dag = json.loads((project / "_rixpress" / "dag.json").read_text())
+    assert dag == json.loads((HERE / "_rixpress" / "dag.json").read_text())
+
+    nix = (project / "pipeline.nix").read_text()
+    assert "with open('${mtcars_pl}/mtcars_pl', 'rb') as f: mtcars_pl = pickle.load(f)" in nix
+    assert "mtcars_pl_am <- jsonlite::fromJSON('${mtcars_pl_am}/mtcars_pl_am')" in nix
+    assert "fileset = defaultPkgs.lib.fileset.unions [ ./functions.py ];" in nix
+    assert "inherit mtcars_pl mtcars_pl_am mtcars_head mtcars_mpg;" in nix
+
+    rix = project / "_rixpress"
+    assert (rix / "default_libraries.py").read_text() == "import pickle\nimport polars\nimport pytest\n"
+    assert (rix / "default_libraries.R").read_text() == "library(dplyr)\nlibrary(rix)\nlibrary(rixpress)\n"
+
+
+def test_escaping_and_validation(project):
+    d = rxp_py("price", "'${HOME}' + \"$x\"")
+    rxp_populate([d], project_path=project)
+    nix = (project / "pipeline.nix").read_text()
+    # Nix turns ''${ into ${, then the shell drops one level of backslashes
+    assert r"""exec('price = \\'\''${HOME}\\' + \"\$x\"')""" in nix
+
+    with pytest.raises(ValueError):
+        rxp_py("all-derivations", "1")
+    with pytest.raises(ValueError, match="Cycle"):
+        rxp_populate([rxp_py("a", "b + 1"), rxp_py("b", "a + 1")], project_path=project)
+    with pytest.raises(ValueError, match="Duplicate"):
+        rxp_populate([rxp_py("a", "1"), rxp_py("a", "2")], project_path=project)
+
+
+def test_groups_and_noop_propagate(project):
+    derivs = rxp_pipeline("prep", [rxp_py("raw", "1", noop_build=True)], color="red") + [rxp_py("twice", "raw * 2")]
+    rxp_populate(derivs, project_path=project)
+    dag = {d["deriv_name"][0]: d for d in json.loads((project / "_rixpress" / "dag.json").read_text())["derivations"]}
+    assert dag["raw"]["pipeline_group"] == ["prep"] and dag["raw"]["pipeline_color"] == ["red"]
+    assert dag["twice"]["noop_build"] == [True]
+    assert 'echo "noop_build: twice was not built" > twice' in (project / "pipeline.nix").read_text()
+
+
+def _stub(bindir: Path, name: str, body: str) -> None:
+    exe = bindir / name
+    exe.write_text("#!/bin/sh\n" + body)
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+
+
+def test_build_with_stub_nix_writes_log(project, tmp_path, monkeypatch):
+    store = tmp_path / "store"
+    paths = {
+        "a": str(store / "aaaa-a"),
+        "b": str(store / "bbbb-b"),
+        "default": str(store / "zzzz-all-derivations"),
+    }
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    _stub(bindir, "nix-instantiate", f"cat <<'EOF'\n{json.dumps(paths)}\nEOF\n")
+    # "a" builds, "b" fails
+    _stub(
+        bindir,
+        "nix-build",
+        f"mkdir -p {paths['a']} {paths['default']}\necho 1 > {paths['a']}/a\necho building\nexit 1\n",
+    )
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+
+    res = rxp_populate([rxp_py("a", "1"), rxp_py("b", "a + 1")], project_path=project, build=True, max_jobs=2)
+    assert res.returncode == 1 and "building" in res.stdout
+
+    logs = sorted((project / "_rixpress").glob("build_log_*_zzzz.json"))
+    assert len(logs) == 1
+    entries = {e["derivation"]: e for e in json.loads(logs[0].read_text())}
+    assert entries["a"] == {"derivation": "a", "build_success": True, "path": paths["a"], "output": "a"}
+    assert entries["b"]["build_success"] is False
+    assert set(entries) == {"a", "b", "all-derivations"}
+
+
+def test_build_requires_pipeline(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        rxp_build(project_path=tmp_path)
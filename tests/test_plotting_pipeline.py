@@ -90,3 +90,61 @@ def test_get_nodes_edges_without_pipeline_metadata():
         assert data_node["pipeline_color"] is None
     finally:
         Path(temp_path).unlink()
+
+
+def _chain_dag(tmp_path):
+    # a -> b -> c -> d, plus e (group "report") depending on b and d
+    derivs = []
+    for name, deps, group in (
+        ("a", [], "etl"),
+        ("b", ["a"], "etl"),
+        ("c", ["b"], "model"),
+        ("d", ["c"], "model"),
+        ("e", ["b", "d"], "report"),
+    ):
+        derivs.append({"deriv_name": [name], "depends": deps, "type": ["rxp_py"], "pipeline_group": [group]})
+    path = tmp_path / "dag.json"
+    path.write_text(json.dumps({"derivations": derivs}))
+    return path
+
+
+def test_get_nodes_edges_neighbourhood(tmp_path):
+    from ryxpress.plotting import get_nodes_edges
+
+    path = _chain_dag(tmp_path)
+    one = get_nodes_edges(path, focus="c", hops=1)
+    assert [n["id"] for n in one["nodes"]] == ["b", "c", "d"]
+    assert {(e["from"], e["to"]) for e in one["edges"]} == {("b", "c"), ("c", "d")}
+
+    up = get_nodes_edges(path, focus="d", direction="upstream")
+    assert [n["id"] for n in up["nodes"]] == ["a", "b", "c", "d"]
+
+    with pytest.raises(ValueError):
+        get_nodes_edges(path, focus="nope")
+    with pytest.raises(ValueError, match="hops"):
+        get_nodes_edges(path, focus="c", hops=-1)
+
+
+def test_get_nodes_edges_groups_and_collapse(tmp_path):
+    from ryxpress.plotting import get_nodes_edges
+
+    path = _chain_dag(tmp_path)
+    model = get_nodes_edges(path, groups=["model"])
+    assert [n["id"] for n in model["nodes"]] == ["c", "d"]
+    assert [(e["from"], e["to"]) for e in model["edges"]] == [("c", "d")]
+
+    collapsed = get_nodes_edges(path, collapse_groups=True)
+    assert [n["id"] for n in collapsed["nodes"]] == ["group:etl", "group:model", "group:report"]
+    assert collapsed["nodes"][0]["members"] == ["a", "b"]
+    assert {(e["from"], e["to"]) for e in collapsed["edges"]} == {
+        ("group:etl", "group:model"),
+        ("group:etl", "group:report"),
+        ("group:model", "group:report"),
+    }
+
+    partial = get_nodes_edges(path, collapse_groups=["etl"])
+    assert [n["id"] for n in partial["nodes"]] == ["group:etl", "c", "d", "e"]
+
+    # a single name is a one-element list, not a set of characters
+    assert get_nodes_edges(path, groups="model") == model
+    assert get_nodes_edges(path, collapse_groups="etl") == partial
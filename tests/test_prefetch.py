@@ -0,0 +1,46 @@
+"""
+Tests for rxp_prefetch.
+"""
+import json
+import pickle
+
+import pytest
+
+from ryxpress.prefetch import rxp_prefetch
+from ryxpress.read_load import _ARTIFACT_CACHE, clear_artifact_cache, rxp_read
+
+
+@pytest.fixture
+def project(tmp_path):
+    store = tmp_path / "store"
+    (store / "aaaa-model").mkdir(parents=True)
+    (store / "aaaa-model" / "model").write_bytes(pickle.dumps({"coef": [1, 2]}))
+    (store / "bbbb-report" / "figs").mkdir(parents=True)
+    (store / "bbbb-report" / "figs" / "a.png").write_bytes(b"png")
+    (store / "bbbb-report" / "index.html").write_text("<html/>")
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    log = [
+        {"derivation": "model", "build_success": True, "path": str(store / "aaaa-model"), "output": ["model"]},
+        {"derivation": "report", "build_success": True, "path": str(store / "bbbb-report"), "output": ["figs", "index.html"]},
+        {"derivation": "broken", "build_success": False, "path": str(store / "cccc-broken"), "output": ["x"]},
+    ]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    yield tmp_path
+    clear_artifact_cache()
+
+
+def test_prefetch_all_warms_files(project):
+    summary = rxp_prefetch(project_path=project)
+    assert summary["derivations"] == 2
+    assert summary["files"] == 3 and summary["failed"] == 0
+    assert summary["decoded"] == 0 and not _ARTIFACT_CACHE
+
+
+def test_prefetch_decode_feeds_rxp_read(project):
+    future = rxp_prefetch(["model", "missing"], project_path=project, decode=True, wait=False)
+    summary = future.result(timeout=30)
+    assert summary["decoded"] == 1
+    obj = rxp_read("model", project_path=project)
+    assert obj == {"coef": [1, 2]}
+    assert obj is next(iter(_ARTIFACT_CACHE.values()))
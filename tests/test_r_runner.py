@@ -1,12 +1,17 @@
+import os
+import subprocess
 import sys
+import time
 from pathlib import Path
 
+import pytest
+
 # Ensure the package in src/ is importable when running tests from the repo root
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "tests"
 sys.path.insert(0, str(SRC))
 
-from ryxpress.r_runner import rxp_make  # type: ignore
+from ryxpress.r_runner import _make_fingerprint, _write_make_cache, rxp_make, rxp_make_async  # type: ignore
 
 
 def test_rxp_make_real_pipeline_runs():
@@ -45,3 +50,130 @@ def test_rxp_make_real_pipeline_runs():
         print(result.stderr)
 
     assert result.returncode == 0, "rxp_make failed; see stdout/stderr above for details"
+
+
+def _fake_rscript(bindir: Path, calls: Path) -> None:
+    """An Rscript stand-in: records whether the script was sourced and writes a build log."""
+    exe = bindir / "Rscript"
+    exe.write_text(
+        "#!/bin/sh\n"
+        f"if grep -q 'run_populate <- TRUE' \"$1\"; then echo populate >> {calls}; "
+        "printf 'let in {}' > pipeline.nix; echo '{}' > _rixpress/dag.json; "
+        f"else echo build >> {calls}; fi\n"
+        "sleep 0.01\n"
+        "printf '[{\"derivation\": \"a\", \"build_success\": true, \"path\": \"%s\"}]' \"$PWD\" "
+        "> _rixpress/build_log_$(date +%s%N)_x.json\n"
+    )
+    exe.chmod(0o755)
+
+
+def test_rxp_make_cache_skips_unchanged_steps(tmp_path, monkeypatch):
+    proj = tmp_path / "proj"
+    (proj / "_rixpress").mkdir(parents=True)
+    script = proj / "gen-pipeline.R"
+    script.write_text("list()\n")
+    (proj / "default.nix").write_text("{}\n")
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    calls = tmp_path / "calls"
+    _fake_rscript(bindir, calls)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+
+    first = rxp_make(script=str(script), cache=True)
+    assert first.returncode == 0 and first.skipped is None
+
+    second = rxp_make(script=str(script), cache=True)
+    assert second.returncode == 0 and second.skipped == "make"
+
+    # a newer log that the cached run did not produce: rebuild without populating
+    (proj / "_rixpress" / "build_log_99999999999999999999_y.json").write_text("[]")
+    third = rxp_make(script=str(script), cache=True)
+    assert third.skipped == "populate"
+
+    script.write_text("list(1)\n")
+    fourth = rxp_make(script=str(script), cache=True)
+    assert fourth.skipped is None
+    assert calls.read_text().split() == ["populate", "build", "populate"]
+
+
+def test_make_fingerprint_ignores_its_own_outputs(tmp_path):
+    import shutil
+
+    proj = tmp_path / "proj"
+    shutil.copytree(SRC / "_rixpress", proj / "_rixpress", ignore=shutil.ignore_patterns("__pycache__"))
+    for name in ("pipeline.nix", "default.nix", "gen-pipeline.R", "functions.py", "functions.R"):
+        shutil.copy(SRC / name, proj / name)
+    script = proj / "gen-pipeline.R"
+    assert "root = ./.;" in (proj / "pipeline.nix").read_text()
+
+    before = _make_fingerprint(script, proj)
+    _write_make_cache(proj, script)
+    (proj / "_rixpress" / "build_log_99999999999999999999_y.json").write_text("[]")
+    (proj / "result").write_text("out\n")
+    assert _make_fingerprint(script, proj) == before
+
+    (proj / "functions.py").write_text("# changed\n")
+    assert _make_fingerprint(script, proj) != before
+
+
+def _slow_rscript(bindir: Path, pidfile: Path) -> None:
+    """An Rscript stand-in that reports its open-files limit and leaves a sleeping child."""
+    exe = bindir / "Rscript"
+    exe.write_text(f"#!/bin/sh\nulimit -n\nsleep 30 &\necho $! > {pidfile}\nwait\n")
+    exe.chmod(0o755)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _slow_project(tmp_path, monkeypatch):
+    proj = tmp_path / "proj"
+    proj.mkdir()
+    (proj / "gen-pipeline.R").write_text("list()\n")
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    pidfile = tmp_path / "child.pid"
+    _slow_rscript(bindir, pidfile)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+    return proj / "gen-pipeline.R", pidfile
+
+
+def _child_pid(pidfile: Path) -> int:
+    for _ in range(200):
+        if pidfile.exists() and pidfile.read_text().strip():
+            return int(pidfile.read_text())
+        time.sleep(0.01)
+    raise AssertionError("child did not start")
+
+
+def test_rxp_make_timeout_kills_process_group(tmp_path, monkeypatch):
+    script, pidfile = _slow_project(tmp_path, monkeypatch)
+    with pytest.raises(subprocess.TimeoutExpired):
+        rxp_make(script=str(script), timeout=1)
+    child = _child_pid(pidfile)
+    deadline = time.time() + 5
+    while _alive(child) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
+
+
+def test_rxp_make_async_cancel_and_limits(tmp_path, monkeypatch):
+    script, pidfile = _slow_project(tmp_path, monkeypatch)
+    handle = rxp_make_async(script=str(script), open_files_limit=123)
+    child = _child_pid(pidfile)
+    assert handle.cancel(grace=1.0)
+    result = handle.result(timeout=10)
+    assert result.terminated == "cancelled" and result.returncode < 0
+    assert result.stdout.split()[0] == "123"
+    assert result.cpu_time is not None and result.max_rss_kb > 0
+    assert not handle.cancel()
+    assert handle.wait(5)
+    deadline = time.time() + 5
+    while _alive(child) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
@@ -0,0 +1,137 @@
+"""
+Tests for publishing artifacts in shared memory and reading them from another process.
+"""
+import json
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ryxpress.shared import _HEADER, _MAGIC, ArtifactServer, _segment_name, rxp_read_shared
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs POSIX shared memory")
+
+
+@pytest.fixture
+def project(tmp_path):
+    out = tmp_path / "store" / "aaaa-blob"
+    out.mkdir(parents=True)
+    (out / "blob").write_bytes(pickle.dumps({"payload": bytearray(b"x" * 100000), "n": 3}))
+    raw = tmp_path / "store" / "bbbb-raw"
+    raw.mkdir()
+    (raw / "raw").write_bytes(b"not a pickle")
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    log = [
+        {"derivation": "blob", "build_success": True, "path": str(out), "output": ["blob"]},
+        {"derivation": "raw", "build_success": True, "path": str(raw), "output": ["raw"]},
+    ]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    return tmp_path
+
+
+def _read_in_worker(project, name):
+    code = (
+        "import json, sys; from ryxpress.shared import rxp_read_shared; "
+        f"v = rxp_read_shared({name!r}, project_path={str(project)!r}); "
+        "print(json.dumps({'n': v['n'], 'len': len(v['payload'])} if isinstance(v, dict) else v))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True, env=env, check=True)
+    return json.loads(proc.stdout)
+
+
+def test_worker_reads_published_artifact(project):
+    blob = project / "store" / "aaaa-blob" / "blob"
+    with ArtifactServer(project_path=project) as server:
+        published = server.publish_all()
+        assert published["blob"] and published["raw"]
+        # The worker must get the published object, not re-read the file
+        blob.write_bytes(pickle.dumps({"payload": bytearray(), "n": 0}))
+        assert _read_in_worker(project, "blob") == {"n": 3, "len": 100000}
+        assert _read_in_worker(project, "raw") == str(project / "store" / "bbbb-raw" / "raw")
+        # A worker exiting must not remove the server's segments
+        assert _read_in_worker(project, "blob") == {"n": 3, "len": 100000}
+    assert _read_in_worker(project, "blob") == {"n": 0, "len": 0}
+
+
+def test_unpublished_falls_back_to_rxp_read(project):
+    assert rxp_read_shared("blob", project_path=project)["n"] == 3
+    assert rxp_read_shared("missing", project_path=project) == "missing"
+
+
+def test_live_servers_never_replace_each_others_segments(project):
+    from multiprocessing import shared_memory
+
+    with ArtifactServer(project_path=project) as first:
+        first.publish("blob")
+        with pytest.raises(FileExistsError, match="already published"):
+            ArtifactServer(project_path=project).publish("blob")
+        assert _read_in_worker(project, "blob") == {"n": 3, "len": 100000}
+
+    # A segment whose owner has exited is stale and gets replaced
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    name = _segment_name(str(project / "store" / "aaaa-blob" / "blob"))
+    stale = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size)
+    _HEADER.pack_into(stale.buf, 0, _MAGIC, 0, 0, dead.pid)
+    stale.close()
+    with ArtifactServer(project_path=project) as server:
+        assert server.publish("blob") == name
+        assert _read_in_worker(project, "blob") == {"n": 3, "len": 100000}
+
+
+def _plant(name, payload, mode=0o600):
+    """Create a segment as a foreign process would: not tracked by this process."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(len(payload), 1))
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.buf[:len(payload)] = payload
+    os.fchmod(shm._fd, mode)
+    return shm
+
+
+def _remove(shm):
+    import _posixshmem
+
+    shm.close()
+    _posixshmem.shm_unlink(shm._name)
+
+
+def test_planted_segments_are_never_trusted(project, monkeypatch):
+    blob = str(project / "store" / "aaaa-blob" / "blob")
+    name = _segment_name(blob)
+    evil = pickle.dumps({"payload": bytearray(b"evil"), "n": 666})
+    header = bytearray(_HEADER.size + 16 + 64)
+    _HEADER.pack_into(header, 0, _MAGIC, 1, 0, 1)  # owner pid 1: always "alive"
+    header[_HEADER.size:_HEADER.size + 16] = len(header).to_bytes(8, "little") + len(evil).to_bytes(8, "little")
+    planted = _plant(name, bytes(header) + evil, mode=0o644)
+    try:
+        # Wrong mode: workers read the store, servers refuse to publish over it
+        assert rxp_read_shared("blob", project_path=project)["n"] == 3
+        with pytest.raises(PermissionError):
+            ArtifactServer(project_path=project).publish("blob")
+
+        # Right mode, another user's segment
+        os.fchmod(planted._fd, 0o600)
+        monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 4242)
+        assert rxp_read_shared("blob", project_path=project)["n"] == 3
+        monkeypatch.undo()
+    finally:
+        _remove(planted)
+
+    # Trusted but malformed: entries pointing past the end of the segment
+    bad = bytearray(_HEADER.size + 16)
+    _HEADER.pack_into(bad, 0, _MAGIC, 1, 0, 1)
+    bad[_HEADER.size:] = (0).to_bytes(8, "little") + (10 ** 6).to_bytes(8, "little")
+    planted = _plant(name, bytes(bad))
+    try:
+        assert rxp_read_shared("blob", project_path=project)["n"] == 3
+    finally:
+        _remove(planted)
@@ -0,0 +1,59 @@
+"""
+Tests for rxp_verify (no real Nix required).
+"""
+import json
+import os
+import stat
+
+import pytest
+
+from ryxpress.verify import rxp_verify
+
+
+@pytest.fixture
+def project(tmp_path):
+    store = tmp_path / "store"
+    (store / "aaaa-model").mkdir(parents=True)
+    (store / "aaaa-model" / "model").write_bytes(b"m" * (3 << 20))
+    (store / "bbbb-report").mkdir()
+    (store / "bbbb-report" / "index.html").write_text("<html/>")
+    rix = tmp_path / "_rixpress"
+    rix.mkdir()
+    log = [
+        {"derivation": "model", "build_success": True, "path": str(store / "aaaa-model"), "output": ["model"]},
+        {"derivation": "report", "build_success": True, "path": str(store / "bbbb-report"), "output": ["index.html"]},
+    ]
+    (rix / "build_log_20260101_000000_x.json").write_text(json.dumps(log))
+    return tmp_path
+
+
+def test_verify_records_then_detects_changes(project):
+    first = rxp_verify(project_path=project, workers=2)
+    assert first["ok"] and first["files"] == 2 and first["recorded"] == 2
+    assert first["bytes"] == (3 << 20) + len("<html/>")
+
+    model = project / "store" / "aaaa-model" / "model"
+    model.write_bytes(b"m" * ((3 << 20) - 1) + b"x")
+    os.unlink(project / "store" / "bbbb-report" / "index.html")
+    second = rxp_verify(project_path=project)
+    assert not second["ok"]
+    assert [c["derivation"] for c in second["corrupted"]] == ["model"]
+    assert second["missing"] == [{"derivation": "report", "path": str(project / "store" / "bbbb-report" / "index.html")}]
+
+
+def test_nix_verify_batches_name_bad_paths(project, tmp_path, monkeypatch):
+    bad = str(project / "store" / "bbbb-report")
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    fake = bindir / "nix-store"
+    fake.write_text(
+        "#!/bin/sh\nshift\nfor p in \"$@\"; do\n"
+        f"  if [ \"$p\" = \"{bad}\" ]; then echo \"error: path '/nix/store/x' is broken\" >&2; exit 1; fi\n"
+        "done\nexit 0\n"
+    )
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+
+    report = rxp_verify(project_path=project, nix_verify=True, batch_size=2)
+    assert report["nix_error"] is None
+    assert [(c["derivation"], c["source"]) for c in report["corrupted"]] == [("report", "nix")]
@@ -0,0 +1,58 @@
+"""
+Tests for RxpWatcher with both the inotify and the polling backend.
+"""
+import json
+import queue
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from ryxpress import tracing
+from ryxpress.log_index import rxp_history
+from ryxpress.watch import RxpWatcher
+
+FIXTURES = Path(__file__).resolve().parent / "_rixpress"
+
+
+@pytest.fixture
+def project(tmp_path):
+    shutil.copytree(FIXTURES, tmp_path / "_rixpress")
+    return tmp_path
+
+
+def _next(q, timeout=10):
+    return q.get(timeout=timeout)
+
+
+@pytest.mark.parametrize("use_inotify", [
+    pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")),
+    False,
+])
+def test_watcher_reports_changes_and_refreshes_caches(project, use_inotify):
+    events = queue.Queue()
+    rix = project / "_rixpress"
+    with RxpWatcher(project, interval=0.05, use_inotify=use_inotify) as w:
+        assert w.backend == ("inotify" if use_inotify else "poll")
+        w.subscribe(events.put)
+
+        log = rix / "build_log_20270101_000000_zzzz.json"
+        log.write_text(json.dumps([{"derivation": "fresh", "build_success": True, "path": "/nix/store/x-fresh", "output": []}]))
+        ev = _next(events)
+        assert (ev["event"], ev["filename"]) == ("log_added", log.name)
+        assert rxp_history("fresh", project_path=project)[0]["log"] == log.name
+        assert log.with_suffix(".rxpc").exists()  # warmed by the watcher
+
+        dag = rix / "dag.json"
+        data = json.loads(dag.read_text())
+        data["derivations"] = data["derivations"][:1]
+        dag.write_text(json.dumps(data))
+        assert _next(events)["event"] == "dag_changed"
+        key = str(dag.resolve())
+        assert len(tracing._DAG_CACHE[key][1][0]) == 1
+
+        log.unlink()
+        ev = _next(events)
+        assert (ev["event"], ev["filename"]) == ("log_removed", log.name)
+    assert w._thread is None